@@ -34,12 +34,33 @@ class EmotionalModule:
         """
         text = logic_output.get("cleaned_text", "")
         sentences = logic_output.get("sentences", [])
+        return self.finalize(self.partial(text, sentences))
 
-        sentiment = self._sentiment_score(text)
-        dominant = self._dominant_emotion(text)
-        intensity = self._emotion_intensity(text)
-        stress = self._stress_level(text)
-        volatility = self._volatility(sentences)
+    # ---------------------------------------------------------
+    # CHUNKED STAGES (see backend/agents/mapreduce.py)
+    # ---------------------------------------------------------
+    def partial(self, text: str, sentences: List[str]) -> Dict:
+        """
+        Raw counts behind evaluate() for one chunk. All of them are sums,
+        so chunk partials add up to the whole document's.
+        """
+        return {
+            "sentiment_score": self._sentiment_score(text),
+            "emotion_counts": self._emotion_counts(text),
+            "intensity_markers": self._intensity_markers(text),
+            "stress_markers": self._stress_markers(text),
+            "swings": self._swings(sentences)
+        }
+
+    def finalize(self, partial: Dict) -> Dict:
+        """
+        Turns merged counts into evaluate() output.
+        """
+        sentiment = partial["sentiment_score"]
+        dominant = self._dominant_emotion(partial["emotion_counts"])
+        intensity = self._emotion_intensity(partial["intensity_markers"])
+        stress = self._stress_level(partial["stress_markers"])
+        volatility = self._volatility(partial["swings"])
         signals = self._emotion_signals(sentiment, dominant, intensity, stress, volatility)
 
         return {
@@ -71,7 +92,7 @@ class EmotionalModule:
     # ---------------------------------------------------------
     # DOMINANT EMOTION
     # ---------------------------------------------------------
-    def _dominant_emotion(self, text: str) -> str:
+    def _emotion_counts(self, text: str) -> Dict[str, int]:
         emotions = {
             "joy": ["happy", "excited", "proud", "love"],
             "sadness": ["sad", "down", "depressed"],
@@ -86,16 +107,20 @@ class EmotionalModule:
             for w in words:
                 counts[emotion] += text.lower().count(w)
 
+        return counts
+
+    def _dominant_emotion(self, counts: Dict[str, int]) -> str:
         dominant = max(counts, key=counts.get)
         return dominant if counts[dominant] > 0 else "neutral"
 
     # ---------------------------------------------------------
     # EMOTION INTENSITY
     # ---------------------------------------------------------
-    def _emotion_intensity(self, text: str) -> str:
+    def _intensity_markers(self, text: str) -> int:
         strong_markers = ["very", "extremely", "really", "so", "too"]
-        count = sum(text.lower().count(m) for m in strong_markers)
+        return sum(text.lower().count(m) for m in strong_markers)
 
+    def _emotion_intensity(self, count: int) -> str:
         if count >= 3:
             return "high"
         elif count == 2:
@@ -106,10 +131,11 @@ class EmotionalModule:
     # ---------------------------------------------------------
     # STRESS LEVEL
     # ---------------------------------------------------------
-    def _stress_level(self, text: str) -> str:
+    def _stress_markers(self, text: str) -> int:
         stress_words = ["stress", "pressure", "overwhelmed", "tired", "burnout"]
-        count = sum(text.lower().count(w) for w in stress_words)
+        return sum(text.lower().count(w) for w in stress_words)
 
+    def _stress_level(self, count: int) -> str:
         if count >= 3:
             return "high"
         elif count == 1 or count == 2:
@@ -120,9 +146,9 @@ class EmotionalModule:
     # ---------------------------------------------------------
     # EMOTIONAL VOLATILITY
     # ---------------------------------------------------------
-    def _volatility(self, sentences: List[str]) -> str:
+    def _swings(self, sentences: List[str]) -> int:
         """
-        Detects emotional swings between sentences.
+        Counts sentences that mix positive and negative emotion.
         """
         positive = ["happy", "excited", "love", "hope"]
         negative = ["sad", "angry", "hate", "anxious", "stress"]
@@ -135,6 +161,9 @@ class EmotionalModule:
             if pos and neg:
                 swings += 1
 
+        return swings
+
+    def _volatility(self, swings: int) -> str:
         return "unstable" if swings >= 1 else "stable"
 
     # ---------------------------------------------------------
@@ -7,11 +7,54 @@ constructive, non-harmful, and aligned with user well-being.
 This module performs real filtering, reframing, and ethical checks.
 """
 
-from typing import Dict, List
+import re
+from typing import Dict, Iterable, List, Set, Tuple
+
+
+def phrase_pattern(phrases: Iterable[str]) -> str:
+    """
+    Regex matching any of `phrases`, built as a character trie so the
+    engine never backtracks across alternatives sharing a prefix. At
+    each position the longest phrase wins.
+    """
+    trie: Dict = {}
+    for phrase in phrases:
+        node = trie
+        for ch in phrase:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def build(node: Dict) -> str:
+        alternatives = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not alternatives:
+            return ""
+        body = alternatives[0] if len(alternatives) == 1 else "(?:" + "|".join(alternatives) + ")"
+        return f"(?:{body})?" if "" in node else body
+
+    return build(trie)
 
 
 class EthicalGovernor:
 
+    HARMFUL = ["worthless", "hopeless", "pointless", "give up", "hate myself"]
+    SPIRALS = ["always fail", "never succeed", "nothing works", "everything is bad"]
+    PUNITIVE = ["my fault", "i ruin everything", "i deserve this"]
+
+    # Harmful phrase -> constructive replacement (lowercase keys)
+    REFRAMES = {
+        "worthless": "feeling discouraged",
+        "hopeless": "facing challenges",
+        "give up": "feeling stuck",
+        "always fail": "struggling with consistency",
+        "never succeed": "working toward progress",
+        "i ruin everything": "I’m learning from setbacks"
+    }
+
+    # Every watched phrase in one pattern, for prefilter()
+    _PREFILTER = re.compile(phrase_pattern(HARMFUL + SPIRALS + PUNITIVE))
+    _REFRAME = re.compile(phrase_pattern(REFRAMES), re.IGNORECASE)
+    _REFRAME_LOOKUP = {bad.casefold(): good for bad, good in REFRAMES.items()}
+
     def __init__(self):
         pass
 
@@ -31,10 +74,54 @@ class EthicalGovernor:
             "allowed": bool,
             "ethical_flags": [...],
             "reframed_text": str,
+            "reframe_spans": [...],
             "safe_to_proceed": bool
         }
+
+        Each reframe span gives a replaced phrase's offsets in the
+        cleaned text ("start", "end") and in reframed_text
+        ("reframed_start", "reframed_end"), for highlighting.
+        """
+
+        text = logic_output.get("cleaned_text", "")
+        return self.finalize(logic_output, predictive_output, emotional_output, self.partial(text))
+
+    # ---------------------------------------------------------
+    # PREFILTER
+    # ---------------------------------------------------------
+    def prefilter(self, text: str) -> bool:
+        """
+        True when regulate() is certain to veto `text`: any watched
+        phrase raises a flag, and any flag fails the safety check. One
+        regex scan, no other module's output needed.
+        """
+        return self._PREFILTER.search(text.lower()) is not None
+
+    # ---------------------------------------------------------
+    # CHUNKED STAGES (see backend/agents/mapreduce.py)
+    # ---------------------------------------------------------
+    def partial(self, text: str) -> Dict:
+        """
+        Which watched phrases occur in one chunk. None of them span a
+        sentence boundary, so the document's hits are the union of its
+        chunks' hits.
         """
+        return {
+            "harmful_hits": self._phrase_hits(text, self.HARMFUL),
+            "spiral_hits": self._phrase_hits(text, self.SPIRALS),
+            "punitive_hits": self._phrase_hits(text, self.PUNITIVE)
+        }
 
+    def finalize(
+        self,
+        logic_output: Dict,
+        predictive_output: Dict,
+        emotional_output: Dict,
+        partial: Dict
+    ) -> Dict:
+        """
+        Builds regulate() output from the merged phrase hits.
+        """
         text = logic_output.get("cleaned_text", "")
         sentiment = emotional_output.get("sentiment_score", 0)
         dominant = emotional_output.get("dominant_emotion", "neutral")
@@ -42,15 +129,16 @@ class EthicalGovernor:
 
         flags = []
         reframed = text
+        spans = []
 
         # Check for harmful patterns
-        flags.extend(self._detect_harmful_language(text))
-        flags.extend(self._detect_negative_spirals(text))
-        flags.extend(self._detect_self_punitive(text))
+        flags.extend(self._detect_harmful_language(partial["harmful_hits"]))
+        flags.extend(self._detect_negative_spirals(partial["spiral_hits"]))
+        flags.extend(self._detect_self_punitive(partial["punitive_hits"]))
 
         # Reframe if needed
         if flags:
-            reframed = self._reframe_text(text, dominant)
+            reframed, spans = self._reframe_text(text, dominant)
 
         # Determine if safe to proceed
         safe = self._safety_check(sentiment, dominant, risk, flags)
@@ -59,18 +147,25 @@ class EthicalGovernor:
             "allowed": safe,
             "ethical_flags": flags,
             "reframed_text": reframed,
+            "reframe_spans": spans,
             "safe_to_proceed": safe
         }
 
+    # ---------------------------------------------------------
+    # PHRASE HITS
+    # ---------------------------------------------------------
+    def _phrase_hits(self, text: str, phrases: List[str]) -> Set[str]:
+        lower = text.lower()
+        return {p for p in phrases if p in lower}
+
     # ---------------------------------------------------------
     # DETECT HARMFUL LANGUAGE
     # ---------------------------------------------------------
-    def _detect_harmful_language(self, text: str) -> List[str]:
-        harmful = ["worthless", "hopeless", "pointless", "give up", "hate myself"]
+    def _detect_harmful_language(self, hits: Set[str]) -> List[str]:
         flags = []
 
-        for h in harmful:
-            if h in text.lower():
+        for h in self.HARMFUL:
+            if h in hits:
                 flags.append(f"Harmful language detected: '{h}'")
 
         return flags
@@ -78,12 +173,11 @@ class EthicalGovernor:
     # ---------------------------------------------------------
     # DETECT NEGATIVE SPIRALS
     # ---------------------------------------------------------
-    def _detect_negative_spirals(self, text: str) -> List[str]:
-        spirals = ["always fail", "never succeed", "nothing works", "everything is bad"]
+    def _detect_negative_spirals(self, hits: Set[str]) -> List[str]:
         flags = []
 
-        for s in spirals:
-            if s in text.lower():
+        for s in self.SPIRALS:
+            if s in hits:
                 flags.append(f"Negative spiral detected: '{s}'")
 
         return flags
@@ -91,12 +185,11 @@ class EthicalGovernor:
     # ---------------------------------------------------------
     # DETECT SELF-PUNITIVE LANGUAGE
     # ---------------------------------------------------------
-    def _detect_self_punitive(self, text: str) -> List[str]:
-        punitive = ["my fault", "i ruin everything", "i deserve this"]
+    def _detect_self_punitive(self, hits: Set[str]) -> List[str]:
         flags = []
 
-        for p in punitive:
-            if p in text.lower():
+        for p in self.PUNITIVE:
+            if p in hits:
                 flags.append(f"Self-punitive language detected: '{p}'")
 
         return flags
@@ -104,28 +197,41 @@ class EthicalGovernor:
     # ---------------------------------------------------------
     # REFRAME TEXT
     # ---------------------------------------------------------
-    def _reframe_text(self, text: str, emotion: str) -> str:
+    def _reframe_text(self, text: str, emotion: str) -> Tuple[str, List[Dict]]:
         """
         Reframes harmful or negative statements into constructive,
         future-oriented language.
+
+        One case-insensitive scan finds every phrase from REFRAMES and
+        the output is joined once from the untouched stretches and the
+        replacements, so cost does not grow with the table size.
         """
+        parts, spans = [], []
+        last = out = 0
 
-        replacements = {
-            "worthless": "feeling discouraged",
-            "hopeless": "facing challenges",
-            "give up": "feeling stuck",
-            "always fail": "struggling with consistency",
-            "never succeed": "working toward progress",
-            "i ruin everything": "I’m learning from setbacks"
-        }
+        for match in self._REFRAME.finditer(text):
+            start, end = match.span()
+            good = self._REFRAME_LOOKUP.get(match.group().casefold(), match.group())
 
-        reframed = text
+            parts.append(text[last:start])
+            parts.append(good)
+            out += start - last
+            spans.append({
+                "phrase": match.group(),
+                "replacement": good,
+                "start": start,
+                "end": end,
+                "reframed_start": out,
+                "reframed_end": out + len(good)
+            })
+            out += len(good)
+            last = end
 
-        for bad, good in replacements.items():
-            reframed = reframed.replace(bad, good)
+        parts.append(text[last:])
 
         # Add a constructive tag
-        return f"{reframed} (Reframed for clarity and self-support.)"
+        parts.append(" (Reframed for clarity and self-support.)")
+        return "".join(parts), spans
 
     # ---------------------------------------------------------
     # SAFETY CHECK
@@ -0,0 +1,185 @@
+"""
+Heavy Hitters
+-------------
+Bounded-memory tracking of recurring keywords across a user's entries.
+
+A Count-Min sketch estimates how often any keyword has appeared over a
+user's whole history (never under-counting), and a small min-heap keeps
+the current top-k. Neither structure grows with the number of entries
+or distinct words, so repetition can be detected across history without
+re-reading old entries.
+
+Hashing uses seeded CRC32, so sketches built in different processes
+are compatible and can be merged.
+"""
+
+import heapq
+import threading
+import zlib
+from array import array
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Tuple
+
+
+class CountMinSketch:
+
+    def __init__(self, width: int = 512, depth: int = 4):
+        self.width = width
+        self.depth = depth
+        self.rows = [array("I", bytes(4 * width)) for _ in range(depth)]
+
+    def _columns(self, item: str):
+        data = item.encode("utf-8")
+        return [zlib.crc32(data, seed) % self.width for seed in range(1, self.depth + 1)]
+
+    def add(self, item: str, count: int = 1) -> int:
+        """
+        Adds `count` occurrences and returns the new estimate.
+        """
+        estimate = None
+        for row, column in zip(self.rows, self._columns(item)):
+            row[column] += count
+            value = row[column]
+            estimate = value if estimate is None else min(estimate, value)
+        return estimate
+
+    def estimate(self, item: str) -> int:
+        return min(row[column] for row, column in zip(self.rows, self._columns(item)))
+
+    def to_dict(self) -> Dict:
+        return {"width": self.width, "depth": self.depth, "rows": [list(r) for r in self.rows]}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "CountMinSketch":
+        sketch = cls(data["width"], data["depth"])
+        sketch.rows = [array("I", row) for row in data["rows"]]
+        return sketch
+
+    def merge(self, other: "CountMinSketch"):
+        if (other.width, other.depth) != (self.width, self.depth):
+            raise ValueError("Cannot merge Count-Min sketches of different shapes")
+        for row, other_row in zip(self.rows, other.rows):
+            for column, value in enumerate(other_row):
+                if value:
+                    row[column] += value
+
+
+class HeavyHitters:
+    """
+    Count-Min sketch + top-k min-heap.
+    """
+
+    def __init__(self, k: int = 20, width: int = 512, depth: int = 4):
+        self.k = k
+        self.sketch = CountMinSketch(width, depth)
+        self._top: Dict[str, int] = {}
+        self._heap: List[Tuple[int, str]] = []
+
+    def update(self, counts: Dict[str, int]):
+        for item, count in counts.items():
+            self._offer(item, self.sketch.add(item, count))
+
+    def estimate(self, item: str) -> int:
+        return self.sketch.estimate(item)
+
+    def top(self) -> List[Tuple[str, int]]:
+        return sorted(self._top.items(), key=lambda kv: (-kv[1], kv[0]))
+
+    def to_dict(self) -> Dict:
+        return {"k": self.k, "sketch": self.sketch.to_dict(), "top": dict(self._top)}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "HeavyHitters":
+        tracker = cls(data["k"])
+        tracker.sketch = CountMinSketch.from_dict(data["sketch"])
+        tracker._top = dict(data["top"])
+        tracker._heap = [(v, i) for i, v in tracker._top.items()]
+        heapq.heapify(tracker._heap)
+        return tracker
+
+    # ---------------------------------------------------------
+    # TOP-K MAINTENANCE
+    # ---------------------------------------------------------
+    def _offer(self, item: str, estimate: int):
+        if item in self._top or len(self._top) < self.k:
+            self._top[item] = estimate
+            heapq.heappush(self._heap, (estimate, item))
+        else:
+            smallest, smallest_item = self._peek_min()
+            if estimate <= smallest:
+                return
+            del self._top[smallest_item]
+            self._top[item] = estimate
+            heapq.heappush(self._heap, (estimate, item))
+
+        # Heap entries go stale as estimates grow; compact occasionally
+        if len(self._heap) > 4 * self.k:
+            self._heap = [(v, i) for i, v in self._top.items()]
+            heapq.heapify(self._heap)
+
+    def _peek_min(self) -> Tuple[int, str]:
+        while True:
+            value, item = self._heap[0]
+            if self._top.get(item) == value:
+                return value, item
+            heapq.heappop(self._heap)
+
+
+class KeywordHistory:
+    """
+    Per-user HeavyHitters, bounded to the `max_users` most recently
+    active users. Safe to share between request threads.
+    """
+
+    def __init__(self, max_users: int = 10000, k: int = 20, width: int = 512, depth: int = 4):
+        self.max_users = max_users
+        self._params = (k, width, depth)
+        self._users: "OrderedDict[str, HeavyHitters]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get(self, user_id: str) -> HeavyHitters:
+        tracker = self._users.get(user_id)
+        if tracker is None:
+            tracker = HeavyHitters(*self._params)
+            self._users[user_id] = tracker
+            if len(self._users) > self.max_users:
+                self._users.popitem(last=False)
+        else:
+            self._users.move_to_end(user_id)
+        return tracker
+
+    def update(self, user_id: str, counts: Dict[str, int]) -> List[Tuple[str, int]]:
+        """
+        Folds one entry into the user's history and returns their
+        current top keywords.
+        """
+        with self._lock:
+            tracker = self._get(user_id)
+            tracker.update(counts)
+            return tracker.top()
+
+    def user_ids(self) -> List[str]:
+        with self._lock:
+            return list(self._users)
+
+    def take(self, user_ids: Iterable[str]) -> Dict[str, Dict]:
+        """
+        Removes the given users' histories and returns them serialized,
+        for handing them to another process (see restore).
+        """
+        with self._lock:
+            return {
+                user_id: self._users.pop(user_id).to_dict()
+                for user_id in user_ids if user_id in self._users
+            }
+
+    def restore(self, states: Dict[str, Dict]):
+        """
+        Installs histories produced by take(), replacing any local ones.
+        """
+        with self._lock:
+            for user_id, state in states.items():
+                self._users[user_id] = HeavyHitters.from_dict(state)
+                self._users.move_to_end(user_id)
+            while len(self._users) > self.max_users:
+                self._users.popitem(last=False)
@@ -7,6 +7,7 @@ the text, and returns a structured output for downstream modules.
 """
 
 import re
+from collections import Counter
 from typing import Dict, List
 
 
@@ -26,21 +27,44 @@ class LogicModule:
             "sentences": [...],
             "facts": [...],
             "contradictions": [...],
-            "keywords": [...]
+            "keywords": [...],
+            "keyword_counts": {...}
         }
         """
         cleaned = self._normalize(text)
-        sentences = self._split_sentences(cleaned)
-        facts = self._extract_facts(sentences)
-        contradictions = self._detect_contradictions(facts)
-        keywords = self._extract_keywords(cleaned)
+        return self.finalize(cleaned, self.partial(cleaned))
 
+    # ---------------------------------------------------------
+    # CHUNKED STAGES (see backend/agents/mapreduce.py)
+    # ---------------------------------------------------------
+    def partial(self, chunk: str) -> Dict:
+        """
+        Additive part of process() for normalized text that ends on a
+        sentence boundary. Partials of consecutive chunks merge with
+        mapreduce.merge_partials.
+        """
+        sentences = self._split_sentences(chunk)
         return {
-            "cleaned_text": cleaned,
             "sentences": sentences,
+            "facts": self._extract_facts(sentences),
+            "keyword_counts": self._extract_keywords(chunk)
+        }
+
+    def finalize(self, cleaned: str, partial: Dict) -> Dict:
+        """
+        Builds process() output from the merged partial of the whole
+        text. Contradictions need every fact, so they are found here.
+        """
+        facts = partial["facts"]
+        keyword_counts = partial["keyword_counts"]
+
+        return {
+            "cleaned_text": cleaned,
+            "sentences": partial["sentences"],
             "facts": facts,
-            "contradictions": contradictions,
-            "keywords": keywords
+            "contradictions": self._detect_contradictions(facts),
+            "keywords": list(keyword_counts),
+            "keyword_counts": keyword_counts
         }
 
     # ---------------------------------------------------------
@@ -86,20 +110,39 @@ class LogicModule:
         - "I always exercise" vs "I never exercise"
         - "I hate running" vs "I love running"
         """
+        lowered = [f.lower() for f in facts]
+        always = [i for i, f in enumerate(lowered) if "always" in f]
+        never = [i for i, f in enumerate(lowered) if "never" in f]
+        love = [i for i, f in enumerate(lowered) if "love" in f]
+        hate = [i for i, f in enumerate(lowered) if "hate" in f]
+        always_set, never_set = set(always), set(never)
+        love_set, hate_set = set(love), set(hate)
+
         contradictions = []
 
-        for f1 in facts:
-            for f2 in facts:
+        # Only facts mentioning always/love/hate can open a pair; their
+        # partners come from the matching index lists, in fact order
+        for i in sorted(always_set | love_set | hate_set):
+            f1 = facts[i]
+            partners = set()
+            if i in always_set:
+                partners.update(never)
+            if i in love_set:
+                partners.update(hate)
+            if i in hate_set:
+                partners.update(love)
+
+            for j in sorted(partners):
+                f2 = facts[j]
                 if f1 == f2:
                     continue
 
                 # always vs never
-                if "always" in f1.lower() and "never" in f2.lower():
+                if i in always_set and j in never_set:
                     contradictions.append(f"{f1}  <->  {f2}")
 
                 # love vs hate
-                if ("love" in f1.lower() and "hate" in f2.lower()) or \
-                   ("hate" in f1.lower() and "love" in f2.lower()):
+                if (i in love_set and j in hate_set) or (i in hate_set and j in love_set):
                     contradictions.append(f"{f1}  <->  {f2}")
 
         return contradictions
@@ -107,8 +150,11 @@ class LogicModule:
     # ---------------------------------------------------------
     # KEYWORD EXTRACTION
     # ---------------------------------------------------------
-    def _extract_keywords(self, text: str) -> List[str]:
+    def _extract_keywords(self, text: str) -> Dict[str, int]:
+        """
+        Keyword -> count in order of first appearance, built in a single
+        pass so downstream frequency analysis sees real repetition.
+        """
         words = re.findall(r"[A-Za-z]+", text.lower())
         stopwords = {"the", "and", "to", "a", "i", "of", "in", "it", "that", "for", "on", "with"}
-        keywords = [w for w in words if w not in stopwords and len(w) > 3]
-        return list(sorted(set(keywords)))
+        return dict(Counter(w for w in words if w not in stopwords and len(w) > 3))
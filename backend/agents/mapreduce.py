@@ -0,0 +1,275 @@
+"""
+Chunked Agents Pipeline
+-----------------------
+Map-reduce analysis of one long document across cores.
+
+The normalized text is cut at sentence boundaries into chunks, so that
+" ".join(chunks) is exactly LogicModule's cleaned text. Each chunk is
+mapped on a worker process through the modules' partial() stages:
+
+    sentences, facts, keyword counts     LogicModule
+    habit signals, taxonomy phrase hits  PatternModule
+    emotion / stress / intensity counts  EmotionalModule
+    trend and reward marker scores       PredictiveModule
+    harmful / spiral / punitive hits     EthicalGovernor
+
+Partials are merged in document order by merge_all(), the linear-time
+form of the associative merge_partials() (lists concatenate, counts
+add, sets union). The modules' finalize() stages then run once on the
+merged result; that is where anything needing the whole document
+happens: contradiction detection across every fact, semantic groups,
+behavioral flags, risk, reframing, safety and synthesis. Merged ethical
+phrase hits pick the same safety tier AgentsPipeline.run would.
+
+Every module's public entry point is itself finalize(partial(text)),
+so ChunkedPipeline.run(text) returns exactly AgentsPipeline.run(text).
+
+run_chunks() takes the chunks themselves, already normalized and
+sentence-aligned, as an iterable (bulk/ingest.py's iter_chunks over a
+memory-mapped file). Chunks are mapped as they arrive and folded into
+one partial in document order, so a file-backed document becomes one
+merged result without ever being read into memory raw.
+"""
+
+import os
+import re
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Dict, Iterable, List, Optional
+
+from .pipeline import AgentsPipeline
+
+
+# A run of sentence terminators followed by the single space that
+# separates sentences in normalized text
+_BOUNDARY = re.compile(r"[.!?]+ ")
+
+
+# ---------------------------------------------------------
+# REDUCER
+# ---------------------------------------------------------
+def merge_partials(a, b):
+    """
+    Merges the partials of two consecutive chunks (a before b).
+    """
+    if isinstance(a, dict):
+        merged = dict(a)
+        for key, value in b.items():
+            merged[key] = merge_partials(merged[key], value) if key in merged else value
+        return merged
+    if isinstance(a, list):
+        return a + b
+    if isinstance(a, set):
+        return a | b
+    return a + b
+
+
+def merge_all(partials: List[Dict]) -> Dict:
+    """
+    reduce(merge_partials, partials) in linear time: one accumulator
+    is extended in place instead of rebuilding lists at every step.
+    The inputs are not modified.
+    """
+    merged = _copy(partials[0])
+    for partial in partials[1:]:
+        _merge_into(merged, partial)
+    return merged
+
+
+def _copy(value):
+    if isinstance(value, dict):
+        return {key: _copy(v) for key, v in value.items()}
+    if isinstance(value, (list, set)):
+        return type(value)(value)
+    return value
+
+
+def _merge_into(acc: Dict, partial: Dict):
+    for key, value in partial.items():
+        if key not in acc:
+            acc[key] = _copy(value)
+        elif isinstance(value, dict):
+            _merge_into(acc[key], value)
+        elif isinstance(value, list):
+            acc[key].extend(value)
+        elif isinstance(value, set):
+            acc[key] |= value
+        else:
+            acc[key] += value
+
+
+# ---------------------------------------------------------
+# SPLITTING
+# ---------------------------------------------------------
+def split_at_sentences(cleaned: str, chunk_chars: int) -> List[str]:
+    """
+    Cuts normalized text into chunks of at least `chunk_chars` (except
+    the last), each ending on a sentence terminator. The separating
+    space is dropped, so " ".join(chunks) == cleaned.
+    """
+    chunks, start = [], 0
+
+    for match in _BOUNDARY.finditer(cleaned, chunk_chars):
+        if match.start() < start + chunk_chars:
+            continue
+        chunks.append(cleaned[start:match.end() - 1])
+        start = match.end()
+
+    if start < len(cleaned) or not chunks:
+        chunks.append(cleaned[start:])
+    return chunks
+
+
+# ---------------------------------------------------------
+# MAP
+# ---------------------------------------------------------
+_worker_pipeline: Optional[AgentsPipeline] = None
+
+
+def _init_worker():
+    global _worker_pipeline
+    _worker_pipeline = AgentsPipeline()
+
+
+def map_chunk(chunk: str, pipeline: Optional[AgentsPipeline] = None) -> Dict:
+    """
+    Runs every module's partial() stage on one chunk.
+    """
+    pipeline = pipeline or _worker_pipeline or AgentsPipeline()
+
+    logic = pipeline.logic.partial(chunk)
+    pattern = pipeline.pattern.partial(logic["sentences"])
+
+    return {
+        "logic": logic,
+        "pattern": pattern,
+        "predictive": pipeline.predictive.partial(logic["facts"], pattern["habit_signals"]),
+        "emotional": pipeline.emotional.partial(chunk, logic["sentences"]),
+        "ethical": pipeline.ethical.partial(chunk)
+    }
+
+
+# ---------------------------------------------------------
+# PIPELINE
+# ---------------------------------------------------------
+class ChunkedPipeline:
+
+    def __init__(
+        self,
+        pipeline: Optional[AgentsPipeline] = None,
+        workers: Optional[int] = None,
+        chunk_chars: int = 64 * 1024,
+        executor: Optional[Executor] = None
+    ):
+        self.pipeline = pipeline or AgentsPipeline()
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_chars = chunk_chars
+        self._executor = executor
+        self._owns_executor = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if self._owns_executor and self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+            self._owns_executor = False
+
+    # ---------------------------------------------------------
+    # PUBLIC ENTRY POINT
+    # ---------------------------------------------------------
+    def run(self, text: str, user_id: Optional[str] = None, projection_paths: Optional[int] = None) -> Dict:
+        """
+        Same output as AgentsPipeline.run(text, user_id). Documents that
+        fit in one chunk (or a single worker) are mapped in-process.
+        """
+        cleaned = self.pipeline.logic._normalize(text)
+        chunks = split_at_sentences(cleaned, self.chunk_chars)
+
+        if len(chunks) == 1 or self.workers == 1:
+            partials = [map_chunk(chunk, self.pipeline) for chunk in chunks]
+        else:
+            partials = list(self._pool().map(map_chunk, chunks))
+
+        return self.finalize(cleaned, merge_all(partials), user_id, projection_paths)
+
+    def run_chunks(
+        self,
+        chunks: Iterable[str],
+        user_id: Optional[str] = None,
+        projection_paths: Optional[int] = None
+    ) -> Dict:
+        """
+        One merged result for a document given as normalized chunks that
+        each end on a sentence boundary. Equals run(" ".join(chunks)).
+        With more than one worker, at most 2 * workers chunks are in
+        flight at a time.
+        """
+        parts: List[str] = []
+        merged: Optional[Dict] = None
+
+        def fold(partial: Dict):
+            nonlocal merged
+            if merged is None:
+                merged = _copy(partial)
+            else:
+                _merge_into(merged, partial)
+
+        if self.workers == 1:
+            for chunk in chunks:
+                parts.append(chunk)
+                fold(map_chunk(chunk, self.pipeline))
+        else:
+            pool, in_flight = self._pool(), deque()
+            for chunk in chunks:
+                parts.append(chunk)
+                in_flight.append(pool.submit(map_chunk, chunk))
+                if len(in_flight) >= 2 * self.workers:
+                    fold(in_flight.popleft().result())
+            while in_flight:
+                fold(in_flight.popleft().result())
+
+        if merged is None:
+            parts.append("")
+            merged = map_chunk("", self.pipeline)
+        return self.finalize(" ".join(parts), merged, user_id, projection_paths)
+
+    def finalize(
+        self,
+        cleaned: str,
+        partial: Dict,
+        user_id: Optional[str] = None,
+        projection_paths: Optional[int] = None
+    ) -> Dict:
+        """
+        Runs every module's finalize() stage on the merged partial.
+        """
+        p = self.pipeline
+
+        logic = p.logic.finalize(cleaned, partial["logic"])
+
+        # Any phrase hit is exactly what the prefilter tier looks for
+        hits = partial["ethical"]
+        if hits["harmful_hits"] or hits["spiral_hits"] or hits["punitive_hits"]:
+            return p.grounded(logic, p.ethical.finalize(logic, {}, {}, hits))
+
+        pattern = p.pattern.finalize(logic, partial["pattern"], user_id)
+        emotional = p.emotional.finalize(partial["emotional"])
+        predictive = p.predictive.finalize(logic, pattern, partial["predictive"], projection_paths)
+        ethical = p.ethical.finalize(logic, predictive, emotional, hits)
+        synthesis = p.synthesis.synthesize(logic, pattern, predictive, emotional, ethical)
+
+        return p._result("full", logic, pattern, predictive, emotional, ethical, synthesis)
+
+    # ---------------------------------------------------------
+    # INTERNALS
+    # ---------------------------------------------------------
+    def _pool(self) -> Executor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker)
+            self._owns_executor = True
+        return self._executor
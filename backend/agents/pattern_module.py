@@ -8,18 +8,30 @@ a structured dictionary for downstream modules.
 
 import re
 from collections import Counter, defaultdict
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple, Union
+
+from .heavy_hitters import KeywordHistory
+from .taxonomy import SharedTaxonomy, TaxonomyIndex, load_taxonomy
 
 
 class PatternModule:
 
-    def __init__(self):
-        pass
+    # Mentions across a user's history before a keyword counts as a
+    # recurring theme
+    RECURRENCE_THRESHOLD = 5
+
+    def __init__(
+        self,
+        history: Optional[KeywordHistory] = None,
+        taxonomy: Optional[Union[TaxonomyIndex, SharedTaxonomy]] = None
+    ):
+        self.history = history if history is not None else KeywordHistory()
+        self.taxonomy = taxonomy if taxonomy is not None else load_taxonomy()
 
     # ---------------------------------------------------------
     # PUBLIC ENTRY POINT
     # ---------------------------------------------------------
-    def analyze(self, logic_output: Dict) -> Dict:
+    def analyze(self, logic_output: Dict, user_id: Optional[str] = None) -> Dict:
         """
         Accepts the output of LogicModule.process() and returns:
         {
@@ -27,23 +39,56 @@ class PatternModule:
             "keyword_frequency": {...},
             "habit_signals": [...],
             "semantic_groups": {...},
-            "behavioral_flags": [...]
+            "behavioral_flags": [...],
+            "recurring_keywords": {...}
+        }
+
+        With a user_id, this entry's keywords are also folded into the
+        user's bounded keyword history so repetition across entries is
+        flagged too.
+        """
+        partial = self.partial(logic_output.get("sentences", []))
+        return self.finalize(logic_output, partial, user_id)
+
+    # ---------------------------------------------------------
+    # CHUNKED STAGES (see backend/agents/mapreduce.py)
+    # ---------------------------------------------------------
+    def partial(self, sentences: List[str]) -> Dict:
+        """
+        Additive part of analyze() for one chunk's sentences.
+        """
+        return {
+            "habit_signals": self._habit_signals(sentences),
+            "phrase_hits": self._phrase_hits(sentences)
         }
+
+    def finalize(self, logic_output: Dict, partial: Dict, user_id: Optional[str] = None) -> Dict:
+        """
+        Builds analyze() output from the merged partial and the whole
+        document's LogicModule output.
         """
         keywords = logic_output.get("keywords", [])
-        sentences = logic_output.get("sentences", [])
 
-        freq = self._keyword_frequency(keywords)
-        habits = self._habit_signals(sentences)
-        groups = self._semantic_groups(keywords)
+        freq = logic_output.get("keyword_counts") or self._keyword_frequency(keywords)
+        habits = partial["habit_signals"]
+        groups = self._semantic_groups(keywords, partial["phrase_hits"])
         flags = self._behavioral_flags(habits, freq)
 
+        recurring = {}
+        if user_id is not None:
+            recurring = self._recurring_keywords(user_id, freq)
+            flags.extend(
+                f"Recurring theme: '{word}' mentioned {count} times across entries"
+                for word, count in recurring.items()
+            )
+
         return {
             "keywords": keywords,
             "keyword_frequency": freq,
             "habit_signals": habits,
             "semantic_groups": groups,
-            "behavioral_flags": flags
+            "behavioral_flags": flags,
+            "recurring_keywords": recurring
         }
 
     # ---------------------------------------------------------
@@ -52,6 +97,22 @@ class PatternModule:
     def _keyword_frequency(self, keywords: List[str]) -> Dict[str, int]:
         return dict(Counter(keywords))
 
+    # ---------------------------------------------------------
+    # CROSS-ENTRY RECURRENCE
+    # ---------------------------------------------------------
+    def _recurring_keywords(self, user_id: str, freq: Dict[str, int]) -> Dict[str, int]:
+        """
+        Updates the user's heavy-hitter history and returns this entry's
+        keywords that are among the user's top recurring ones.
+        """
+        top = self.history.update(user_id, freq)
+
+        return {
+            word: count
+            for word, count in top
+            if word in freq and count >= self.RECURRENCE_THRESHOLD
+        }
+
     # ---------------------------------------------------------
     # HABIT SIGNAL DETECTION
     # ---------------------------------------------------------
@@ -86,34 +147,34 @@ class PatternModule:
         return signals
 
     # ---------------------------------------------------------
-    # SEMANTIC GROUPING (simple but real)
+    # SEMANTIC GROUPING
     # ---------------------------------------------------------
-    def _semantic_groups(self, keywords: List[str]) -> Dict[str, List[str]]:
+    def _phrase_hits(self, sentences: List[str]) -> List[Tuple[str, str]]:
         """
-        Groups keywords into simple semantic categories.
-        This is rule-based but functional.
+        (phrase, category) for every multi-word taxonomy term, in order.
         """
+        return [hit for s in sentences for hit in self.taxonomy.phrases(s)]
 
-        categories = {
-            "health": ["exercise", "diet", "sleep", "run", "gym", "fatigue"],
-            "emotion": ["happy", "sad", "angry", "anxious", "stress"],
-            "work": ["job", "career", "project", "deadline", "focus"],
-            "social": ["friends", "family", "relationship", "people"],
-            "self": ["goals", "future", "improve", "change"]
-        }
-
+    def _semantic_groups(
+        self,
+        keywords: List[str],
+        phrase_hits: Optional[List[Tuple[str, str]]] = None
+    ) -> Dict[str, List[str]]:
+        """
+        Groups keywords (and multi-word phrases found by _phrase_hits)
+        into the taxonomy's semantic categories; unknown keywords go to
+        "other".
+        """
         groups = defaultdict(list)
 
         for kw in keywords:
-            matched = False
-            for cat, words in categories.items():
-                if kw in words:
-                    groups[cat].append(kw)
-                    matched = True
-                    break
+            groups[self.taxonomy.category(kw) or "other"].append(kw)
 
-            if not matched:
-                groups["other"].append(kw)
+        seen = set()
+        for phrase, cat in phrase_hits or []:
+            if phrase not in seen:
+                seen.add(phrase)
+                groups[cat].append(phrase)
 
         return dict(groups)
 
@@ -0,0 +1,112 @@
+"""
+Agents Pipeline
+---------------
+Runs the agent modules in dependency order on one piece of text:
+
+    Logic -> Pattern -> Predictive -> Emotional -> Ethical -> Synthesis
+
+and returns every module's output so callers (the API, analytics, bulk
+tools) can pick what they need.
+
+Safety runs in two tiers. Right after logic normalizes the text, a
+precompiled prefilter (EthicalGovernor.prefilter) looks for the watched
+harmful / spiral / self-punitive phrases. A hit means the governor is
+certain to veto, so pattern, emotional and predictive analysis and
+full synthesis are all skipped: their outputs are empty (vetoed input
+never reaches the user's keyword history) and "synthesis" is the
+grounding response. Everything else takes the full path. tier_stats()
+counts both.
+
+Documents too large for one string are analyzed with
+mapreduce.ChunkedPipeline.run_chunks(), which merges a stream of chunks
+into one result.
+"""
+
+import threading
+from typing import Dict, Optional
+
+from .emotional_module import EmotionalModule
+from .ethical_governor import EthicalGovernor
+from .logic_module import LogicModule
+from .pattern_module import PatternModule
+from .predictive_module import PredictiveModule
+from .synthesis_module import SynthesisModule
+
+
+class AgentsPipeline:
+
+    def __init__(self):
+        self.logic = LogicModule()
+        self.pattern = PatternModule()
+        self.predictive = PredictiveModule()
+        self.emotional = EmotionalModule()
+        self.ethical = EthicalGovernor()
+        self.synthesis = SynthesisModule()
+
+        self._tiers = {"prefilter": 0, "full": 0}
+        self._tiers_lock = threading.Lock()
+
+    # ---------------------------------------------------------
+    # PUBLIC ENTRY POINT
+    # ---------------------------------------------------------
+    def run(self, text: str, user_id: Optional[str] = None, projection_paths: Optional[int] = None) -> Dict:
+        """
+        `projection_paths` sizes the predictive Monte Carlo projection
+        (None = default, 0 = skip it; see projection.py).
+
+        Returns:
+        {
+            "logic": {...},
+            "pattern": {...},
+            "predictive": {...},
+            "emotional": {...},
+            "ethical": {...},
+            "synthesis": {...},
+            "tier": "prefilter" | "full"
+        }
+        """
+        logic = self.logic.process(text)
+
+        if self.ethical.prefilter(logic["cleaned_text"]):
+            return self.grounded(logic, self.ethical.regulate(logic, {}, {}, {}))
+
+        pattern = self.pattern.analyze(logic, user_id)
+        emotional = self.emotional.evaluate(logic)
+        predictive = self.predictive.forecast(logic, pattern, projection_paths)
+        ethical = self.ethical.regulate(logic, pattern, predictive, emotional)
+        synthesis = self.synthesis.synthesize(logic, pattern, predictive, emotional, ethical)
+
+        return self._result("full", logic, pattern, predictive, emotional, ethical, synthesis)
+
+    def grounded(self, logic: Dict, ethical: Dict) -> Dict:
+        """
+        run() output for input the prefilter vetoed.
+        """
+        synthesis = self.synthesis.ground(ethical)
+        return self._result("prefilter", logic, {}, {}, {}, ethical, synthesis)
+
+    def tier_stats(self) -> Dict:
+        with self._tiers_lock:
+            counts = dict(self._tiers)
+        total = sum(counts.values())
+        return {
+            **counts,
+            "prefilter_ratio": counts["prefilter"] / total if total else 0.0
+        }
+
+    # ---------------------------------------------------------
+    # INTERNALS
+    # ---------------------------------------------------------
+    def _result(self, tier, logic, pattern, predictive, emotional, ethical, synthesis) -> Dict:
+        with self._tiers_lock:
+            self._tiers[tier] += 1
+
+        return {
+            "logic": logic,
+            "pattern": pattern,
+            "predictive": predictive,
+            "emotional": emotional,
+            "ethical": ethical,
+            "synthesis": synthesis,
+            "tier": tier
+        }
@@ -5,25 +5,31 @@ Uses logical and pattern analysis outputs to estimate simple future
 trajectories, risk/reward balance, and stability signals.
 
 This is a real, rule-based predictive engine that returns structured
-signals for the IAI and downstream modules.
+signals for the IAI and downstream modules. The labels also drive a
+Monte Carlo projection (see projection.py) that turns them into
+quantile bands of where the trajectory may go.
 """
 
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple
+
+from .projection import TrajectorySimulator
 
 
 class PredictiveModule:
 
-    def __init__(self):
-        pass
+    def __init__(self, simulator: Optional[TrajectorySimulator] = None):
+        self.simulator = simulator if simulator is not None else TrajectorySimulator()
 
     # ---------------------------------------------------------
     # PUBLIC ENTRY POINT
     # ---------------------------------------------------------
-    def forecast(self, logic_output: Dict, pattern_output: Dict) -> Dict:
+    def forecast(self, logic_output: Dict, pattern_output: Dict, projection_paths: Optional[int] = None) -> Dict:
         """
         Accepts:
           - logic_output: LogicModule.process()
           - pattern_output: PatternModule.analyze()
+          - projection_paths: Monte Carlo paths for "projection" (None
+            = the simulator's default, 0 = no projection)
 
         Returns:
         {
@@ -31,33 +37,70 @@ class PredictiveModule:
             "risk_level": "low" | "medium" | "high",
             "reward_potential": "low" | "medium" | "high",
             "stability": "stable" | "volatile",
-            "supporting_signals": [...]
+            "supporting_signals": [...],
+            "projection": {"horizon", "paths", "seed", "bands", "mean", "prob_improve"} | None
         }
         """
         facts = logic_output.get("facts", [])
-        contradictions = logic_output.get("contradictions", [])
         habits = pattern_output.get("habit_signals", [])
+        return self.finalize(logic_output, pattern_output, self.partial(facts, habits), projection_paths)
+
+    # ---------------------------------------------------------
+    # CHUNKED STAGES (see backend/agents/mapreduce.py)
+    # ---------------------------------------------------------
+    def partial(self, facts: List[str], habits: List[str]) -> Dict:
+        """
+        Marker scores over one chunk's facts and habit signals. Each
+        fact or habit contributes independently, so scores add up.
+        """
+        positive, negative = self._trend_scores(facts, habits)
+        return {
+            "trend_positive": positive,
+            "trend_negative": negative,
+            "reward_score": self._reward_score(facts, habits)
+        }
+
+    def finalize(
+        self,
+        logic_output: Dict,
+        pattern_output: Dict,
+        partial: Dict,
+        projection_paths: Optional[int] = None
+    ) -> Dict:
+        """
+        Builds forecast() output from merged scores plus the whole
+        document's contradictions and behavioral flags.
+        """
+        contradictions = logic_output.get("contradictions", [])
         flags = pattern_output.get("behavioral_flags", [])
-        freq = pattern_output.get("keyword_frequency", {})
 
-        trend = self._trend_direction(facts, contradictions, habits)
+        trend = self._trend_direction(partial["trend_positive"], partial["trend_negative"], contradictions)
         risk = self._risk_level(contradictions, flags)
-        reward = self._reward_potential(facts, habits)
+        reward = self._reward_potential(partial["reward_score"])
         stability = self._stability(trend, risk, flags)
         signals = self._supporting_signals(trend, risk, reward, stability, flags)
 
+        params = self.simulator.parameters(
+            trend_score=partial["trend_positive"] - partial["trend_negative"] - 0.5 * len(contradictions),
+            risk=risk,
+            reward_score=partial["reward_score"],
+            imbalance=any("Emotional imbalance" in f for f in flags),
+            recurring=len(pattern_output.get("recurring_keywords", {}))
+        )
+
         return {
             "trend_direction": trend,
             "risk_level": risk,
             "reward_potential": reward,
             "stability": stability,
-            "supporting_signals": signals
+            "supporting_signals": signals,
+            "projection": self.simulator.project(params, paths=projection_paths)
         }
 
     # ---------------------------------------------------------
     # TREND DIRECTION
     # ---------------------------------------------------------
-    def _trend_direction(self, facts: List[str], contradictions: List[str], habits: List[str]) -> str:
+    def _trend_scores(self, facts: List[str], habits: List[str]) -> Tuple[int, int]:
         positive_markers = ["improve", "better", "progress", "working on", "trying to"]
         negative_markers = ["stuck", "worse", "decline", "give up", "tired of"]
 
@@ -71,6 +114,9 @@ class PredictiveModule:
             if any(m in lower for m in negative_markers):
                 neg_score += 1
 
+        return pos_score, neg_score
+
+    def _trend_direction(self, pos_score: int, neg_score: int, contradictions: List[str]) -> str:
         # contradictions reduce clarity
         neg_score += len(contradictions) * 0.5
 
@@ -105,7 +151,7 @@ class PredictiveModule:
     # ---------------------------------------------------------
     # REWARD POTENTIAL
     # ---------------------------------------------------------
-    def _reward_potential(self, facts: List[str], habits: List[str]) -> str:
+    def _reward_score(self, facts: List[str], habits: List[str]) -> int:
         growth_markers = ["goal", "goals", "future", "learn", "build", "create", "practice"]
         effort_markers = ["every day", "every morning", "often", "keep", "try", "working on"]
 
@@ -118,6 +164,9 @@ class PredictiveModule:
             if any(m in lower for m in effort_markers):
                 score += 1
 
+        return score
+
+    def _reward_potential(self, score: int) -> str:
         if score >= 4:
             return "high"
         elif score >= 2:
@@ -0,0 +1,204 @@
+"""
+Shared Read-Only State
+----------------------
+A flat, mmap'able file format for immutable lookup state (the compiled
+taxonomy today), so N worker processes map one copy instead of each
+building its own dicts.
+
+Layout:
+
+    8 bytes   magic b"MSTATE01"
+    4 bytes   header length (little-endian uint32)
+    header    JSON: section table and metadata
+    sections  4-byte aligned uint32 arrays
+    blob      every string, UTF-8, back to back
+
+Two section kinds:
+  - map:  string -> uint32, an open-addressing hash table of
+          (key offset, key length + 1, value) slots, 0 length = empty,
+          probed linearly from crc32(key)
+  - list: index -> string, (offset, length) pairs
+
+Readers cast the mapping to uint32 memoryviews and compare keys
+against the blob in place; nothing is copied into Python containers.
+
+Reloads are atomic: write_segment() writes a temporary file and
+os.replace()s it over the old path. SharedSegment notices the new file
+and maps it; lookups already running keep the old mapping alive until
+they drop it, so readers never see a half-written table.
+"""
+
+import json
+import mmap
+import os
+import struct
+import time
+import zlib
+from typing import Dict, List, Optional
+
+
+MAGIC = b"MSTATE01"
+_PREFIX = struct.Struct("<8sI")
+
+
+def _align(n: int) -> int:
+    return (n + 3) & ~3
+
+
+# ---------------------------------------------------------
+# WRITER
+# ---------------------------------------------------------
+def write_segment(
+    path: str,
+    maps: Dict[str, Dict[str, int]],
+    lists: Dict[str, List[str]],
+    meta: Optional[Dict] = None
+):
+    """
+    Serializes `maps` and `lists` to `path`, replacing any previous
+    segment atomically.
+    """
+    blob = bytearray()
+    offsets: Dict[str, int] = {}
+
+    def intern(s: str):
+        off = offsets.get(s)
+        data = s.encode("utf-8")
+        if off is None:
+            off = offsets[s] = len(blob)
+            blob.extend(data)
+        return off, len(data)
+
+    sections = {}
+    arrays = []
+    cursor = 0
+
+    for name, mapping in maps.items():
+        slots = 8
+        while slots < 2 * len(mapping):
+            slots *= 2
+        table = [0] * (3 * slots)
+        for key, value in mapping.items():
+            off, length = intern(key)
+            i = zlib.crc32(key.encode("utf-8")) & (slots - 1)
+            while table[3 * i + 1]:
+                i = (i + 1) & (slots - 1)
+            table[3 * i:3 * i + 3] = [off, length + 1, value]
+        sections[name] = {"kind": "map", "offset": cursor, "slots": slots, "count": len(mapping)}
+        arrays.append(table)
+        cursor += 4 * len(table)
+
+    for name, items in lists.items():
+        table = []
+        for item in items:
+            table.extend(intern(item))
+        sections[name] = {"kind": "list", "offset": cursor, "count": len(items)}
+        arrays.append(table)
+        cursor += 4 * len(table)
+
+    header = json.dumps({
+        "sections": sections,
+        "blob": [cursor, len(blob)],
+        "meta": meta or {},
+        "built_at": time.time(),
+    }).encode("utf-8")
+    data_start = _align(_PREFIX.size + len(header))
+
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(_PREFIX.pack(MAGIC, len(header)))
+        f.write(header)
+        f.write(b"\0" * (data_start - _PREFIX.size - len(header)))
+        for table in arrays:
+            f.write(struct.pack(f"<{len(table)}I", *table))
+        f.write(blob)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+# ---------------------------------------------------------
+# READER
+# ---------------------------------------------------------
+class StateSegment:
+    """
+    One mapped segment file. Immutable; share it freely between threads.
+    """
+
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self.inode = os.fstat(f.fileno()).st_ino
+
+        magic, header_len = _PREFIX.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a shared state segment")
+        header = json.loads(self._map[_PREFIX.size:_PREFIX.size + header_len])
+        data_start = _align(_PREFIX.size + header_len)
+
+        view = memoryview(self._map)
+        blob_off, blob_len = header["blob"]
+        self._blob = view[data_start + blob_off:data_start + blob_off + blob_len]
+        self.meta: Dict = header["meta"]
+
+        self._sections = {}
+        for name, section in header["sections"].items():
+            width = 3 * section["slots"] if section["kind"] == "map" else 2 * section["count"]
+            start = data_start + section["offset"]
+            self._sections[name] = (section, view[start:start + 4 * width].cast("I"))
+
+    def lookup(self, name: str, key: str) -> Optional[int]:
+        section, table = self._sections[name]
+        data = key.encode("utf-8")
+        mask = section["slots"] - 1
+        i = zlib.crc32(data) & mask
+
+        while True:
+            stored = table[3 * i + 1]
+            if not stored:
+                return None
+            if stored - 1 == len(data):
+                off = table[3 * i]
+                if self._blob[off:off + len(data)] == data:
+                    return table[3 * i + 2]
+            i = (i + 1) & mask
+
+    def item(self, name: str, index: int) -> str:
+        _, table = self._sections[name]
+        off, length = table[2 * index], table[2 * index + 1]
+        return str(self._blob[off:off + length], "utf-8")
+
+    def items(self, name: str) -> List[str]:
+        section, _ = self._sections[name]
+        return [self.item(name, i) for i in range(section["count"])]
+
+    def count(self, name: str) -> int:
+        return self._sections[name][0]["count"]
+
+
+class SharedSegment:
+    """
+    The current StateSegment at `path`, swapped for a new one when the
+    file is replaced. The file is checked at most every `check_interval`
+    seconds.
+    """
+
+    def __init__(self, path: str, check_interval: float = 2.0):
+        self.path = path
+        self.check_interval = check_interval
+        self._segment = StateSegment(path)
+        self._checked = time.monotonic()
+        self.generation = 1
+
+    def get(self) -> StateSegment:
+        now = time.monotonic()
+        if now - self._checked >= self.check_interval:
+            self._checked = now
+            try:
+                replaced = os.stat(self.path).st_ino != self._segment.inode
+            except OSError:
+                replaced = False  # keep serving the mapping we have
+            if replaced:
+                self._segment = StateSegment(self.path)
+                self.generation += 1
+        return self._segment
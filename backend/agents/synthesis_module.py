@@ -12,6 +12,17 @@ This is a fully functional synthesis engine.
 from typing import Dict, List
 
 
+# Prefix of EthicalGovernor's flags for harmful language
+HARMFUL_FLAG = "Harmful language detected"
+
+GROUNDING_SUMMARY = (
+    "Your recent statements indicate emotional or cognitive strain. "
+    "The system has reframed your input for clarity and support. "
+    "Before projecting future outcomes, grounding and emotional stability "
+    "are recommended."
+)
+
+
 class SynthesisModule:
 
     def __init__(self):
@@ -69,6 +80,32 @@ class SynthesisModule:
             "allowed": allowed
         }
 
+    # ---------------------------------------------------------
+    # GROUNDING RESPONSE
+    # ---------------------------------------------------------
+    def ground(self, ethical_output: Dict) -> Dict:
+        """
+        The grounding response for input the safety prefilter already
+        vetoed. Pattern, emotional and predictive analysis were skipped,
+        so what they would have measured (trajectory, reward, emotion,
+        stability) is reported as "unknown". Risk comes from the flags
+        behind the veto: high for harmful language, medium when only
+        spiral or self-punitive phrasing was found.
+        """
+        flags = ethical_output.get("ethical_flags", [])
+        harmful = any(flag.startswith(HARMFUL_FLAG) for flag in flags)
+
+        return {
+            "summary": GROUNDING_SUMMARY,
+            "trajectory": "unknown",
+            "risk": "high" if harmful else "medium",
+            "reward": "unknown",
+            "emotion": "unknown",
+            "stability": "unknown",
+            "insights": ["Grounding and rest are recommended before looking ahead."],
+            "allowed": ethical_output.get("safe_to_proceed", False)
+        }
+
     # ---------------------------------------------------------
     # SUMMARY GENERATION
     # ---------------------------------------------------------
@@ -92,12 +129,7 @@ class SynthesisModule:
         stability = predictive.get("stability", "stable")
 
         if not ethical.get("safe_to_proceed", True):
-            return (
-                "Your recent statements indicate emotional or cognitive strain. "
-                "The system has reframed your input for clarity and support. "
-                "Before projecting future outcomes, grounding and emotional stability "
-                "are recommended."
-            )
+            return GROUNDING_SUMMARY
 
         return (
             f"Your current emotional state appears to be centered around {emotion}. "
@@ -0,0 +1,308 @@
+"""
+Semantic Taxonomy Index
+-----------------------
+Maps keywords and multi-word phrases to semantic categories for
+PatternModule._semantic_groups.
+
+The taxonomy lives in a versioned data file (data/taxonomy_v<N>.json):
+
+    {
+      "version": 1,
+      "categories": {
+        "<category>": {"terms": [...], "phrases": [...]},
+        ...
+      }
+    }
+
+It is compiled once per process into:
+  - a term -> category hash map for single tokens
+  - a stem -> lemma map, so inflected forms ("exercising", "goal")
+    resolve to the listed term ("exercise", "goals")
+  - a token trie for multi-word phrases, matched longest-first
+
+Lookups cost one or two dict probes per token, and phrase matching is
+bounded by the longest phrase, so neither grows with taxonomy size.
+Categories earlier in the file win when a term is listed twice.
+
+load_taxonomy() caches the compiled index per path. Loading it before
+worker processes fork (the API and bulk tools do, via PatternModule)
+shares it copy-on-write; it is never mutated after compilation.
+
+Copy-on-write sharing does not survive separately started workers
+(uvicorn --workers) or CPython refcount writes. With
+MIRROR_TAXONOMY_SEGMENT set, the index is instead written once to a
+flat shared segment file (see shared_state.py) and every worker maps
+that file; SharedTaxonomy answers the same lookups straight from the
+mapping. Rebuilding the segment while workers run swaps it in
+atomically:
+
+    python -m backend.agents.taxonomy build /dev/shm/mirror-taxonomy.seg
+"""
+
+import argparse
+import json
+import os
+import re
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, Iterator, List, Mapping, Optional, Tuple, Union
+
+from .shared_state import SharedSegment, write_segment
+
+
+DEFAULT_PATH = os.environ.get(
+    "MIRROR_TAXONOMY_PATH",
+    os.path.join(os.path.dirname(__file__), "data", "taxonomy_v1.json")
+)
+SEGMENT_PATH = os.environ.get("MIRROR_TAXONOMY_SEGMENT")
+
+# Marks the end of a phrase inside a trie node
+_END = ""
+
+_WORD = re.compile(r"[a-z]+")
+
+
+def stem(word: str) -> str:
+    """
+    Light suffix stripping: enough to fold plurals and common verb
+    forms together, never shorter than three letters.
+    """
+    for suffix in ("ing", "ed", "es", "ly", "s"):
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            if suffix == "s" and word[-2] in "su":
+                break  # "stress", "anxious"
+            word = word[:-len(suffix)]
+            break
+    if word.endswith("e") and len(word) > 3:
+        word = word[:-1]
+    return word
+
+
+class TaxonomyIndex:
+
+    def __init__(self, version: int, categories: Dict[str, Dict[str, List[str]]]):
+        self.version = version
+        self.categories: Tuple[str, ...] = tuple(categories)
+
+        terms: Dict[str, str] = {}
+        lemmas: Dict[str, str] = {}
+        trie: Dict = {}
+        longest = 0
+
+        for category, entry in categories.items():
+            for term in entry.get("terms", []):
+                term = term.lower()
+                terms.setdefault(term, category)
+                lemmas.setdefault(stem(term), term)
+
+            for phrase in entry.get("phrases", []):
+                tokens = _WORD.findall(phrase.lower())
+                if not tokens:
+                    continue
+                node = trie
+                for token in tokens:
+                    node = node.setdefault(token, {})
+                node.setdefault(_END, (" ".join(tokens), category))
+                longest = max(longest, len(tokens))
+
+        self._terms: Mapping[str, str] = MappingProxyType(terms)
+        self._lemmas: Mapping[str, str] = MappingProxyType(lemmas)
+        self._trie = trie
+        self.longest_phrase = longest
+
+    @classmethod
+    def load(cls, path: str) -> "TaxonomyIndex":
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return cls(data["version"], data["categories"])
+
+    def __len__(self) -> int:
+        return len(self._terms)
+
+    def phrase_entries(self) -> Iterator[Tuple[str, str]]:
+        """
+        Every (phrase, category) in the trie.
+        """
+        stack = [self._trie]
+        while stack:
+            node = stack.pop()
+            for token, child in node.items():
+                if token == _END:
+                    yield child
+                else:
+                    stack.append(child)
+
+    # ---------------------------------------------------------
+    # LOOKUPS
+    # ---------------------------------------------------------
+    def lemma(self, word: str) -> Optional[str]:
+        """
+        The taxonomy term a word resolves to, directly or via its stem.
+        """
+        if word in self._terms:
+            return word
+        return self._lemmas.get(stem(word))
+
+    def category(self, word: str) -> Optional[str]:
+        lemma = self.lemma(word)
+        return None if lemma is None else self._terms[lemma]
+
+    def phrases(self, text: str) -> Iterator[Tuple[str, str]]:
+        """
+        Yields (phrase, category) for every multi-word term in `text`,
+        scanning left to right and taking the longest match at each
+        position.
+        """
+        if not self._trie:
+            return
+
+        tokens = _WORD.findall(text.lower())
+        i = 0
+        while i < len(tokens):
+            node, match, j = self._trie, None, i
+            while j < len(tokens) and tokens[j] in node:
+                node = node[tokens[j]]
+                j += 1
+                if _END in node:
+                    match = (node[_END], j)
+
+            if match is None:
+                i += 1
+            else:
+                yield match[0]
+                i = match[1]
+
+
+class SharedTaxonomy:
+    """
+    TaxonomyIndex lookups served from a mapped shared segment.
+
+    Multi-word phrases become two hash maps: full phrases, and every
+    proper token prefix of one. Extending a match while the text so far
+    is a known prefix walks the same paths as the trie.
+    """
+
+    def __init__(self, path: str, check_interval: float = 2.0):
+        self._segment = SharedSegment(path, check_interval)
+
+    @property
+    def version(self) -> int:
+        return self._segment.get().meta["version"]
+
+    @property
+    def categories(self) -> Tuple[str, ...]:
+        return tuple(self._segment.get().items("categories"))
+
+    @property
+    def longest_phrase(self) -> int:
+        return self._segment.get().meta["longest_phrase"]
+
+    def __len__(self) -> int:
+        return self._segment.get().count("terms")
+
+    # ---------------------------------------------------------
+    # LOOKUPS
+    # ---------------------------------------------------------
+    def lemma(self, word: str) -> Optional[str]:
+        segment = self._segment.get()
+        if segment.lookup("terms", word) is not None:
+            return word
+        index = segment.lookup("lemmas", stem(word))
+        return None if index is None else segment.item("lemma_terms", index)
+
+    def category(self, word: str) -> Optional[str]:
+        segment = self._segment.get()
+        category = segment.lookup("terms", word)
+        if category is None:
+            index = segment.lookup("lemmas", stem(word))
+            if index is None:
+                return None
+            category = segment.lookup("terms", segment.item("lemma_terms", index))
+        return segment.item("categories", category)
+
+    def phrases(self, text: str) -> Iterator[Tuple[str, str]]:
+        segment = self._segment.get()
+        longest = segment.meta["longest_phrase"]
+        if not longest:
+            return
+
+        tokens = _WORD.findall(text.lower())
+        i = 0
+        while i < len(tokens):
+            match, j = None, i
+            while j < len(tokens) and j - i < longest:
+                key = " ".join(tokens[i:j + 1])
+                j += 1
+                category = segment.lookup("phrases", key)
+                if category is not None:
+                    match = ((key, segment.item("categories", category)), j)
+                if segment.lookup("phrase_prefixes", key) is None:
+                    break
+
+            if match is None:
+                i += 1
+            else:
+                yield match[0]
+                i = match[1]
+
+
+def write_taxonomy_segment(index: TaxonomyIndex, path: str):
+    """
+    Flattens a compiled index into a shared segment at `path`.
+    """
+    category_ids = {name: i for i, name in enumerate(index.categories)}
+    lemma_terms = sorted(set(index._lemmas.values()))
+    lemma_ids = {term: i for i, term in enumerate(lemma_terms)}
+
+    phrases, prefixes = {}, {}
+    for phrase, category in index.phrase_entries():
+        phrases[phrase] = category_ids[category]
+        tokens = phrase.split(" ")
+        for n in range(1, len(tokens)):
+            prefixes[" ".join(tokens[:n])] = 0
+
+    write_segment(
+        path,
+        maps={
+            "terms": {term: category_ids[cat] for term, cat in index._terms.items()},
+            "lemmas": {s: lemma_ids[term] for s, term in index._lemmas.items()},
+            "phrases": phrases,
+            "phrase_prefixes": prefixes,
+        },
+        lists={"categories": list(index.categories), "lemma_terms": lemma_terms},
+        meta={"version": index.version, "longest_phrase": index.longest_phrase},
+    )
+
+
+@lru_cache(maxsize=None)
+def load_taxonomy(
+    path: str = DEFAULT_PATH,
+    segment: Optional[str] = SEGMENT_PATH
+) -> Union[TaxonomyIndex, SharedTaxonomy]:
+    """
+    The taxonomy for `path`, built once per process; or, with a segment
+    path, mapped from the shared segment (built from `path` first if it
+    is missing or older than the data file).
+    """
+    if segment is None:
+        return TaxonomyIndex.load(path)
+
+    if not os.path.exists(segment) or os.path.getmtime(segment) < os.path.getmtime(path):
+        write_taxonomy_segment(TaxonomyIndex.load(path), segment)
+    return SharedTaxonomy(segment)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the shared taxonomy segment")
+    parser.add_argument("command", choices=["build"])
+    parser.add_argument("segment", help="output path, e.g. /dev/shm/mirror-taxonomy.seg")
+    parser.add_argument("--taxonomy", default=DEFAULT_PATH, help="taxonomy data file")
+    args = parser.parse_args()
+
+    index = TaxonomyIndex.load(args.taxonomy)
+    write_taxonomy_segment(index, args.segment)
+    print(f"wrote {len(index)} terms (taxonomy v{index.version}) to {args.segment}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,240 @@
+"""
+Mirror of Tomorrow - Analytics Aggregator
+-----------------------------------------
+Population-level views over every analysis without storing or scanning
+individual results.
+
+Each worker process owns one AnalyticsShard and updates it on every
+analysis:
+  - distinct users             HyperLogLog
+  - sentiment_score quantiles  TDigest
+  - keywords                   Count-Min sketch + top-k candidates
+  - dominant_emotion           exact counts (small, fixed label set)
+  - risk_level per hour        exact counts, last `RETENTION_HOURS` only
+  - semantic groups            exact counts (small, fixed category set)
+
+When MIRROR_ANALYTICS_DIR is set, shards are flushed there periodically
+and read() merges every worker's shard file with the live local shard.
+The merged view is cached for a few seconds, so /analytics queries are
+constant time regardless of traffic.
+
+Shard files are named after the process id plus a random per-process
+token, so a restarted worker that reuses a pid starts its own file
+rather than overwriting (or hiding) the old one. A dead worker's file
+keeps counting until it has gone `shard_ttl` (RETENTION_HOURS by
+default) without a flush; read() then deletes it.
+"""
+
+import json
+import os
+import threading
+import time
+import uuid
+from collections import Counter
+from typing import Dict, List, Optional
+
+from backend.agents.heavy_hitters import CountMinSketch, HeavyHitters
+from backend.analytics.sketches import HyperLogLog, TDigest
+
+
+RETENTION_HOURS = 48
+TOP_KEYWORDS = 20
+
+
+class AnalyticsShard:
+
+    def __init__(self):
+        self.analyses = 0
+        self.users = HyperLogLog()
+        self.sentiment = TDigest()
+        self.keywords = HeavyHitters(k=TOP_KEYWORDS, width=2048, depth=4)
+        self.emotions: Counter = Counter()
+        self.risk_by_hour: Dict[int, Counter] = {}
+        self.semantic_groups: Counter = Counter()
+
+    def record(self, agents_output: Dict, user_id: Optional[str] = None, now: Optional[float] = None):
+        """
+        Folds one AgentsPipeline.run() output into the shard.
+        """
+        emotional = agents_output.get("emotional", {})
+        predictive = agents_output.get("predictive", {})
+        pattern = agents_output.get("pattern", {})
+
+        self.analyses += 1
+        if user_id is not None:
+            self.users.add(user_id)
+
+        # Prefilter-tier results skip emotional analysis
+        if emotional:
+            self.sentiment.add(emotional.get("sentiment_score", 0.0))
+            self.emotions[emotional.get("dominant_emotion", "neutral")] += 1
+        self.keywords.update(pattern.get("keyword_frequency", {}))
+
+        for group, words in pattern.get("semantic_groups", {}).items():
+            self.semantic_groups[group] += len(words)
+
+        hour = int((time.time() if now is None else now) // 3600)
+        # Prefilter-tier results have no predictive output; their risk is
+        # reported by the grounding synthesis
+        risk = predictive.get("risk_level") or agents_output.get("synthesis", {}).get("risk", "low")
+        self.risk_by_hour.setdefault(hour, Counter())[risk] += 1
+        for old in [h for h in self.risk_by_hour if h <= hour - RETENTION_HOURS]:
+            del self.risk_by_hour[old]
+
+    # ---------------------------------------------------------
+    # MERGE / SERIALIZATION
+    # ---------------------------------------------------------
+    def merge(self, other: "AnalyticsShard"):
+        self.analyses += other.analyses
+        self.users.merge(other.users)
+        self.sentiment.merge(other.sentiment)
+        self.emotions.update(other.emotions)
+        self.semantic_groups.update(other.semantic_groups)
+
+        for hour, counts in other.risk_by_hour.items():
+            self.risk_by_hour.setdefault(hour, Counter()).update(counts)
+
+        # Top-k lists are not mergeable on their own: merge the sketches,
+        # then re-rank the union of both candidate sets
+        self.keywords.sketch.merge(other.keywords.sketch)
+        candidates = {word for word, _ in self.keywords.top()} | {word for word, _ in other.keywords.top()}
+        merged = HeavyHitters(k=TOP_KEYWORDS)
+        merged.sketch = self.keywords.sketch
+        for word in candidates:
+            merged._offer(word, merged.sketch.estimate(word))
+        self.keywords = merged
+
+    def to_dict(self) -> Dict:
+        return {
+            "analyses": self.analyses,
+            "users": self.users.to_dict(),
+            "sentiment": self.sentiment.to_dict(),
+            "keyword_sketch": self.keywords.sketch.to_dict(),
+            "keyword_candidates": [word for word, _ in self.keywords.top()],
+            "emotions": dict(self.emotions),
+            "risk_by_hour": {str(h): dict(c) for h, c in self.risk_by_hour.items()},
+            "semantic_groups": dict(self.semantic_groups),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "AnalyticsShard":
+        shard = cls()
+        shard.analyses = data["analyses"]
+        shard.users = HyperLogLog.from_dict(data["users"])
+        shard.sentiment = TDigest.from_dict(data["sentiment"])
+        shard.keywords.sketch = CountMinSketch.from_dict(data["keyword_sketch"])
+        for word in data["keyword_candidates"]:
+            shard.keywords._offer(word, shard.keywords.sketch.estimate(word))
+        shard.emotions = Counter(data["emotions"])
+        shard.risk_by_hour = {int(h): Counter(c) for h, c in data["risk_by_hour"].items()}
+        shard.semantic_groups = Counter(data["semantic_groups"])
+        return shard
+
+    # ---------------------------------------------------------
+    # QUERIES
+    # ---------------------------------------------------------
+    def summary(self) -> Dict:
+        hours = sorted(self.risk_by_hour)
+        return {
+            "analyses": self.analyses,
+            "distinct_users": self.users.count(),
+            "sentiment_quantiles": {
+                f"p{int(q * 100)}": self.sentiment.quantile(q) for q in (0.1, 0.25, 0.5, 0.75, 0.9)
+            },
+            "dominant_emotion": dict(self.emotions.most_common()),
+            "risk_level_by_hour": [
+                {"hour_start": h * 3600, **self.risk_by_hour[h]} for h in hours
+            ],
+            "semantic_groups": dict(self.semantic_groups.most_common()),
+            "top_keywords": [{"keyword": w, "estimate": c} for w, c in self.keywords.top()],
+        }
+
+
+class Analytics:
+    """
+    The per-process shard plus optional on-disk sharing between workers.
+    """
+
+    def __init__(
+        self,
+        directory: Optional[str] = None,
+        flush_interval: float = 5.0,
+        cache_ttl: float = 5.0,
+        shard_ttl: float = RETENTION_HOURS * 3600.0
+    ):
+        self.directory = directory if directory is not None else os.environ.get("MIRROR_ANALYTICS_DIR")
+        self.flush_interval = flush_interval
+        self.cache_ttl = cache_ttl
+        self.shard_ttl = shard_ttl
+
+        self._shard = AnalyticsShard()
+        self._lock = threading.Lock()
+        self._last_flush = time.monotonic()
+        self._token = ""
+        self._token_pid = 0
+        self._cached: Optional[Dict] = None
+        self._cached_at = 0.0
+
+    def record(self, agents_output: Dict, user_id: Optional[str] = None):
+        with self._lock:
+            self._shard.record(agents_output, user_id)
+            if self.directory and time.monotonic() - self._last_flush >= self.flush_interval:
+                self._flush()
+
+    def read(self) -> Dict:
+        now = time.monotonic()
+        if self._cached is not None and now - self._cached_at < self.cache_ttl:
+            return self._cached
+
+        with self._lock:
+            merged = AnalyticsShard.from_dict(self._shard.to_dict())
+            if self.directory:
+                self._flush()
+
+        for shard in self._other_shards():
+            merged.merge(shard)
+
+        self._cached, self._cached_at = merged.summary(), now
+        return self._cached
+
+    # ---------------------------------------------------------
+    # SHARD FILES
+    # ---------------------------------------------------------
+    def _shard_path(self) -> str:
+        # A forked child inherits this object: give it a token of its own
+        pid = os.getpid()
+        if self._token_pid != pid:
+            self._token, self._token_pid = uuid.uuid4().hex[:12], pid
+        return os.path.join(self.directory, f"shard-{pid}-{self._token}.json")
+
+    def _flush(self):
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._shard_path()
+        tmp = f"{path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self._shard.to_dict(), f)
+        os.replace(tmp, path)  # readers never see a half-written shard
+        self._last_flush = time.monotonic()
+
+    def _other_shards(self) -> List[AnalyticsShard]:
+        if not self.directory or not os.path.isdir(self.directory):
+            return []
+
+        own = os.path.basename(self._shard_path())
+        expired = time.time() - self.shard_ttl
+        shards = []
+        for name in os.listdir(self.directory):
+            if not name.startswith("shard-") or name == own:
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                # Left behind by a worker that is gone (or a crashed flush)
+                if os.path.getmtime(path) < expired:
+                    os.remove(path)
+                    continue
+                if name.endswith(".json"):
+                    with open(path, encoding="utf-8") as f:
+                        shards.append(AnalyticsShard.from_dict(json.load(f)))
+            except (OSError, ValueError):
+                continue  # worker mid-restart; its shard is picked up next time
+        return shards
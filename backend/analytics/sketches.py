@@ -0,0 +1,160 @@
+"""
+Mirror of Tomorrow - Mergeable Sketches
+---------------------------------------
+Fixed-size summaries for population-level analytics. Every sketch can
+be updated in O(1)-ish time, merged with another sketch of the same
+kind, and serialized to a plain dict, so per-worker shards can be
+combined on read.
+
+  - HyperLogLog   distinct counts (e.g. users)
+  - TDigest       quantiles of a numeric stream (e.g. sentiment_score)
+
+Keyword counting reuses agents.heavy_hitters.CountMinSketch.
+"""
+
+import base64
+import hashlib
+import math
+from bisect import bisect_left
+from typing import Dict, List
+
+
+# ---------------------------------------------------------
+# HYPERLOGLOG
+# ---------------------------------------------------------
+class HyperLogLog:
+
+    def __init__(self, precision: int = 12):
+        self.precision = precision
+        self.m = 1 << precision
+        self.registers = bytearray(self.m)
+
+    def add(self, item: str):
+        x = int.from_bytes(hashlib.blake2b(item.encode("utf-8"), digest_size=8).digest(), "big")
+        index = x >> (64 - self.precision)
+        remainder = x & ((1 << (64 - self.precision)) - 1)
+        rank = (64 - self.precision) - remainder.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def count(self) -> int:
+        m = self.m
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / sum(2.0 ** -r for r in self.registers)
+
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * m and zeros:
+            # Small-range correction: linear counting
+            estimate = m * math.log(m / zeros)
+
+        return int(round(estimate))
+
+    def merge(self, other: "HyperLogLog"):
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge HyperLogLogs of different precision")
+        self.registers = bytearray(map(max, self.registers, other.registers))
+
+    def to_dict(self) -> Dict:
+        return {
+            "precision": self.precision,
+            "registers": base64.b64encode(bytes(self.registers)).decode("ascii"),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "HyperLogLog":
+        sketch = cls(data["precision"])
+        sketch.registers = bytearray(base64.b64decode(data["registers"]))
+        return sketch
+
+
+# ---------------------------------------------------------
+# T-DIGEST
+# ---------------------------------------------------------
+class TDigest:
+    """
+    Merging t-digest: incoming values are buffered and periodically
+    folded into at most ~`compression` centroids, kept small near the
+    tails so extreme quantiles stay accurate.
+    """
+
+    def __init__(self, compression: int = 100):
+        self.compression = compression
+        self.means: List[float] = []
+        self.weights: List[float] = []
+        self.total = 0.0
+        self._buffer: List[float] = []
+
+    def add(self, value: float):
+        self._buffer.append(float(value))
+        if len(self._buffer) >= 5 * self.compression:
+            self._compress()
+
+    def merge(self, other: "TDigest"):
+        other._compress()
+        self._compress()
+        self._fold(
+            list(zip(self.means, self.weights)) + list(zip(other.means, other.weights))
+        )
+
+    def quantile(self, q: float) -> float:
+        self._compress()
+        if not self.means:
+            return 0.0
+        if len(self.means) == 1:
+            return self.means[0]
+
+        # Interpolate between centroid midpoints
+        target = q * self.total
+        cumulative, midpoints = 0.0, []
+        for weight in self.weights:
+            midpoints.append(cumulative + weight / 2)
+            cumulative += weight
+
+        index = bisect_left(midpoints, target)
+        if index == 0:
+            return self.means[0]
+        if index >= len(midpoints):
+            return self.means[-1]
+
+        left, right = midpoints[index - 1], midpoints[index]
+        fraction = (target - left) / (right - left)
+        return self.means[index - 1] + fraction * (self.means[index] - self.means[index - 1])
+
+    def to_dict(self) -> Dict:
+        self._compress()
+        return {"compression": self.compression, "means": self.means, "weights": self.weights}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "TDigest":
+        digest = cls(data["compression"])
+        digest._fold(list(zip(data["means"], data["weights"])))
+        return digest
+
+    # ---------------------------------------------------------
+    # COMPRESSION
+    # ---------------------------------------------------------
+    def _compress(self):
+        if self._buffer:
+            points = list(zip(self.means, self.weights)) + [(v, 1.0) for v in self._buffer]
+            self._buffer = []
+            self._fold(points)
+
+    def _fold(self, points):
+        points.sort()
+        total = sum(w for _, w in points)
+
+        means, weights = [], []
+        before = 0.0  # weight of every centroid before the last one
+        for mean, weight in points:
+            if means:
+                merged = weights[-1] + weight
+                q = (before + merged / 2) / total
+                if merged <= max(1.0, 4 * total * q * (1 - q) / self.compression):
+                    means[-1] += (mean - means[-1]) * weight / merged
+                    weights[-1] = merged
+                    continue
+                before += weights[-1]
+            means.append(mean)
+            weights.append(weight)
+
+        self.means, self.weights, self.total = means, weights, total
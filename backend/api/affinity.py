@@ -0,0 +1,335 @@
+"""
+Mirror of Tomorrow - User-Affinity Dispatcher
+---------------------------------------------
+Runs the agents pipeline in a fixed set of worker processes and sends
+every user's requests to the same worker, so that user's history
+(PatternModule's KeywordHistory today, per-user memory later) stays
+resident in one place instead of being rebuilt, or split, across all
+of them.
+
+Users are placed with a consistent hash ring (see hash_ring.py) over
+the worker names. Anonymous requests have no state and go to the
+least busy worker.
+
+Resizing migrates shards instead of dropping them:
+
+    1. new requests wait at the dispatcher; requests already running
+       finish
+    2. each existing worker hands over the histories of users it no
+       longer owns under the new ring
+    3. the new owners install them, the ring is swapped, and waiting
+       requests are released to their (possibly new) owners
+
+Only the users whose owner changes (~1/N per added or removed worker)
+are moved, and the pause lasts as long as the handoff itself.
+
+A worker that dies is restarted under the same name, so the ring does
+not change. The histories it held died with it: its users start fresh,
+as they would after an API restart. Requests that were running on it
+fail with WorkerExited; the next request for one of its users starts
+the replacement.
+
+Workers are started with the "spawn" start method by default: the API
+process is multi-threaded and forking it is unsafe.
+
+Environment:
+  MIRROR_AFFINITY_WORKERS   worker processes (unset or 0 = run the
+                            pipeline in the API process as before)
+"""
+
+import itertools
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Future
+from typing import Any, Dict, List, Optional
+
+from backend.api.hash_ring import HashRing
+
+
+class WorkerExited(RuntimeError):
+    pass
+
+
+# ---------------------------------------------------------
+# WORKER PROCESS
+# ---------------------------------------------------------
+def _worker_main(name: str, conn, vnodes: int):
+    from backend.agents.pipeline import AgentsPipeline
+
+    pipeline = AgentsPipeline()
+    history = pipeline.pattern.history
+
+    while True:
+        message = conn.recv()
+        op, call_id = message[0], message[1]
+        if op == "stop":
+            conn.send(("ok", call_id, None))
+            return
+        try:
+            if op == "run":
+                _, _, text, user_id, projection_paths = message
+                result = pipeline.run(text, user_id, projection_paths)
+            elif op == "handoff":
+                # Histories of the users this worker no longer owns
+                ring = HashRing(message[2], vnodes)
+                result = history.take(
+                    user_id for user_id in history.user_ids() if ring.owner(user_id) != name
+                )
+            elif op == "install":
+                history.restore(message[2])
+                result = len(message[2])
+            elif op == "users":
+                result = history.user_ids()
+            else:
+                raise ValueError(f"Unknown operation {op!r}")
+            conn.send(("ok", call_id, result))
+        except Exception as exc:
+            conn.send(("error", call_id, exc))
+
+
+class _Worker:
+
+    def __init__(self, name: str, ctx, vnodes: int):
+        self.name = name
+        self.conn, child = ctx.Pipe()
+        self.process = ctx.Process(target=_worker_main, args=(name, child, vnodes), daemon=True)
+        self.process.start()
+        child.close()
+
+        self.inflight = 0
+        self.completed = 0
+        self.exited = False
+        self._pending: Dict[int, Future] = {}
+        self._ids = itertools.count()
+        self._send_lock = threading.Lock()
+        self._reader = threading.Thread(target=self._read, name=f"affinity-{name}", daemon=True)
+        self._reader.start()
+
+    def call(self, op: str, *args) -> Future:
+        future: Future = Future()
+        with self._send_lock:
+            if self.exited:
+                raise WorkerExited(f"Worker {self.name} exited")
+            call_id = next(self._ids)
+            self._pending[call_id] = future
+            try:
+                self.conn.send((op, call_id, *args))
+            except OSError as exc:
+                self._pending.pop(call_id, None)
+                raise WorkerExited(f"Worker {self.name} exited") from exc
+        return future
+
+    @property
+    def alive(self) -> bool:
+        return not self.exited and self.process.is_alive()
+
+    def _read(self):
+        while True:
+            try:
+                status, call_id, value = self.conn.recv()
+            except (EOFError, OSError):
+                break
+            future = self._pending.pop(call_id)
+            if status == "ok":
+                future.set_result(value)
+            else:
+                future.set_exception(value)
+
+        # The process is gone: fail whatever was still waiting on it
+        with self._send_lock:
+            self.exited = True
+            pending = list(self._pending.values())
+            self._pending.clear()
+        for future in pending:
+            future.set_exception(WorkerExited(f"Worker {self.name} exited"))
+
+    def stop(self):
+        if self.alive:
+            try:
+                self.call("stop").result()
+            except WorkerExited:
+                pass
+        self.process.join()
+        self.conn.close()
+
+
+# ---------------------------------------------------------
+# DISPATCHER
+# ---------------------------------------------------------
+class AffinityDispatcher:
+
+    def __init__(self, workers: int = 4, vnodes: int = 128, start_method: str = "spawn"):
+        self.vnodes = vnodes
+        self._ctx = multiprocessing.get_context(start_method)
+        self._workers: Dict[str, _Worker] = {}
+        self._ring = HashRing(vnodes=vnodes)
+        self._names = itertools.count()
+
+        self._cond = threading.Condition()
+        self._resize_lock = threading.Lock()
+        self._migrating = False
+        self._inflight = 0
+
+        self.migrations = 0
+        self.users_moved = 0
+        self.restarts = 0
+
+        for _ in range(workers):
+            self._start_worker()
+
+    @classmethod
+    def from_env(cls) -> Optional["AffinityDispatcher"]:
+        workers = int(os.environ.get("MIRROR_AFFINITY_WORKERS", "0") or 0)
+        return cls(workers) if workers > 0 else None
+
+    # ---------------------------------------------------------
+    # PUBLIC ENTRY POINT
+    # ---------------------------------------------------------
+    def run(self, text: str, user_id: Optional[str] = None, projection_paths: Optional[int] = None) -> Dict:
+        """
+        AgentsPipeline.run on the worker that owns `user_id`. Blocks
+        the calling thread; call it from a worker thread.
+        """
+        with self._cond:
+            while self._migrating:
+                self._cond.wait()
+            worker = self._route(user_id)
+            worker.inflight += 1
+            self._inflight += 1
+
+        try:
+            return worker.call("run", text, user_id, projection_paths).result()
+        except WorkerExited:
+            with self._cond:
+                self._restart(worker)
+            raise
+        finally:
+            with self._cond:
+                worker.inflight -= 1
+                worker.completed += 1
+                self._inflight -= 1
+                self._cond.notify_all()
+
+    def owner(self, user_id: str) -> Optional[str]:
+        return self._ring.owner(user_id)
+
+    def resident_users(self) -> Dict[str, List[str]]:
+        """
+        The users whose history each worker currently holds.
+        """
+        calls = {name: worker.call("users") for name, worker in self._workers.items()}
+        return {name: call.result() for name, call in calls.items()}
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "workers": {
+                name: {"inflight": w.inflight, "completed": w.completed, "alive": w.process.is_alive()}
+                for name, w in self._workers.items()
+            },
+            "migrations": self.migrations,
+            "users_moved": self.users_moved,
+            "restarts": self.restarts,
+        }
+
+    # ---------------------------------------------------------
+    # RESIZING
+    # ---------------------------------------------------------
+    def add_worker(self) -> str:
+        with self._resize_lock:
+            worker = _Worker(f"worker-{next(self._names)}", self._ctx, self.vnodes)
+            ring = self._ring.copy()
+            ring.add(worker.name)
+            self._migrate(ring, {**self._workers, worker.name: worker})
+            return worker.name
+
+    def remove_worker(self, name: Optional[str] = None) -> str:
+        """
+        Retires a worker (the newest by default) after handing its
+        users to their new owners.
+        """
+        with self._resize_lock:
+            if len(self._workers) <= 1:
+                raise ValueError("Cannot remove the last worker")
+            name = name or list(self._workers)[-1]
+            ring = self._ring.copy()
+            ring.remove(name)
+            previous = self._migrate(ring, {n: w for n, w in self._workers.items() if n != name})
+            previous[name].stop()
+            return name
+
+    def close(self):
+        for worker in self._workers.values():
+            worker.stop()
+        self._workers.clear()
+
+    # ---------------------------------------------------------
+    # INTERNALS
+    # ---------------------------------------------------------
+    def _start_worker(self):
+        worker = _Worker(f"worker-{next(self._names)}", self._ctx, self.vnodes)
+        self._workers[worker.name] = worker
+        self._ring.add(worker.name)
+
+    def _route(self, user_id: Optional[str]) -> _Worker:
+        if user_id is None:
+            worker = min(self._workers.values(), key=lambda w: w.inflight)
+        else:
+            worker = self._workers[self._ring.owner(user_id)]
+        return worker if worker.alive else self._restart(worker)
+
+    def _restart(self, worker: _Worker) -> _Worker:
+        """
+        Replaces a dead worker under the same name. Call with _cond held.
+        """
+        current = self._workers.get(worker.name)
+        if current is not worker:
+            return current  # already replaced (or retired)
+
+        replacement = _Worker(worker.name, self._ctx, self.vnodes)
+        self._workers[worker.name] = replacement
+        self.restarts += 1
+
+        worker.process.join(timeout=1.0)
+        worker.conn.close()
+        return replacement
+
+    def _migrate(self, ring: HashRing, workers: Dict[str, _Worker]) -> Dict[str, _Worker]:
+        """
+        Moves users to their owners under `ring` and swaps in `workers`.
+        Returns the workers that were replaced.
+        """
+        with self._cond:
+            self._migrating = True
+            while self._inflight:
+                self._cond.wait()
+
+            # Dead workers can neither hand over nor take users
+            for worker in list(self._workers.values()):
+                if not worker.alive:
+                    self._restart(worker)
+            workers = {name: self._workers.get(name, worker) for name, worker in workers.items()}
+
+        try:
+            nodes = list(ring.nodes)
+            donors = list(self._workers.values())
+            handoffs = [worker.call("handoff", nodes) for worker in donors]
+
+            moving: Dict[str, Dict[str, Dict]] = {}
+            for handoff in handoffs:
+                for user_id, state in handoff.result().items():
+                    moving.setdefault(ring.owner(user_id), {})[user_id] = state
+
+            installs = [workers[name].call("install", states) for name, states in moving.items()]
+            for install in installs:
+                self.users_moved += install.result()
+
+            previous = self._workers
+            self._ring = ring
+            self._workers = workers
+            self.migrations += 1
+            return previous
+        finally:
+            with self._cond:
+                self._migrating = False
+                self._cond.notify_all()
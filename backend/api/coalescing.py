@@ -0,0 +1,116 @@
+"""
+Mirror of Tomorrow - Request Coalescing
+---------------------------------------
+Single-flight execution for identical in-flight analyses.
+
+Concurrent callers with the same key attach to one running pipeline
+execution and all receive its result (or its exception). The shared
+execution is shielded from individual callers: if the first caller
+disconnects, the others keep waiting on the same run. Only when every
+caller has gone away is the execution cancelled and forgotten.
+
+Results are shared between callers and must be treated as read-only.
+"""
+
+import asyncio
+import hashlib
+import re
+from typing import Any, Callable, Dict, Optional
+
+
+def coalescing_key(text: str, user_id: Optional[str] = None) -> str:
+    """
+    Normalizes whitespace the same way LogicModule does so trivially
+    different submissions of the same text share one execution. Runs
+    for different users never coalesce, since each updates its user's
+    history.
+    """
+    normalized = re.sub(r"\s+", " ", text.strip())
+    scope = "" if user_id is None else user_id
+    return hashlib.sha256(f"{scope}\0{normalized}".encode("utf-8")).hexdigest()
+
+
+class _Call:
+
+    def __init__(self, task: asyncio.Future):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+
+    def __init__(self):
+        self._inflight: Dict[str, _Call] = {}
+
+        self.requests = 0
+        self.executions = 0
+        self.coalesced = 0
+        self.errors = 0
+        self.abandoned = 0
+
+    # ---------------------------------------------------------
+    # PUBLIC ENTRY POINT
+    # ---------------------------------------------------------
+    async def run(self, key: str, fn: Callable[..., Any], *args) -> Any:
+        """
+        Runs fn(*args) in a worker thread (or awaits it, if fn is a
+        coroutine function), or joins the execution already in flight
+        for `key`.
+        """
+        self.requests += 1
+
+        call = self._inflight.get(key)
+        if call is None:
+            call = self._start(key, fn, *args)
+        else:
+            self.coalesced += 1
+
+        call.waiters += 1
+        try:
+            return await asyncio.shield(call.task)
+        except asyncio.CancelledError:
+            # This caller went away; the shared run only stops when
+            # nobody is left waiting for it.
+            if call.waiters == 1 and not call.task.done():
+                call.task.cancel()
+                self._forget(key, call)
+                self.abandoned += 1
+            raise
+        finally:
+            call.waiters -= 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+            "coalescing_ratio": self.coalesced / self.requests if self.requests else 0.0,
+            "in_flight": len(self._inflight),
+            "errors": self.errors,
+            "abandoned": self.abandoned,
+        }
+
+    # ---------------------------------------------------------
+    # INTERNALS
+    # ---------------------------------------------------------
+    def _start(self, key: str, fn: Callable[..., Any], *args) -> _Call:
+        if asyncio.iscoroutinefunction(fn):
+            task = asyncio.ensure_future(fn(*args))
+        else:
+            task = asyncio.ensure_future(asyncio.to_thread(fn, *args))
+        call = _Call(task)
+        self._inflight[key] = call
+        self.executions += 1
+
+        def _done(t: asyncio.Future):
+            self._forget(key, call)
+            if not t.cancelled() and t.exception() is not None:
+                self.errors += 1
+
+        task.add_done_callback(_done)
+        return call
+
+    def _forget(self, key: str, call: _Call):
+        # A newer execution may already own the key
+        if self._inflight.get(key) is call:
+            del self._inflight[key]
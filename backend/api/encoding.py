@@ -0,0 +1,229 @@
+"""
+Mirror of Tomorrow - Response Encoding
+--------------------------------------
+Content negotiation for API responses.
+
+It:
+  - picks JSON, MessagePack or CBOR from the Accept header
+  - uses orjson for JSON when available (stdlib json otherwise)
+  - compresses large bodies with brotli or gzip from Accept-Encoding
+
+Binary codecs and brotli are optional; when a library is missing the
+format is simply not offered and negotiation falls back to JSON/gzip.
+
+Environment:
+  MIRROR_COMPRESSION_THRESHOLD   bytes before compression kicks in (default 1024)
+  MIRROR_GZIP_LEVEL              gzip level (default 6)
+  MIRROR_BROTLI_QUALITY          brotli quality (default 4)
+"""
+
+import gzip
+import json
+import os
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from fastapi import Request, Response
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - optional dependency
+    msgpack = None
+
+try:
+    import cbor2
+except ImportError:  # pragma: no cover - optional dependency
+    cbor2 = None
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+
+JSON = "application/json"
+MSGPACK = "application/msgpack"
+CBOR = "application/cbor"
+
+COMPRESSION_THRESHOLD = int(os.environ.get("MIRROR_COMPRESSION_THRESHOLD", "1024"))
+GZIP_LEVEL = int(os.environ.get("MIRROR_GZIP_LEVEL", "6"))
+BROTLI_QUALITY = int(os.environ.get("MIRROR_BROTLI_QUALITY", "4"))
+
+
+# ---------------------------------------------------------
+# ENCODERS
+# ---------------------------------------------------------
+def encode_json_stdlib(payload: Any) -> bytes:
+    return json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def encode_json(payload: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return encode_json_stdlib(payload)
+
+
+def _encode_msgpack(payload: Any) -> bytes:
+    return msgpack.packb(payload, use_bin_type=True)
+
+
+def _encode_cbor(payload: Any) -> bytes:
+    return cbor2.dumps(payload)
+
+
+def available_encoders() -> Dict[str, Callable[[Any], bytes]]:
+    """
+    Media type -> encoder, in server preference order.
+    """
+    encoders = {JSON: encode_json}
+    if msgpack is not None:
+        encoders[MSGPACK] = _encode_msgpack
+    if cbor2 is not None:
+        encoders[CBOR] = _encode_cbor
+    return encoders
+
+
+# Accepted aliases seen in the wild
+_MEDIA_ALIASES = {
+    "application/x-msgpack": MSGPACK,
+    "application/vnd.msgpack": MSGPACK,
+    "application/x-cbor": CBOR,
+}
+
+
+# ---------------------------------------------------------
+# COMPRESSORS
+# ---------------------------------------------------------
+def _gzip(body: bytes) -> bytes:
+    return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+def _brotli(body: bytes) -> bytes:
+    return brotli.compress(body, quality=BROTLI_QUALITY)
+
+
+def available_compressors() -> Dict[str, Callable[[bytes], bytes]]:
+    """
+    Content-Encoding -> compressor, in server preference order.
+    """
+    compressors = {}
+    if brotli is not None:
+        compressors["br"] = _brotli
+    compressors["gzip"] = _gzip
+    return compressors
+
+
+# ---------------------------------------------------------
+# HEADER PARSING
+# ---------------------------------------------------------
+def _parse_quality_list(header: Optional[str]) -> List[Tuple[str, float]]:
+    """
+    Parses "a/b;q=0.5, c/d" into [("a/b", 0.5), ("c/d", 1.0)].
+    """
+    items = []
+    if not header:
+        return items
+
+    for part in header.split(","):
+        fields = part.strip().split(";")
+        value = fields[0].strip().lower()
+        if not value:
+            continue
+
+        q = 1.0
+        for param in fields[1:]:
+            key, _, raw = param.strip().partition("=")
+            if key.strip() == "q":
+                try:
+                    q = float(raw)
+                except ValueError:
+                    q = 0.0
+
+        items.append((value, q))
+
+    return items
+
+
+def negotiate_media_type(accept: Optional[str]) -> str:
+    """
+    Returns the best supported media type for an Accept header.
+    Anything we cannot satisfy falls back to JSON.
+    """
+    encoders = available_encoders()
+    best, best_q = JSON, 0.0
+
+    for value, q in _parse_quality_list(accept):
+        value = _MEDIA_ALIASES.get(value, value)
+        if q <= 0:
+            continue
+
+        if value in ("*/*", "application/*"):
+            value = JSON
+        elif value not in encoders:
+            continue
+
+        # Strictly greater keeps the client's order on ties
+        if q > best_q:
+            best, best_q = value, q
+
+    return best
+
+
+def negotiate_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """
+    Returns the preferred Content-Encoding, or None for identity.
+    """
+    compressors = available_compressors()
+    offered = dict(_parse_quality_list(accept_encoding))
+    wildcard = offered.get("*", 0.0)
+
+    best, best_q = None, 0.0
+    for name in compressors:
+        q = offered.get(name, wildcard)
+        if q > best_q:
+            best, best_q = name, q
+
+    return best
+
+
+# ---------------------------------------------------------
+# PUBLIC ENTRY POINT
+# ---------------------------------------------------------
+def encode_payload(
+    payload: Any,
+    accept: Optional[str] = None,
+    accept_encoding: Optional[str] = None,
+    threshold: Optional[int] = None
+) -> Tuple[bytes, str, Dict[str, str]]:
+    """
+    Returns (body, media_type, headers) for the given request headers.
+    """
+    media_type = negotiate_media_type(accept)
+    body = available_encoders()[media_type](payload)
+    headers = {"Vary": "Accept, Accept-Encoding"}
+
+    limit = COMPRESSION_THRESHOLD if threshold is None else threshold
+    if len(body) >= limit:
+        encoding = negotiate_encoding(accept_encoding)
+        if encoding is not None:
+            body = available_compressors()[encoding](body)
+            headers["Content-Encoding"] = encoding
+
+    return body, media_type, headers
+
+
+def negotiated_response(payload: Any, request: Request) -> Response:
+    """
+    Builds a FastAPI Response for `payload` honouring the request's
+    Accept and Accept-Encoding headers.
+    """
+    body, media_type, headers = encode_payload(
+        payload,
+        request.headers.get("accept"),
+        request.headers.get("accept-encoding"),
+    )
+    return Response(content=body, media_type=media_type, headers=headers)
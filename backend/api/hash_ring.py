@@ -0,0 +1,98 @@
+"""
+Mirror of Tomorrow - Consistent Hash Ring
+-----------------------------------------
+Maps keys (user IDs) onto a set of named nodes so that adding or
+removing a node only moves the keys that node gains or loses: about
+1/N of them, instead of nearly all, as `hash % N` would.
+
+Each node is placed on the ring at `vnodes` points (virtual nodes),
+which evens out the share of keys each node gets. A key belongs to the
+first point at or after its own hash, wrapping around.
+
+Positions come from 64-bit BLAKE2b digests, so every process and every
+host computes the same ring from the same node names. Node names are
+opaque: "worker-3" for local processes, "10.0.0.7:8000" across hosts.
+"""
+
+import bisect
+import hashlib
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+def ring_hash(value: str) -> int:
+    return int.from_bytes(hashlib.blake2b(value.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+class HashRing:
+
+    def __init__(self, nodes: Iterable[str] = (), vnodes: int = 128):
+        self.vnodes = vnodes
+        self._points: List[int] = []
+        self._owners: List[str] = []
+        self._nodes: Dict[str, None] = {}
+        for node in nodes:
+            self.add(node)
+
+    @property
+    def nodes(self) -> Tuple[str, ...]:
+        return tuple(self._nodes)
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    def __contains__(self, node: str) -> bool:
+        return node in self._nodes
+
+    def copy(self) -> "HashRing":
+        ring = HashRing(vnodes=self.vnodes)
+        ring._points = list(self._points)
+        ring._owners = list(self._owners)
+        ring._nodes = dict(self._nodes)
+        return ring
+
+    # ---------------------------------------------------------
+    # MEMBERSHIP
+    # ---------------------------------------------------------
+    def add(self, node: str):
+        if node in self._nodes:
+            return
+        self._nodes[node] = None
+        for i in range(self.vnodes):
+            point = ring_hash(f"{node}#{i}")
+            at = bisect.bisect_left(self._points, point)
+            self._points.insert(at, point)
+            self._owners.insert(at, node)
+
+    def remove(self, node: str):
+        if node not in self._nodes:
+            return
+        del self._nodes[node]
+        kept = [(p, o) for p, o in zip(self._points, self._owners) if o != node]
+        self._points = [p for p, _ in kept]
+        self._owners = [o for _, o in kept]
+
+    # ---------------------------------------------------------
+    # LOOKUPS
+    # ---------------------------------------------------------
+    def owner(self, key: str) -> Optional[str]:
+        if not self._points:
+            return None
+        at = bisect.bisect_left(self._points, ring_hash(key))
+        return self._owners[at % len(self._owners)]
+
+    def owners(self, key: str, n: int) -> List[str]:
+        """
+        The first `n` distinct nodes clockwise from `key`: its owner,
+        then its replicas or fallbacks.
+        """
+        found: List[str] = []
+        if not self._points:
+            return found
+        at = bisect.bisect_left(self._points, ring_hash(key))
+        for step in range(len(self._points)):
+            node = self._owners[(at + step) % len(self._owners)]
+            if node not in found:
+                found.append(node)
+                if len(found) == min(n, len(self._nodes)):
+                    break
+        return found
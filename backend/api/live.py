@@ -0,0 +1,289 @@
+"""
+Mirror of Tomorrow - Live Typing Sessions
+-----------------------------------------
+WebSocket analysis while the user types (mounted at /live).
+
+Client -> server, one JSON message per edit:
+    { "text": "..." }                                  replace the whole text
+    { "edit": { "start": 0, "end": 0, "text": "..." } }  splice text[start:end]
+
+Server -> client:
+    { "type": "update", "version": n, "patch": {...} }
+    { "type": "error", "error": "..." }
+    { "type": "error", "error": "...", "retry_after": seconds }
+
+An analysis that cannot run (the scheduler's queue is full) or fails is
+reported as an error and the session stays open; the next edit, or the
+retry hint, triggers another attempt.
+
+"patch" is a JSON Merge Patch (RFC 7396) against the previous Renderer
+output: only fields that changed, nested into "raw", with null for
+removed keys. The first update carries the full output.
+
+Edits are debounced: analysis runs once the text has been quiet for
+`debounce` seconds, or `max_delay` after the first unanalyzed edit
+while typing continues. Edits that arrive while an analysis runs are
+coalesced into the next one.
+
+Analysis is incremental. The text is split into sentences and each
+sentence's agent partials (see backend/agents/mapreduce.py) are cached
+per session, so a keystroke only re-maps the sentence it touched;
+merging and finalizing still see the whole text, so results equal a
+full AgentsPipeline.run(). The one difference is the predictive Monte
+Carlo projection, which runs with MIRROR_LIVE_PROJECTION_PATHS paths
+(default 1000, 0 = off) instead of the full count, since it reruns on
+every burst.
+
+Only the agents are incremental. The Orchestrator and Renderer stages
+(backend/iai) still run once per analysis on the whole text: their
+engines have no per-sentence partials to cache yet.
+"""
+
+import asyncio
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from fastapi import WebSocket, WebSocketDisconnect
+
+from backend.agents.mapreduce import ChunkedPipeline, map_chunk, merge_all, split_at_sentences
+from backend.agents.pipeline import AgentsPipeline
+from backend.api.encoding import encode_json
+from backend.api.scheduler import SchedulerFull
+
+
+DEBOUNCE = float(os.environ.get("MIRROR_LIVE_DEBOUNCE", "0.15"))
+MAX_DELAY = float(os.environ.get("MIRROR_LIVE_MAX_DELAY", "1.0"))
+SENTENCE_CACHE_SIZE = 2048
+LIVE_PROJECTION_PATHS = int(os.environ.get("MIRROR_LIVE_PROJECTION_PATHS", "1000"))
+
+# Seconds a client should wait after SchedulerFull before editing again
+RETRY_AFTER = 1.0
+
+
+# ---------------------------------------------------------
+# METRICS
+# ---------------------------------------------------------
+class LiveMetrics:
+
+    def __init__(self):
+        self.sessions = 0
+        self.open_sessions = 0
+        self.edits = 0
+        self.analyses = 0
+        self.failed_analyses = 0
+        self.sentence_hits = 0
+        self.sentence_misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        looked_up = self.sentence_hits + self.sentence_misses
+        return {
+            "sessions": self.sessions,
+            "open_sessions": self.open_sessions,
+            "edits": self.edits,
+            "analyses": self.analyses,
+            "failed_analyses": self.failed_analyses,
+            "edits_per_analysis": self.edits / self.analyses if self.analyses else 0.0,
+            "sentence_cache_hit_ratio": self.sentence_hits / looked_up if looked_up else 0.0,
+        }
+
+
+# ---------------------------------------------------------
+# INCREMENTAL ANALYSIS
+# ---------------------------------------------------------
+class IncrementalAnalyzer:
+    """
+    AgentsPipeline.run() with per-sentence partials cached across calls.
+    Analyses run without a user_id, so typing does not feed the user's
+    keyword history.
+    """
+
+    def __init__(
+        self,
+        pipeline: AgentsPipeline,
+        metrics: Optional[LiveMetrics] = None,
+        cache_size: int = SENTENCE_CACHE_SIZE,
+        projection_paths: int = LIVE_PROJECTION_PATHS
+    ):
+        self.chunked = ChunkedPipeline(pipeline, workers=1)
+        self.metrics = metrics or LiveMetrics()
+        self.cache_size = cache_size
+        self.projection_paths = projection_paths
+        self._partials: "OrderedDict[str, Dict]" = OrderedDict()
+
+    def run(self, text: str) -> Dict:
+        cleaned = self.chunked.pipeline.logic._normalize(text)
+        sentences = split_at_sentences(cleaned, 1)
+        partials = [self._partial(sentence) for sentence in sentences]
+        return self.chunked.finalize(cleaned, merge_all(partials), projection_paths=self.projection_paths)
+
+    def _partial(self, sentence: str) -> Dict:
+        partial = self._partials.get(sentence)
+        if partial is not None:
+            self._partials.move_to_end(sentence)
+            self.metrics.sentence_hits += 1
+            return partial
+
+        self.metrics.sentence_misses += 1
+        partial = map_chunk(sentence, self.chunked.pipeline)
+        self._partials[sentence] = partial
+        if len(self._partials) > self.cache_size:
+            self._partials.popitem(last=False)
+        return partial
+
+
+def merge_patch(old: Dict, new: Dict) -> Dict:
+    """
+    RFC 7396 patch turning `old` into `new`.
+    """
+    patch = {}
+    for key, value in new.items():
+        if key not in old:
+            patch[key] = value
+        elif isinstance(value, dict) and isinstance(old[key], dict):
+            nested = merge_patch(old[key], value)
+            if nested:
+                patch[key] = nested
+        elif old[key] != value:
+            patch[key] = value
+    for key in old:
+        if key not in new:
+            patch[key] = None
+    return patch
+
+
+# ---------------------------------------------------------
+# SESSION
+# ---------------------------------------------------------
+class LiveSession:
+
+    def __init__(
+        self,
+        analyze: Callable[[str], Dict],
+        metrics: Optional[LiveMetrics] = None,
+        debounce: float = DEBOUNCE,
+        max_delay: float = MAX_DELAY,
+        run: Optional[Callable[..., Awaitable]] = None
+    ):
+        """
+        `run(fn, *args)` executes an analysis off the event loop;
+        asyncio.to_thread unless the caller schedules it some other way.
+        """
+        self.analyze = analyze
+        self.run = run or asyncio.to_thread
+        self.metrics = metrics or LiveMetrics()
+        self.debounce = debounce
+        self.max_delay = max_delay
+
+        self.text = ""
+        self.version = 0
+        self._rendered: Dict = {}
+
+    # ---------------------------------------------------------
+    # PUBLIC ENTRY POINT
+    # ---------------------------------------------------------
+    async def serve(self, websocket: WebSocket):
+        await websocket.accept()
+        self.metrics.sessions += 1
+        self.metrics.open_sessions += 1
+
+        edits: asyncio.Queue = asyncio.Queue()
+        reader = asyncio.ensure_future(self._read(websocket, edits))
+        try:
+            await self._analyze_loop(websocket, edits)
+        except WebSocketDisconnect:
+            pass
+        finally:
+            reader.cancel()
+            self.metrics.open_sessions -= 1
+
+    # ---------------------------------------------------------
+    # INTERNALS
+    # ---------------------------------------------------------
+    async def _read(self, websocket: WebSocket, edits: asyncio.Queue):
+        try:
+            while True:
+                edits.put_nowait(await websocket.receive_json())
+        except (WebSocketDisconnect, ValueError, KeyError) as exc:
+            # KeyError: a binary frame, which receive_json() cannot read
+            edits.put_nowait(exc)
+
+    async def _analyze_loop(self, websocket: WebSocket, edits: asyncio.Queue):
+        first_edit: Optional[float] = None
+        last_edit = 0.0
+
+        while True:
+            timeout = None
+            if first_edit is not None:
+                deadline = min(last_edit + self.debounce, first_edit + self.max_delay)
+                timeout = max(0.0, deadline - time.monotonic())
+
+            try:
+                message = await asyncio.wait_for(edits.get(), timeout)
+            except asyncio.TimeoutError:
+                await self._push(websocket)
+                first_edit = None
+                continue
+
+            if isinstance(message, WebSocketDisconnect):
+                raise message
+            if isinstance(message, (ValueError, KeyError)):
+                # Not a JSON text frame: the connection is no longer usable
+                await websocket.close(code=1003)
+                return
+
+            error = self._apply(message)
+            if error is not None:
+                await self._send(websocket, {"type": "error", "error": error})
+                continue
+
+            self.metrics.edits += 1
+            last_edit = time.monotonic()
+            if first_edit is None:
+                first_edit = last_edit
+
+    def _apply(self, message: Any) -> Optional[str]:
+        if not isinstance(message, dict):
+            return "Expected a JSON object."
+
+        if isinstance(message.get("text"), str):
+            self.text = message["text"]
+            return None
+
+        edit = message.get("edit")
+        if isinstance(edit, dict):
+            start, end, insert = edit.get("start"), edit.get("end"), edit.get("text", "")
+            if not (isinstance(start, int) and isinstance(end, int) and isinstance(insert, str)):
+                return "edit needs integer start/end and string text."
+            if not 0 <= start <= end <= len(self.text):
+                return f"edit range {start}:{end} is outside the text (length {len(self.text)})."
+            self.text = self.text[:start] + insert + self.text[end:]
+            return None
+
+        return "Expected {\"text\": ...} or {\"edit\": {...}}."
+
+    async def _push(self, websocket: WebSocket):
+        try:
+            rendered = await self.run(self.analyze, self.text)
+        except SchedulerFull as exc:
+            self.metrics.failed_analyses += 1
+            await self._send(websocket, {"type": "error", "error": str(exc), "retry_after": RETRY_AFTER})
+            return
+        except Exception as exc:
+            self.metrics.failed_analyses += 1
+            await self._send(websocket, {"type": "error", "error": f"Analysis failed: {type(exc).__name__}"})
+            return
+        self.metrics.analyses += 1
+
+        patch = merge_patch(self._rendered, rendered)
+        self._rendered = rendered
+        if not patch:
+            return
+
+        self.version += 1
+        await self._send(websocket, {"type": "update", "version": self.version, "patch": patch})
+
+    @staticmethod
+    async def _send(websocket: WebSocket, message: Dict):
+        await websocket.send_text(encode_json(message).decode("utf-8"))
@@ -0,0 +1,274 @@
+"""
+Mirror of Tomorrow - Shared Result Cache
+----------------------------------------
+A fixed-size result cache in one mmap'd file, shared by every worker
+process on the host without a cache server.
+
+Layout:
+
+    header     magic, set count, ways, slot size, stripe count
+    lock bytes one byte per stripe, only ever used as fcntl lock ranges
+    sets       [hand][slot][slot]...   `ways` slots per set
+
+Each key (a text hash) belongs to one set. A set holds `ways` fixed-size
+slots of
+
+    digest (16 bytes) | length | reference bit | valid | expires | payload
+
+and is evicted with CLOCK: the set's hand sweeps its slots, clearing
+reference bits, and replaces the first slot found unreferenced. Hits
+set the reference bit, so recently used results survive a sweep.
+
+Sets are grouped into lock stripes. A stripe is guarded by an fcntl
+byte-range lock on its lock byte (shared for lookups, exclusive for
+stores) across processes, plus a threading lock inside the process,
+since fcntl locks are held per process. Critical sections only copy
+one slot, so contention is brief.
+
+Values larger than a slot are not cached. Expired entries read as
+misses and are reused first.
+
+Keys are namespaced by a result version. cache_from_env() derives it
+from the code and data that shape a rendered result (backend/agents,
+backend/iai, backend/renderer, the API's render step) and from the
+settings and config files they read, so after a deploy or config change
+new processes stop seeing old results; those age out through CLOCK and
+the TTL while old processes drain.
+
+Environment (see cache_from_env):
+  MIRROR_RESULT_CACHE         cache file, e.g. /dev/shm/mirror-results.cache
+                              (unset = no shared cache)
+  MIRROR_RESULT_CACHE_MB      file size for a new cache (default 64)
+  MIRROR_RESULT_CACHE_TTL     entry lifetime in seconds (default 3600)
+  MIRROR_RESULT_VERSION       extra version tag, to invalidate by hand
+"""
+
+import fcntl
+import hashlib
+import json
+import mmap
+import os
+import struct
+import threading
+import time
+import zlib
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from backend.api.encoding import encode_json
+
+
+MAGIC = b"MRCACHE1"
+_HEADER = struct.Struct("<8sIIII")     # magic, sets, ways, slot size, stripes
+_HEADER_SIZE = 64
+_SET_HEADER = struct.Struct("<I4x")    # CLOCK hand
+_SLOT = struct.Struct("<16sIBB2xd")    # digest, length, referenced, valid, expires
+
+# What a rendered result depends on, for result_version(): sources under
+# backend/, config files named by environment variables, and settings
+_VERSION_SOURCES = ("agents", "iai", "renderer", "api/server.py")
+_VERSION_FILES = ("MIRROR_FUSION_WEIGHTS", "MIRROR_TAXONOMY_PATH")
+_VERSION_SETTINGS = ("MIRROR_PROJECTION_PATHS", "MIRROR_RESULT_VERSION")
+
+
+class SharedResultCache:
+
+    def __init__(
+        self,
+        path: str,
+        size_mb: int = 64,
+        slot_size: int = 8192,
+        ways: int = 8,
+        stripes: int = 64,
+        ttl: float = 3600.0,
+        version: str = ""
+    ):
+        self.path = path
+        self.ttl = ttl
+        self.version = version
+
+        n_sets = max(1, (size_mb << 20) // (ways * slot_size))
+        stripes = min(stripes, n_sets)
+
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        self._init_file(n_sets, ways, slot_size, stripes)
+
+        self._map = mmap.mmap(self._fd, 0)
+        _, self.n_sets, self.ways, self.slot_size, self.stripes = _HEADER.unpack_from(self._map, 0)
+        self._sets_start = _HEADER_SIZE + self.stripes
+        self._set_size = _SET_HEADER.size + self.ways * self.slot_size
+        self._thread_locks = [threading.Lock() for _ in range(self.stripes)]
+
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+        self.oversize = 0
+
+    def close(self):
+        self._map.close()
+        os.close(self._fd)
+
+    # ---------------------------------------------------------
+    # PUBLIC API
+    # ---------------------------------------------------------
+    def get(self, key: str) -> Optional[bytes]:
+        digest, set_index = self._locate(key)
+        base = self._set_offset(set_index)
+
+        with self._locked(set_index, fcntl.LOCK_SH):
+            now = time.time()
+            for way in range(self.ways):
+                slot = base + _SET_HEADER.size + way * self.slot_size
+                stored, length, _, valid, expires = _SLOT.unpack_from(self._map, slot)
+                if valid and stored == digest and expires > now:
+                    # A racing reader may set the same bit; both write 1
+                    self._map[slot + 20] = 1
+                    self.hits += 1
+                    start = slot + _SLOT.size
+                    return self._map[start:start + length]
+
+        self.misses += 1
+        return None
+
+    def put(self, key: str, value: bytes):
+        if len(value) > self.slot_size - _SLOT.size:
+            self.oversize += 1
+            return
+
+        digest, set_index = self._locate(key)
+        base = self._set_offset(set_index)
+
+        with self._locked(set_index, fcntl.LOCK_EX):
+            slot = self._choose_slot(base, digest)
+            _SLOT.pack_into(self._map, slot, digest, len(value), 1, 1, time.time() + self.ttl)
+            start = slot + _SLOT.size
+            self._map[start:start + len(value)] = value
+            self.stores += 1
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            "path": self.path,
+            "version": self.version,
+            "capacity": self.n_sets * self.ways,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "stores": self.stores,
+            "evictions": self.evictions,
+            "oversize": self.oversize,
+        }
+
+    # ---------------------------------------------------------
+    # INTERNALS
+    # ---------------------------------------------------------
+    def _init_file(self, n_sets: int, ways: int, slot_size: int, stripes: int):
+        """
+        The first process to open the file lays it out; later ones keep
+        the existing geometry (and contents).
+        """
+        fcntl.lockf(self._fd, fcntl.LOCK_EX, _HEADER_SIZE, 0)
+        try:
+            header = os.pread(self._fd, _HEADER.size, 0)
+            if len(header) == _HEADER.size and header[:8] == MAGIC:
+                return
+            size = _HEADER_SIZE + stripes + n_sets * (_SET_HEADER.size + ways * slot_size)
+            os.ftruncate(self._fd, 0)
+            os.ftruncate(self._fd, size)  # zero-filled: every slot invalid
+            os.pwrite(self._fd, _HEADER.pack(MAGIC, n_sets, ways, slot_size, stripes), 0)
+        finally:
+            fcntl.lockf(self._fd, fcntl.LOCK_UN, _HEADER_SIZE, 0)
+
+    def _locate(self, key: str):
+        digest = hashlib.blake2b(f"{self.version}\0{key}".encode("utf-8"), digest_size=16).digest()
+        return digest, int.from_bytes(digest[:8], "little") % self.n_sets
+
+    def _set_offset(self, set_index: int) -> int:
+        return self._sets_start + set_index * self._set_size
+
+    @contextmanager
+    def _locked(self, set_index: int, mode: int):
+        stripe = set_index % self.stripes
+        with self._thread_locks[stripe]:
+            fcntl.lockf(self._fd, mode, 1, _HEADER_SIZE + stripe)
+            try:
+                yield
+            finally:
+                fcntl.lockf(self._fd, fcntl.LOCK_UN, 1, _HEADER_SIZE + stripe)
+
+    def _choose_slot(self, base: int, digest: bytes) -> int:
+        """
+        The slot to write `digest` into: its current slot, else a free
+        or expired one, else the CLOCK victim. Caller holds the stripe
+        exclusively.
+        """
+        now = time.time()
+        first = base + _SET_HEADER.size
+        free = None
+
+        for way in range(self.ways):
+            slot = first + way * self.slot_size
+            stored, _, _, valid, expires = _SLOT.unpack_from(self._map, slot)
+            if valid and stored == digest:
+                return slot
+            if free is None and (not valid or expires <= now):
+                free = slot
+        if free is not None:
+            return free
+
+        (hand,) = _SET_HEADER.unpack_from(self._map, base)
+        while True:
+            slot = first + hand * self.slot_size
+            hand = (hand + 1) % self.ways
+            if self._map[slot + 20]:
+                self._map[slot + 20] = 0  # second chance
+                continue
+            _SET_HEADER.pack_into(self._map, base, hand)
+            self.evictions += 1
+            return slot
+
+
+def pack_result(result: Any) -> bytes:
+    return zlib.compress(encode_json(result), 1)
+
+
+def unpack_result(data: bytes) -> Any:
+    return json.loads(zlib.decompress(data))
+
+
+def result_version() -> str:
+    """
+    Fingerprint of everything that shapes a rendered result.
+    """
+    h = hashlib.blake2b(digest_size=8)
+    backend = Path(__file__).resolve().parent.parent
+
+    for source in _VERSION_SOURCES:
+        root = backend / source
+        files = [root] if root.is_file() else sorted(root.rglob("*"))
+        for path in files:
+            if path.suffix in (".py", ".json") and "__pycache__" not in path.parts:
+                h.update(str(path.relative_to(backend)).encode("utf-8"))
+                h.update(path.read_bytes())
+
+    for name in _VERSION_FILES:
+        value = os.environ.get(name)
+        if value and os.path.isfile(value):
+            h.update(Path(value).read_bytes())
+    for name in _VERSION_SETTINGS:
+        h.update(f"{name}={os.environ.get(name, '')}".encode("utf-8"))
+    return h.hexdigest()
+
+
+def cache_from_env() -> Optional[SharedResultCache]:
+    path = os.environ.get("MIRROR_RESULT_CACHE")
+    if not path:
+        return None
+    return SharedResultCache(
+        path,
+        size_mb=int(os.environ.get("MIRROR_RESULT_CACHE_MB", "64")),
+        ttl=float(os.environ.get("MIRROR_RESULT_CACHE_TTL", "3600")),
+        version=result_version(),
+    )
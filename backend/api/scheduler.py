@@ -0,0 +1,236 @@
+"""
+Mirror of Tomorrow - Admission Scheduler
+----------------------------------------
+Decides which analysis runs next, so a backfill cannot slow down
+interactive users.
+
+Every request belongs to a priority class and a tenant:
+
+    interactive   people waiting on a response (default)
+    background    server-side refreshes, previews
+    bulk          backfills and re-scoring through the API
+
+Admission rules:
+  - classes are served in strict priority order, but each class has its
+    own concurrency cap, so bulk can never occupy every slot and
+    interactive work is never queued behind it
+  - all classes share a total cap (the pipeline's worker threads)
+  - inside a class, tenants share slots by weighted fair queuing: each
+    request gets a virtual finish time of
+        max(class virtual time, tenant's last finish) + cost / weight
+    and the smallest finish time runs first, so one tenant's burst
+    cannot starve the others
+  - each class queue is bounded; past that, admission fails fast with
+    SchedulerFull (HTTP 503 at the API)
+
+Environment:
+  MIRROR_SCHED_TOTAL          total concurrent analyses (default 8)
+  MIRROR_SCHED_INTERACTIVE    interactive cap (default 8)
+  MIRROR_SCHED_BACKGROUND     background cap (default 4)
+  MIRROR_SCHED_BULK           bulk cap (default 2)
+  MIRROR_SCHED_QUEUE          max queued requests per class (default 1000)
+  MIRROR_TENANT_WEIGHTS       e.g. "acme=4,internal=0.5" (default weight 1)
+"""
+
+import asyncio
+import functools
+import heapq
+import itertools
+import os
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+
+PRIORITIES = ("interactive", "background", "bulk")
+
+# Recent waits kept per class for the wait-time percentiles
+WAIT_WINDOW = 2048
+
+
+class SchedulerFull(RuntimeError):
+    """The priority class's queue is at its limit."""
+
+
+def _parse_weights(spec: str) -> Dict[str, float]:
+    weights = {}
+    for item in spec.split(","):
+        if "=" in item:
+            tenant, weight = item.split("=", 1)
+            weights[tenant.strip()] = float(weight)
+    return weights
+
+
+class _Waiter:
+
+    __slots__ = ("future", "tenant", "enqueued", "cancelled")
+
+    def __init__(self, future: asyncio.Future, tenant: str):
+        self.future = future
+        self.tenant = tenant
+        self.enqueued = time.monotonic()
+        self.cancelled = False
+
+
+class _PriorityClass:
+
+    def __init__(self, name: str, cap: int):
+        self.name = name
+        self.cap = cap
+        self.running = 0
+        self.queue: List = []  # heap of (finish, seq, waiter)
+        self.queued = 0
+        self.virtual_time = 0.0
+        self.tenant_finish: Dict[str, float] = {}
+
+        self.admitted = 0
+        self.rejected = 0
+        self.cancelled = 0
+        self.waits: Deque[float] = deque(maxlen=WAIT_WINDOW)
+
+    def stats(self) -> Dict[str, Any]:
+        waits = sorted(self.waits)
+
+        def pct(q: float) -> float:
+            return round(waits[min(len(waits) - 1, int(q * len(waits)))] * 1000, 3) if waits else 0.0
+
+        return {
+            "cap": self.cap,
+            "running": self.running,
+            "queued": self.queued,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "cancelled": self.cancelled,
+            "wait_ms": {"p50": pct(0.5), "p99": pct(0.99), "max": pct(1.0)},
+        }
+
+
+class AdmissionScheduler:
+
+    def __init__(
+        self,
+        total: Optional[int] = None,
+        caps: Optional[Dict[str, int]] = None,
+        max_queue: Optional[int] = None,
+        tenant_weights: Optional[Dict[str, float]] = None
+    ):
+        env = os.environ
+        self.total = total or int(env.get("MIRROR_SCHED_TOTAL", "8"))
+        caps = caps or {
+            "interactive": int(env.get("MIRROR_SCHED_INTERACTIVE", "8")),
+            "background": int(env.get("MIRROR_SCHED_BACKGROUND", "4")),
+            "bulk": int(env.get("MIRROR_SCHED_BULK", "2")),
+        }
+        self.max_queue = max_queue or int(env.get("MIRROR_SCHED_QUEUE", "1000"))
+        self.tenant_weights = (
+            tenant_weights if tenant_weights is not None
+            else _parse_weights(env.get("MIRROR_TENANT_WEIGHTS", ""))
+        )
+
+        self._classes = {name: _PriorityClass(name, caps[name]) for name in PRIORITIES}
+        self._running = 0
+        self._seq = itertools.count()
+
+    # ---------------------------------------------------------
+    # PUBLIC ENTRY POINT
+    # ---------------------------------------------------------
+    async def run(self, priority: str, tenant: str, fn: Callable[..., Any], *args, cost: float = 1.0) -> Any:
+        """
+        Waits for a slot in `priority` and runs fn(*args) in a worker
+        thread. Raises ValueError for an unknown priority and
+        SchedulerFull when the class queue is at its limit.
+        """
+        await self._admit(priority, tenant, cost)
+        # The slot belongs to the thread, not to the caller: a cancelled
+        # caller stops waiting, but the slot is held until fn returns
+        task = asyncio.ensure_future(asyncio.to_thread(fn, *args))
+        task.add_done_callback(functools.partial(self._finished, priority))
+        return await asyncio.shield(task)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "total_cap": self.total,
+            "running": self._running,
+            "classes": {name: cls.stats() for name, cls in self._classes.items()},
+        }
+
+    # ---------------------------------------------------------
+    # ADMISSION
+    # ---------------------------------------------------------
+    async def _admit(self, priority: str, tenant: str, cost: float):
+        cls = self._classes.get(priority)
+        if cls is None:
+            raise ValueError(f"Unknown priority {priority!r}; expected one of {', '.join(PRIORITIES)}")
+        if cls.queued >= self.max_queue:
+            cls.rejected += 1
+            raise SchedulerFull(f"{priority} queue is full")
+
+        waiter = _Waiter(asyncio.get_running_loop().create_future(), tenant)
+        weight = self.tenant_weights.get(tenant, 1.0)
+        finish = max(cls.virtual_time, cls.tenant_finish.get(tenant, 0.0)) + cost / weight
+        cls.tenant_finish[tenant] = finish
+        heapq.heappush(cls.queue, (finish, next(self._seq), waiter))
+        cls.queued += 1
+
+        self._dispatch()
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            if waiter.future.done() and not waiter.future.cancelled():
+                # Granted a slot in the same tick the caller went away
+                self._release(priority)
+            else:
+                waiter.cancelled = True
+                cls.queued -= 1
+                cls.cancelled += 1
+            raise
+
+    def _finished(self, priority: str, task: asyncio.Future):
+        if not task.cancelled():
+            task.exception()  # retrieved, so an abandoned run does not log
+        self._release(priority)
+
+    def _release(self, priority: str):
+        self._classes[priority].running -= 1
+        self._running -= 1
+        self._dispatch()
+
+    def _dispatch(self):
+        """
+        Fills free slots: highest class first, smallest virtual finish
+        time within a class.
+        """
+        while self._running < self.total:
+            for cls in self._classes.values():
+                if cls.running < cls.cap and self._start_next(cls):
+                    break
+            else:
+                return
+
+    def _start_next(self, cls: _PriorityClass) -> bool:
+        while cls.queue:
+            finish, _, waiter = heapq.heappop(cls.queue)
+            if waiter.cancelled or waiter.future.done():
+                # Cancelled, possibly before its own handler has run;
+                # that handler does the queued/cancelled accounting
+                continue
+
+            waiter.future.set_result(None)
+            cls.queued -= 1
+            cls.running += 1
+            cls.admitted += 1
+            cls.virtual_time = finish
+            cls.waits.append(time.monotonic() - waiter.enqueued)
+            self._running += 1
+
+            if len(cls.tenant_finish) > 4 * self.max_queue:
+                self._forget_idle_tenants(cls)
+            return True
+        return False
+
+    def _forget_idle_tenants(self, cls: _PriorityClass):
+        # A tenant whose last finish is behind the virtual clock starts
+        # fresh anyway, so its entry carries no information
+        cls.tenant_finish = {
+            tenant: finish for tenant, finish in cls.tenant_finish.items() if finish > cls.virtual_time
+        }
@@ -3,9 +3,53 @@ Mirror of Tomorrow - Backend API
 --------------------------------
 Exposes the IAI Orchestrator + Renderer as a simple HTTP API.
 
-Endpoint:
+Endpoints:
   POST /analyze
-  Body: { "text": "..." }
+  Body: { "text": "...", "user_id": "..." (optional) }
+
+  POST /jobs
+  Body: { "kind": "analyze" | "batch" | "splat_deltas", "payload": {...} }
+  Queues long-running work and answers 202 with the job id; poll
+  GET /jobs/{id} for its status and result (see backend/jobs/).
+
+  GET /analytics
+  GET /metrics
+
+  WebSocket /live
+  Streams text edits in, pushes patches of the rendered output back
+  (see backend/api/live.py).
+
+Responses are content-negotiated (see backend/api/encoding.py):
+JSON by default, MessagePack or CBOR via Accept, and brotli/gzip
+compression via Accept-Encoding above a size threshold.
+
+Concurrent requests for the same text share a single pipeline run
+(see backend/api/coalescing.py). With MIRROR_RESULT_CACHE set, finished
+anonymous results are also shared across worker processes through a
+mapped cache file (see backend/api/result_cache.py); requests with a
+user_id always run, since they read and update that user's history.
+
+With MIRROR_AFFINITY_WORKERS set, the agents pipeline runs in that many
+worker processes and each user's requests always reach the same one,
+keeping their history resident there (see backend/api/affinity.py).
+
+Analyses are admitted by priority class and tenant (see
+backend/api/scheduler.py), taken from these request headers (or the
+"priority" / "tenant" query parameters on /live):
+  X-Priority   interactive (default) | background | bulk
+  X-Tenant     defaults to the user_id, then "anonymous"
+A full class queue answers 503 with Retry-After.
+
+X-Deadline-Ms (default MIRROR_DEADLINE_MS, unset = none) is the
+request's latency budget, counted from arrival. When it runs short the
+Orchestrator skips optional stages and lists them in
+raw.skipped_stages. With less than MIRROR_PROJECTION_MIN_BUDGET_MS
+(default 50) left when the agents start, their Monte Carlo projection
+is skipped too and listed there as "projection".
+
+Input vetoed by the agents' safety prefilter (see
+backend/agents/pipeline.py) skips the Orchestrator: the response is the
+grounding synthesis, with raw.tier == "prefilter".
 
 Response:
   {
@@ -20,34 +64,114 @@ Response:
   }
 """
 
-from typing import Dict
+import os
+import threading
+import time
+from typing import Any, Dict, Optional
 
-from fastapi import FastAPI
+from fastapi import FastAPI, HTTPException, Request, Response, WebSocket
 from pydantic import BaseModel
 
-from backend.iai.orchestrator import IAIOrchestrator
+from backend.agents.pipeline import AgentsPipeline
+from backend.analytics.aggregator import Analytics
+from backend.api.affinity import AffinityDispatcher
+from backend.api.coalescing import SingleFlight, coalescing_key
+from backend.api.encoding import negotiated_response
+from backend.api.live import IncrementalAnalyzer, LiveMetrics, LiveSession
+from backend.api.result_cache import cache_from_env, pack_result, unpack_result
+from backend.api.scheduler import PRIORITIES, AdmissionScheduler, SchedulerFull
+from backend.iai.orchestrator import Orchestrator
+from backend.jobs.handlers import validate as validate_job
+from backend.jobs.queue import JobQueue
 from backend.renderer.renderer import Renderer
 
 
 app = FastAPI(title="Mirror of Tomorrow API")
 
-orchestrator = IAIOrchestrator()
+agents = AgentsPipeline()
+orchestrator = Orchestrator()
 renderer = Renderer()
+analytics = Analytics()
+single_flight = SingleFlight()
+live_metrics = LiveMetrics()
+scheduler = AdmissionScheduler()
+result_cache = cache_from_env()
+dispatcher = AffinityDispatcher.from_env()
+
+DEFAULT_DEADLINE_MS = os.environ.get("MIRROR_DEADLINE_MS")
+PROJECTION_MIN_BUDGET = float(os.environ.get("MIRROR_PROJECTION_MIN_BUDGET_MS", "50")) / 1000
+
+
+# Opened on first use, so importing the app creates no database file
+_jobs: Optional[JobQueue] = None
+_jobs_lock = threading.Lock()
+
+
+def _job_queue() -> JobQueue:
+    global _jobs
+    with _jobs_lock:
+        if _jobs is None:
+            _jobs = JobQueue()
+        return _jobs
 
 
 class AnalyzeRequest(BaseModel):
     text: str
+    user_id: Optional[str] = None
+
+
+class JobRequest(BaseModel):
+    kind: str
+    payload: Dict[str, Any]
+    max_attempts: int = 5
+
+
+def _run_pipeline(text: str, user_id: Optional[str] = None, deadline: Optional[float] = None) -> Dict:
+    """
+    Agents + Orchestrator + Renderer for one text. Runs in a worker thread.
+    """
+    # A short budget goes to the required stages, not the projection
+    skip_projection = deadline is not None and deadline - time.monotonic() < PROJECTION_MIN_BUDGET
+    projection_paths = 0 if skip_projection else None
+
+    if dispatcher is not None:
+        agents_output = dispatcher.run(text, user_id, projection_paths)
+    else:
+        agents_output = agents.run(text, user_id, projection_paths)
+    analytics.record(agents_output, user_id)
+    rendered = _render(text, agents_output, deadline)
+    if skip_projection and agents_output["tier"] == "full":
+        rendered["raw"]["skipped_stages"].append("projection")
+
+    # Degraded (deadline-skipped or breaker-bypassed) results are not
+    # worth sharing
+    raw = rendered["raw"]
+    if result_cache is not None and user_id is None and not raw["skipped_stages"] and not raw["bypassed_stages"]:
+        result_cache.put(coalescing_key(text), pack_result(rendered))
+    return rendered
+
+
+def _render(text: str, agents_output: Dict, deadline: Optional[float] = None) -> Dict:
+    if agents_output["tier"] == "prefilter":
+        return renderer.render_grounded(agents_output)
+
+    pipeline_output = orchestrator.process(text, deadline)
+    pipeline_output["agents"] = agents_output["synthesis"]
+
+    return renderer.render(pipeline_output)
 
 
 @app.post("/analyze")
-def analyze(request: AnalyzeRequest) -> Dict:
+async def analyze(request: AnalyzeRequest, http_request: Request) -> Response:
     """
-    Runs the full pipeline and returns a visual-ready JSON object.
+    Runs the full pipeline and returns a visual-ready object
+    (JSON unless the client negotiates a binary format).
     """
+    arrived = time.monotonic()
     text = request.text.strip()
 
     if not text:
-        return {
+        return negotiated_response({
             "error": "Text is required.",
             "summary": "",
             "trajectory": "flat",
@@ -57,12 +181,102 @@ def analyze(request: AnalyzeRequest) -> Dict:
             "stability": "stable",
             "insights": [],
             "raw": {}
-        }
+        }, http_request)
 
-    # Run orchestrator
-    pipeline_output = orchestrator.run(text)
+    priority = http_request.headers.get("x-priority", "interactive")
+    tenant = http_request.headers.get("x-tenant") or request.user_id or "anonymous"
+    if priority not in PRIORITIES:
+        raise HTTPException(status_code=400, detail=f"X-Priority must be one of {', '.join(PRIORITIES)}")
 
-    # Render visual JSON
-    rendered = renderer.render(pipeline_output)
+    budget_ms = http_request.headers.get("x-deadline-ms", DEFAULT_DEADLINE_MS)
+    try:
+        deadline = None if budget_ms is None else arrived + float(budget_ms) / 1000
+    except ValueError:
+        raise HTTPException(status_code=400, detail="X-Deadline-Ms must be a number")
 
-    return rendered
+    if result_cache is not None and request.user_id is None:
+        cached = result_cache.get(coalescing_key(text))
+        if cached is not None:
+            return negotiated_response(unpack_result(cached), http_request)
+
+    # Run orchestrator + renderer, sharing in-flight runs of the same text.
+    # Runs only coalesce within a class, so interactive requests never
+    # wait in the bulk queue.
+    key = f"{priority}:{coalescing_key(text, request.user_id)}"
+    try:
+        rendered = await single_flight.run(
+            key, scheduler.run, priority, tenant, _run_pipeline, text, request.user_id, deadline
+        )
+    except SchedulerFull as exc:
+        raise HTTPException(status_code=503, detail=str(exc), headers={"Retry-After": "1"})
+
+    return negotiated_response(rendered, http_request)
+
+
+@app.websocket("/live")
+async def live(websocket: WebSocket):
+    """
+    Live-typing analysis. Each connection keeps its own sentence cache;
+    live updates are not recorded in analytics.
+    """
+    params = websocket.query_params
+    priority = params.get("priority") or websocket.headers.get("x-priority", "interactive")
+    tenant = params.get("tenant") or websocket.headers.get("x-tenant") or "anonymous"
+    if priority not in PRIORITIES:
+        priority = "interactive"
+
+    async def run(fn, *args):
+        return await scheduler.run(priority, tenant, fn, *args)
+
+    analyzer = IncrementalAnalyzer(agents, live_metrics)
+    session = LiveSession(lambda text: _render(text, analyzer.run(text)), live_metrics, run=run)
+    await session.serve(websocket)
+
+
+@app.post("/jobs", status_code=202)
+def submit_job(request: JobRequest) -> Dict:
+    """
+    Queues work for the job workers (python -m backend.jobs.worker).
+    """
+    error = validate_job(request.kind, request.payload)
+    if error is not None:
+        raise HTTPException(status_code=400, detail=error)
+    job_id = _job_queue().enqueue(request.kind, request.payload, request.max_attempts)
+    return {"id": job_id, "status": "queued"}
+
+
+@app.get("/jobs/{job_id}")
+def job_status(job_id: str) -> Dict:
+    """
+    A job's status, plus its result or error once finished. Finished
+    jobs expire after a day.
+    """
+    job = _job_queue().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown or expired job")
+    return job
+
+
+@app.get("/analytics")
+def population_analytics() -> Dict:
+    """
+    Population-level views merged from every worker's sketches.
+    """
+    return analytics.read()
+
+
+@app.get("/metrics")
+def metrics() -> Dict:
+    """
+    Operational counters for the API process.
+    """
+    return {
+        "coalescing": single_flight.stats(),
+        "safety_tiers": agents.tier_stats(),
+        "live": live_metrics.stats(),
+        "scheduler": scheduler.stats(),
+        "orchestrator": orchestrator.stats(),
+        "result_cache": None if result_cache is None else result_cache.stats(),
+        "affinity": None if dispatcher is None else dispatcher.stats(),
+        "jobs": None if _jobs is None else _jobs.stats()
+    }
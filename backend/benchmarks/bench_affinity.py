@@ -0,0 +1,118 @@
+"""
+Mirror of Tomorrow - User-Affinity Check
+----------------------------------------
+Local multi-process stand-in for a sharded deployment.
+
+Replays entries from many users through AffinityDispatcher, adding a
+worker part way through and removing one later, and checks that every
+result matches a single in-process AgentsPipeline fed the same
+sequence. Any history lost or split by routing or migration shows up as
+a mismatch in the pattern output.
+
+Also reports how evenly the ring spreads users and what fraction move
+when a node joins, for both local workers and multi-host node names.
+
+Run with:
+    python -m backend.benchmarks.bench_affinity --workers 4 --users 200 --entries 2000
+"""
+
+import argparse
+import random
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from backend.agents.pipeline import AgentsPipeline
+from backend.api.affinity import AffinityDispatcher
+from backend.api.hash_ring import HashRing
+
+
+WORDS = (
+    "work sleep exercise family stress goals money friends focus habit "
+    "tired progress always never better worse plan routine health study"
+).split()
+
+
+def _entry(rng: random.Random) -> str:
+    return ". ".join(
+        " ".join(rng.choice(WORDS) for _ in range(rng.randint(4, 9))).capitalize()
+        for _ in range(rng.randint(1, 4))
+    ) + "."
+
+
+def _ring_report(nodes, users, vnodes):
+    ring = HashRing(nodes, vnodes)
+    before = {u: ring.owner(u) for u in users}
+    load = Counter(before.values())
+    ring.add("joining")
+    moved = sum(before[u] != ring.owner(u) for u in users)
+    print(
+        f"  {len(nodes)} nodes ({nodes[0]}, ...): users per node min={min(load.values())} "
+        f"max={max(load.values())}; adding a node moves {moved / len(users):.1%} "
+        f"(ideal {1 / (len(nodes) + 1):.1%})"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="User-affinity dispatcher check")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--entries", type=int, default=2000)
+    parser.add_argument("--vnodes", type=int, default=128)
+    parser.add_argument("--threads", type=int, default=8)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    users = [f"user-{i}" for i in range(args.users)]
+    entries = [(rng.choice(users), _entry(rng)) for _ in range(args.entries)]
+
+    print("ring balance:")
+    ids = [f"user-{i}" for i in range(20000)]
+    _ring_report([f"worker-{i}" for i in range(args.workers)], ids, args.vnodes)
+    _ring_report([f"10.0.0.{i}:8000" for i in range(16)], ids, args.vnodes)
+
+    reference = AgentsPipeline()
+    expected = [reference.run(text, user_id)["pattern"] for user_id, text in entries]
+
+    dispatcher = AffinityDispatcher(args.workers, args.vnodes)
+    try:
+        # Per-user order matters for history, so each user's entries run
+        # in sequence while different users run concurrently
+        by_user = {}
+        for i, (user_id, text) in enumerate(entries):
+            by_user.setdefault(user_id, []).append((i, text))
+
+        results = [None] * len(entries)
+        third = len(entries) // 3
+
+        def replay(phase):
+            def run_user(user_id):
+                for i, text in by_user[user_id]:
+                    if min(i // third, 2) == phase:
+                        results[i] = dispatcher.run(text, user_id)["pattern"]
+            with ThreadPoolExecutor(args.threads) as pool:
+                list(pool.map(run_user, by_user))
+
+        started = time.monotonic()
+        replay(0)
+        added = dispatcher.add_worker()
+        replay(1)
+        removed = dispatcher.remove_worker("worker-0")
+        replay(2)
+        elapsed = time.monotonic() - started
+
+        mismatches = sum(r != e for r, e in zip(results, expected))
+        stats = dispatcher.stats()
+        print(
+            f"dispatcher: {len(entries)} entries in {elapsed:.2f}s "
+            f"(added {added}, removed {removed}, {stats['users_moved']} user histories moved)"
+        )
+        print(f"  mismatches vs single pipeline: {mismatches}")
+        for name, users_held in sorted(dispatcher.resident_users().items()):
+            print(f"  {name}: {len(users_held)} resident users")
+    finally:
+        dispatcher.close()
+
+
+if __name__ == "__main__":
+    main()
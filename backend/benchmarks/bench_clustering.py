@@ -0,0 +1,91 @@
+"""
+Mirror of Tomorrow - Clustering Benchmark
+-----------------------------------------
+Compares LSH-candidate clustering against the exact all-pairs greedy
+clustering in IAISynthesis on synthetic perspective sets, reporting
+time and pairwise agreement.
+
+Run with:
+    python -m backend.benchmarks.bench_clustering --sizes 100 300 1000 --exact-limit 300
+"""
+
+import argparse
+import random
+import time
+
+from backend.iai.lsh import clustering_agreement
+from backend.iai.synthesis_engine import IAISynthesis
+
+
+def _vocabulary(size: int, rng: random.Random) -> list:
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    return ["".join(rng.choice(letters) for _ in range(rng.randint(3, 9))) for _ in range(size)]
+
+
+class _NoLessons:
+
+    def get_retained_lessons(self):
+        return []
+
+
+def _perspectives(n: int, family_size: int, seed: int) -> dict:
+    """
+    n perspectives drawn from n / family_size base answers, each lightly
+    mutated so near-duplicates cluster and families stay apart.
+    """
+    rng = random.Random(seed)
+    vocab = _vocabulary(5000, rng)
+    bases = [
+        " ".join(rng.choice(vocab) for _ in range(40))
+        for _ in range(max(1, n // family_size))
+    ]
+
+    perspectives = {}
+    for i in range(n):
+        words = rng.choice(bases).split()
+        for _ in range(rng.randint(0, 4)):
+            words[rng.randrange(len(words))] = rng.choice(vocab)
+        perspectives[f"sample_{i}"] = " ".join(words)
+    return perspectives
+
+
+def _timed(fn):
+    start = time.perf_counter()
+    value = fn()
+    return value, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="LSH vs exact clustering")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 300, 1000])
+    parser.add_argument("--family-size", type=int, default=10)
+    parser.add_argument("--exact-limit", type=int, default=300)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    synthesis = IAISynthesis(_NoLessons())
+
+    print(f"{'n':>6} {'lsh_s':>8} {'exact_s':>8} {'clusters':>9} {'precision':>10} {'recall':>7}")
+    for n in args.sizes:
+        perspectives = _perspectives(n, args.family_size, args.seed)
+
+        synthesis.LSH_MIN_PERSPECTIVES = 0
+        (approx, _), lsh_time = _timed(lambda: synthesis._cluster_responses(perspectives))
+
+        line = f"{n:>6} {lsh_time:>8.3f}"
+        if n <= args.exact_limit:
+            (exact, _), exact_time = _timed(
+                lambda: synthesis._cluster_responses(perspectives, exact=True)
+            )
+            agreement = clustering_agreement(exact, approx)
+            line += (
+                f" {exact_time:>8.3f} {len(approx):>9}"
+                f" {agreement['pair_precision']:>10.3f} {agreement['pair_recall']:>7.3f}"
+            )
+        else:
+            line += f" {'-':>8} {len(approx):>9} {'-':>10} {'-':>7}"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Mirror of Tomorrow - Council Load Test
+--------------------------------------
+Drives CouncilClient + IAISynthesis against the local council stub and
+reports end-to-end latency, hedging and partial-quorum rates.
+
+Run with:
+    python -m backend.benchmarks.bench_council --requests 500 --concurrency 8
+"""
+
+import argparse
+import asyncio
+import statistics
+import threading
+import time
+
+import uvicorn
+
+from backend.iai.council_client import CouncilClient, CouncilQuorumError
+from backend.iai.council_stub import create_stub_app, stub_endpoints
+from backend.iai.synthesis_engine import IAISynthesis
+
+
+class _NoLessons:
+
+    def get_retained_lessons(self):
+        return []
+
+
+def _start_stub(port: int, args) -> uvicorn.Server:
+    app = create_stub_app(
+        latency=args.latency,
+        straggler_rate=args.straggler_rate,
+        straggler_latency=args.straggler_latency,
+        failure_rate=args.failure_rate,
+    )
+    server = uvicorn.Server(uvicorn.Config(app, port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.01)
+    return server
+
+
+async def _drive(args):
+    endpoints = stub_endpoints(
+        f"http://127.0.0.1:{args.port}", deadline=args.deadline, hedge_after=args.hedge_after
+    )
+    synthesis = IAISynthesis(_NoLessons())
+    latencies, partial, hedged, failed = [], 0, 0, 0
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async with CouncilClient(endpoints, quorum=args.quorum) as client:
+
+        async def one(i: int):
+            nonlocal partial, hedged, failed
+            async with semaphore:
+                start = time.perf_counter()
+                try:
+                    output = await client.deliberate(f"prompt {i}", synthesis)
+                except CouncilQuorumError:
+                    failed += 1
+                    return
+                latencies.append(time.perf_counter() - start)
+                partial += output["council"]["partial"]
+                hedged += len(output["council"]["hedged"])
+
+        start = time.perf_counter()
+        await asyncio.gather(*(one(i) for i in range(args.requests)))
+        elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    quantile = lambda q: latencies[min(len(latencies) - 1, int(q * len(latencies)))] * 1000
+
+    print(f"requests       {args.requests}  ({args.requests / elapsed:.1f}/s)")
+    print(f"quorum misses  {failed}")
+    print(f"partial        {partial}")
+    print(f"hedges sent    {hedged}")
+    if latencies:
+        print(f"latency ms     mean={statistics.mean(latencies) * 1000:.1f} "
+              f"p50={quantile(0.50):.1f} p95={quantile(0.95):.1f} p99={quantile(0.99):.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Council fan-out load test")
+    parser.add_argument("--port", type=int, default=9100)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--quorum", type=int, default=3)
+    parser.add_argument("--deadline", type=float, default=1.0)
+    parser.add_argument("--hedge-after", type=float, default=0.2)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--straggler-rate", type=float, default=0.05)
+    parser.add_argument("--straggler-latency", type=float, default=2.0)
+    parser.add_argument("--failure-rate", type=float, default=0.01)
+    args = parser.parse_args()
+
+    server = _start_stub(args.port, args)
+    try:
+        asyncio.run(_drive(args))
+    finally:
+        server.should_exit = True
+
+
+if __name__ == "__main__":
+    main()
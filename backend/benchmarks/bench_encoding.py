@@ -0,0 +1,79 @@
+"""
+Mirror of Tomorrow - Encoding Benchmark
+---------------------------------------
+Measures serialization and compression cost per response size so the
+defaults in backend/api/encoding.py can be chosen from real numbers.
+
+Run with:
+    python -m backend.benchmarks.bench_encoding [--repeat 200]
+"""
+
+import argparse
+import timeit
+
+from backend.api import encoding
+
+
+def _rendered_payload(insight_count: int) -> dict:
+    """
+    Builds a Renderer-shaped payload whose size grows with insight_count.
+    """
+    insights = [
+        f"Insight {i}: your habits show consistent behavioral patterns worth reinforcing."
+        for i in range(insight_count)
+    ]
+    return {
+        "summary": "Your overall trajectory shows constructive momentum.",
+        "trajectory": "up",
+        "emotion": "joy",
+        "risk": "low",
+        "reward": "medium",
+        "stability": "stable",
+        "insights": insights,
+        "raw": {"insights": insights, "confidence": "medium", "coherence": "high"},
+    }
+
+
+def _time_us(fn, repeat: int) -> float:
+    return min(timeit.repeat(fn, number=1, repeat=repeat)) * 1e6
+
+
+def run(repeat: int):
+    encoders = dict(encoding.available_encoders())
+    encoders["application/json (stdlib)"] = encoding.encode_json_stdlib
+    compressors = encoding.available_compressors()
+
+    header = f"{'insights':>8} {'format':<26} {'bytes':>9} {'encode_us':>10}"
+    for name in compressors:
+        header += f" {name + '_bytes':>10} {name + '_us':>9}"
+    print(header)
+
+    for count in (1, 10, 100, 1000, 10000):
+        payload = _rendered_payload(count)
+
+        for media_type, encoder in encoders.items():
+            body = encoder(payload)
+            line = (
+                f"{count:>8} {media_type:<26} {len(body):>9} "
+                f"{_time_us(lambda: encoder(payload), repeat):>10.1f}"
+            )
+
+            for compress in compressors.values():
+                compressed = compress(body)
+                line += (
+                    f" {len(compressed):>10} "
+                    f"{_time_us(lambda: compress(body), repeat):>9.1f}"
+                )
+
+            print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+    run(args.repeat)
+
+
+if __name__ == "__main__":
+    main()
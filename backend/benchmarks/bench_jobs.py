@@ -0,0 +1,66 @@
+"""
+Mirror of Tomorrow - Job Queue Throughput
+-----------------------------------------
+Measures how many jobs per minute the SQLite job queue moves end to
+end: enqueue, lease, complete. Handlers are no-ops, so the numbers are
+queue overhead only (the ceiling the analysis workers run under).
+
+Run with:
+    python -m backend.benchmarks.bench_jobs --jobs 20000 --processes 4 --batch 16
+"""
+
+import argparse
+import multiprocessing
+import os
+import tempfile
+import time
+
+from backend.jobs.queue import JobQueue
+from backend.jobs.worker import work
+
+
+def _noop(payload):
+    return {"ok": payload["n"]}
+
+
+def _worker(path: str, batch: int):
+    work(path, handlers={"noop": _noop}, batch=batch, exit_when_idle=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Job queue throughput")
+    parser.add_argument("--jobs", type=int, default=20000)
+    parser.add_argument("--processes", type=int, default=4)
+    parser.add_argument("--batch", type=int, default=16)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "jobs.db")
+        queue = JobQueue(path)
+
+        started = time.monotonic()
+        queue.enqueue_many("noop", ({"n": i} for i in range(args.jobs)))
+        enqueued = time.monotonic() - started
+        print(f"enqueue: {args.jobs} jobs in {enqueued:.2f}s ({args.jobs / enqueued * 60:,.0f}/min)")
+
+        started = time.monotonic()
+        processes = [
+            multiprocessing.Process(target=_worker, args=(path, args.batch))
+            for _ in range(args.processes)
+        ]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+        drained = time.monotonic() - started
+
+        stats = queue.stats()
+        print(
+            f"drain:   {stats['done']} jobs in {drained:.2f}s with {args.processes} workers "
+            f"({stats['done'] / drained * 60:,.0f}/min); left queued={stats['queued']} "
+            f"running={stats['running']} failed={stats['failed']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
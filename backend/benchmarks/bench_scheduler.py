@@ -0,0 +1,92 @@
+"""
+Mirror of Tomorrow - Scheduler Load Test
+----------------------------------------
+Runs a bulk backfill and a trickle of interactive requests through
+AdmissionScheduler, first with a single shared class (arrival order,
+like the API before the scheduler) and then with priority classes, and
+compares interactive wait and latency percentiles.
+
+Each "analysis" is a sleep in a worker thread, so the numbers isolate
+queueing from pipeline cost.
+
+Run with:
+    python -m backend.benchmarks.bench_scheduler --bulk 400 --interactive 100
+"""
+
+import argparse
+import asyncio
+import time
+
+from backend.api.scheduler import AdmissionScheduler
+
+
+def _work(seconds: float):
+    time.sleep(seconds)
+
+
+def _pct(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))] * 1000 if values else 0.0
+
+
+async def _scenario(args, prioritized: bool):
+    if prioritized:
+        scheduler = AdmissionScheduler(
+            total=args.slots,
+            caps={"interactive": args.slots, "background": args.slots, "bulk": args.bulk_cap},
+        )
+    else:
+        # Every class shares the same caps: first come, first served
+        scheduler = AdmissionScheduler(
+            total=args.slots,
+            caps={name: args.slots for name in ("interactive", "background", "bulk")},
+        )
+
+    async def bulk(i):
+        priority = "bulk" if prioritized else "interactive"
+        await scheduler.run(priority, f"backfill-{i % 2}", _work, args.bulk_cost)
+
+    latencies = []
+
+    async def interactive(i):
+        await asyncio.sleep(i * args.interactive_gap)
+        started = time.monotonic()
+        await scheduler.run("interactive", f"user-{i % 10}", _work, args.interactive_cost)
+        latencies.append(time.monotonic() - started)
+
+    await asyncio.gather(
+        *(bulk(i) for i in range(args.bulk)),
+        *(interactive(i) for i in range(args.interactive)),
+    )
+
+    label = "priority classes" if prioritized else "arrival order   "
+    print(
+        f"{label}  interactive latency ms: "
+        f"p50={_pct(latencies, 0.5):.1f}  p99={_pct(latencies, 0.99):.1f}  max={_pct(latencies, 1.0):.1f}"
+    )
+    return scheduler.stats()
+
+
+async def _drive(args):
+    await _scenario(args, prioritized=False)
+    stats = await _scenario(args, prioritized=True)
+    for name, cls in stats["classes"].items():
+        print(f"  {name:<12} admitted={cls['admitted']:<5} wait_ms={cls['wait_ms']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Admission scheduler load test")
+    parser.add_argument("--slots", type=int, default=8)
+    parser.add_argument("--bulk-cap", type=int, default=2)
+    parser.add_argument("--bulk", type=int, default=400)
+    parser.add_argument("--bulk-cost", type=float, default=0.02)
+    parser.add_argument("--interactive", type=int, default=100)
+    parser.add_argument("--interactive-cost", type=float, default=0.005)
+    parser.add_argument("--interactive-gap", type=float, default=0.01)
+    args = parser.parse_args()
+
+    asyncio.run(_drive(args))
+
+
+if __name__ == "__main__":
+    main()
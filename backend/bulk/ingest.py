@@ -0,0 +1,126 @@
+"""
+Mirror of Tomorrow - Memory-Mapped Ingestion
+--------------------------------------------
+Reads very large text inputs (exported journals of hundreds of MB)
+without loading them into one Python string.
+
+The file is mmap'd read-only. Sentence boundaries are found by running
+the regex directly over the mapped bytes, each sentence is handed out
+as a memoryview slice of the mapping, and decoding + whitespace
+normalization happen per sentence, only when asked for. Splitting on
+ASCII '.', '!' and '?' is safe for UTF-8 because those bytes never
+occur inside a multi-byte character.
+
+Sentences are grouped into chunks of roughly `chunk_bytes`, which
+ChunkedPipeline.run_chunks (backend/agents/mapreduce.py) maps as they
+arrive and merges into one analysis of the whole file, so the raw file
+is never read into memory and no chunk is decoded twice.
+"""
+
+import mmap
+import re
+from typing import Iterator
+
+
+# A sentence body plus its run of terminators (or a trailing fragment)
+_SENTENCE = re.compile(rb"[^.!?]+[.!?]*")
+_SPACE = b" \t\r\n\x0b\x0c"
+
+
+class MappedText:
+
+    def __init__(self, path: str):
+        self._file = open(path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty files cannot be mapped
+            self._map = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+
+    # ---------------------------------------------------------
+    # SENTENCES
+    # ---------------------------------------------------------
+    def sentence_views(self) -> Iterator[memoryview]:
+        """
+        Zero-copy views of each sentence, surrounding whitespace trimmed.
+        Views must not outlive the MappedText.
+        """
+        if self._map is None:
+            return
+
+        buffer = memoryview(self._map)
+        try:
+            for match in _SENTENCE.finditer(self._map):
+                start, end = match.span()
+                while start < end and buffer[start] in _SPACE:
+                    start += 1
+                while end > start and buffer[end - 1] in _SPACE:
+                    end -= 1
+                if start < end:
+                    yield buffer[start:end]
+        finally:
+            buffer.release()
+
+    def sentences(self) -> Iterator[str]:
+        """
+        Decoded sentences with whitespace collapsed the way
+        LogicModule._normalize does it, so " ".join(sentences) equals
+        the normalized file.
+        """
+        previous = None
+        for view in self.sentence_views():
+            text = str(view, "utf-8", "replace")
+            view.release()
+            sentence = " ".join(text.split()).replace(" ,", ",").replace(" .", ".")
+            if not sentence:
+                continue  # only non-ASCII whitespace (e.g. a trailing NBSP)
+            # _normalize also drops the space before a "," or "." that
+            # opens the next sentence, so that sentence joins this one
+            if previous is not None and sentence[0] in ",.":
+                previous += sentence
+                continue
+            if previous is not None:
+                yield previous
+            previous = sentence
+        if previous is not None:
+            yield previous
+
+    # ---------------------------------------------------------
+    # CHUNKS
+    # ---------------------------------------------------------
+    def chunks(self, chunk_bytes: int = 1 << 20) -> Iterator[str]:
+        """
+        Normalized text chunks of about `chunk_bytes`, always ending on a
+        sentence boundary.
+        """
+        parts, size = [], 0
+
+        for sentence in self.sentences():
+            parts.append(sentence)
+            size += len(sentence) + 1
+            if size >= chunk_bytes:
+                yield " ".join(parts)
+                parts, size = [], 0
+
+        if parts:
+            yield " ".join(parts)
+
+
+def iter_chunks(path: str, chunk_bytes: int = 1 << 20) -> Iterator[str]:
+    """
+    Streams normalized chunks of a file, closing the mapping when done.
+    """
+    with MappedText(path) as mapped:
+        yield from mapped.chunks(chunk_bytes)
@@ -0,0 +1,348 @@
+"""
+Mirror of Tomorrow - Bulk Re-scoring
+------------------------------------
+Streams a historical corpus through the agents pipeline and the
+Orchestrator on a process pool, e.g. after a rule change.
+
+It:
+  - reads JSONL (or Parquet, with pyarrow installed) in fixed-size chunks
+  - keeps a bounded number of chunks in flight, so memory stays flat
+    however large the corpus is
+  - writes results in input order, or as they complete (--unordered)
+  - checkpoints periodically and resumes after a crash (--resume)
+  - reports progress and throughput on stderr
+
+Run with:
+    python -m backend.bulk.rescore corpus.jsonl rescored.jsonl --workers 4 --resume
+
+Records are scored independently (no user_id is passed to the agents),
+so results do not depend on worker assignment or processing order.
+
+A record without a text field may name a text file in its path field
+instead ({"id": ..., "path": "journals/0001.txt"}). The file is
+memory-mapped and streamed through ChunkedPipeline.run_chunks (see
+ingest.py), so large documents are never read into one string.
+
+Each output line is:
+    { "id": ..., "agents": {...}, "orchestrator": {...} }
+or, if a record could not be analyzed:
+    { "id": ..., "error": "..." }
+"""
+
+import argparse
+import json
+import os
+import resource
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Dict, Iterator, List, Set, Tuple, Union
+
+from backend.agents.taxonomy import load_taxonomy
+from backend.bulk.ingest import iter_chunks
+
+
+# ---------------------------------------------------------
+# WORKER SIDE
+# ---------------------------------------------------------
+_agents = None
+_chunked = None
+_orchestrator = None
+
+
+def _init_worker():
+    global _agents, _chunked, _orchestrator
+    from backend.agents.mapreduce import ChunkedPipeline
+    from backend.agents.pipeline import AgentsPipeline
+    from backend.iai.orchestrator import Orchestrator
+
+    _agents = AgentsPipeline()
+    _chunked = ChunkedPipeline(_agents, workers=1)
+    _orchestrator = Orchestrator()
+
+
+def _analyze(record: Dict, text_field: str, path_field: str) -> Tuple[Dict, str]:
+    """
+    Agents output and the text the Orchestrator should see.
+    """
+    if text_field not in record and path_field in record:
+        agents = _chunked.run_chunks(iter_chunks(record[path_field]))
+        return agents, agents["logic"]["cleaned_text"]
+    text = record[text_field]
+    return _agents.run(text), text
+
+
+def _score_chunk(index: int, records: List[Union[str, Dict]], fields: Tuple[str, str, str]) -> Tuple[int, List[str]]:
+    """
+    Scores one chunk and returns it already serialized, so the parent
+    only ever holds output lines. Records are raw JSONL lines or
+    already-decoded Parquet rows.
+    """
+    text_field, id_field, path_field = fields
+    lines = []
+
+    for record in records:
+        record_id = None
+        try:  # one bad record must not sink the chunk
+            if isinstance(record, str):
+                record = json.loads(record)
+            if not isinstance(record, dict):
+                raise TypeError(f"expected a JSON object, got {type(record).__name__}")
+            record_id = record.get(id_field)
+            agents, text = _analyze(record, text_field, path_field)
+            lines.append(json.dumps(
+                {
+                    "id": record_id,
+                    "agents": agents,
+                    "orchestrator": _orchestrator.process(text),
+                },
+                ensure_ascii=False,
+            ))
+        except Exception as exc:
+            lines.append(json.dumps(
+                {"id": record_id, "error": f"{type(exc).__name__}: {exc}"},
+                ensure_ascii=False,
+                default=str,
+            ))
+
+    return index, lines
+
+
+# ---------------------------------------------------------
+# INPUT
+# ---------------------------------------------------------
+def _jsonl_chunks(path: str, chunk_size: int, skip: "Checkpoint") -> Iterator[Tuple[int, List[str]]]:
+    # Lines are parsed by the workers, where a malformed one becomes an
+    # error line instead of ending the run
+    with open(path, "r", encoding="utf-8") as f:
+        index, raw = 0, []
+        for line in f:
+            if not line.strip():
+                continue
+            raw.append(line)
+            if len(raw) == chunk_size:
+                if index not in skip:
+                    yield index, raw
+                index, raw = index + 1, []
+        if raw and index not in skip:
+            yield index, raw
+
+
+def _parquet_chunks(path: str, chunk_size: int, skip: "Checkpoint") -> Iterator[Tuple[int, List[Dict]]]:
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise SystemExit("Reading Parquet requires pyarrow (pip install pyarrow)")
+
+    for index, batch in enumerate(pq.ParquetFile(path).iter_batches(batch_size=chunk_size)):
+        if index not in skip:
+            yield index, batch.to_pylist()
+
+
+def read_chunks(path: str, chunk_size: int, skip: "Checkpoint") -> Iterator[Tuple[int, List[Union[str, Dict]]]]:
+    if path.endswith(".parquet"):
+        return _parquet_chunks(path, chunk_size, skip)
+    return _jsonl_chunks(path, chunk_size, skip)
+
+
+# ---------------------------------------------------------
+# CHECKPOINTS
+# ---------------------------------------------------------
+class Checkpoint:
+    """
+    Which chunks are safely in the output file, and how long the output
+    file was at that moment. Anything written after the last checkpoint
+    is truncated away on resume, so no record is emitted twice.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.watermark = 0          # every chunk below this is done
+        self.done: Set[int] = set()  # done chunks at or above the watermark
+        self.output_bytes = 0
+        self.records = 0
+
+    def __contains__(self, index: int) -> bool:
+        return index < self.watermark or index in self.done
+
+    def add(self, index: int):
+        self.done.add(index)
+        while self.watermark in self.done:
+            self.done.remove(self.watermark)
+            self.watermark += 1
+
+    def load(self) -> bool:
+        if not os.path.exists(self.path):
+            return False
+        with open(self.path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        self.watermark = data["watermark"]
+        self.done = set(data["done"])
+        self.output_bytes = data["output_bytes"]
+        self.records = data["records"]
+        return True
+
+    def save(self, output_file):
+        output_file.flush()
+        os.fsync(output_file.fileno())
+        self.output_bytes = output_file.tell()
+
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "watermark": self.watermark,
+                    "done": sorted(self.done),
+                    "output_bytes": self.output_bytes,
+                    "records": self.records,
+                },
+                f,
+            )
+        os.replace(tmp, self.path)
+
+
+# ---------------------------------------------------------
+# DRIVER
+# ---------------------------------------------------------
+def _report(records: int, started: float, resumed: int, final: bool = False):
+    elapsed = time.monotonic() - started
+    rate = (records - resumed) / elapsed if elapsed else 0.0
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(
+        f"{'done' if final else 'progress'}: {records} records, "
+        f"{rate:.1f} rec/s, {elapsed:.1f}s elapsed, peak RSS {peak_mb:.0f} MB",
+        file=sys.stderr,
+    )
+
+
+def _output_matches(output_path: str, checkpoint: Checkpoint) -> bool:
+    """
+    Whether the output file still holds everything the checkpoint says
+    was written to it.
+    """
+    return os.path.isfile(output_path) and os.path.getsize(output_path) >= checkpoint.output_bytes
+
+
+def rescore(
+    input_path: str,
+    output_path: str,
+    workers: int = os.cpu_count() or 1,
+    chunk_size: int = 256,
+    ordered: bool = True,
+    resume: bool = False,
+    checkpoint_every: float = 10.0,
+    report_every: float = 5.0,
+    fields: Tuple[str, str, str] = ("text", "id", "path")
+) -> int:
+    """
+    Returns the number of records written.
+    """
+    checkpoint = Checkpoint(f"{output_path}.ckpt")
+    resuming = resume and checkpoint.load()
+    if resuming and not _output_matches(output_path, checkpoint):
+        print(
+            f"{output_path} is missing or shorter than its checkpoint records; starting over",
+            file=sys.stderr,
+        )
+        checkpoint = Checkpoint(checkpoint.path)
+        resuming = False
+
+    if resuming:
+        output = open(output_path, "r+b")
+        output.truncate(checkpoint.output_bytes)
+        output.seek(checkpoint.output_bytes)
+    else:
+        output = open(output_path, "wb")
+
+    window = 2 * workers
+    resumed = checkpoint.records
+    started = last_checkpoint = last_report = time.monotonic()
+
+    # Ordered mode writes chunk i only after every chunk before it; with
+    # --resume the smallest unfinished chunk is where writing restarts
+    next_to_write = checkpoint.watermark
+    finished: Dict[int, List[str]] = {}
+
+    def write(index: int, lines: List[str]):
+        if lines:
+            output.write(("\n".join(lines) + "\n").encode("utf-8"))
+        checkpoint.add(index)
+        checkpoint.records += len(lines)
+
+    # Compile the taxonomy before forking so workers share one copy
+    load_taxonomy()
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        chunks = read_chunks(input_path, chunk_size, checkpoint)
+        in_flight = set()
+        exhausted = False
+
+        while in_flight or not exhausted:
+            # Keep the pool busy without reading ahead of it
+            while not exhausted and len(in_flight) + len(finished) < window:
+                item = next(chunks, None)
+                if item is None:
+                    exhausted = True
+                    break
+                in_flight.add(pool.submit(_score_chunk, item[0], item[1], fields))
+
+            if not in_flight:
+                break
+
+            done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                index, lines = future.result()
+                if not ordered:
+                    write(index, lines)
+                    continue
+
+                finished[index] = lines
+                while next_to_write in finished or next_to_write in checkpoint:
+                    if next_to_write in finished:
+                        write(next_to_write, finished.pop(next_to_write))
+                    next_to_write += 1
+
+            now = time.monotonic()
+            if now - last_checkpoint >= checkpoint_every:
+                checkpoint.save(output)
+                last_checkpoint = now
+            if now - last_report >= report_every:
+                _report(checkpoint.records, started, resumed)
+                last_report = now
+
+    checkpoint.save(output)
+    output.close()
+    _report(checkpoint.records, started, resumed, final=True)
+    return checkpoint.records
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-score a JSONL/Parquet corpus")
+    parser.add_argument("input")
+    parser.add_argument("output")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--chunk-size", type=int, default=256)
+    parser.add_argument("--unordered", action="store_true", help="write results as they complete")
+    parser.add_argument("--resume", action="store_true", help="continue from the last checkpoint")
+    parser.add_argument("--checkpoint-every", type=float, default=10.0, help="seconds")
+    parser.add_argument("--report-every", type=float, default=5.0, help="seconds")
+    parser.add_argument("--text-field", default="text")
+    parser.add_argument("--id-field", default="id")
+    parser.add_argument("--path-field", default="path", help="names a text file to score when text is absent")
+    args = parser.parse_args()
+
+    rescore(
+        args.input,
+        args.output,
+        workers=args.workers,
+        chunk_size=args.chunk_size,
+        ordered=not args.unordered,
+        resume=args.resume,
+        checkpoint_every=args.checkpoint_every,
+        report_every=args.report_every,
+        fields=(args.text_field, args.id_field, args.path_field),
+    )
+
+
+if __name__ == "__main__":
+    main()
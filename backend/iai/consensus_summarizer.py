@@ -0,0 +1,137 @@
+"""
+Mirror of Tomorrow - Consensus Summarizer
+-----------------------------------------
+Local extractive summarization for IAISynthesis._summarize_consensus.
+
+Instead of an LLM call, it picks the sentences that the council agrees
+on most:
+  - every response is split into sentences
+  - each sentence becomes a hashed, L2-normalized term vector
+  - one matrix product gives the full sentence similarity graph
+  - a sentence's support is the sum, over every *other* response, of
+    its best match in that response
+  - the highest-support sentences are returned, skipping near-repeats
+    and anything far less supported than the best sentence
+
+Sentence vectors are cached across calls, since council answers repeat
+a lot of phrasing.
+"""
+
+import re
+import zlib
+from collections import OrderedDict
+from typing import List, Tuple
+
+import numpy as np
+
+
+_SENTENCE_SPLIT = re.compile(r"(?<=[.!?])\s+")
+_TOKEN = re.compile(r"[a-z0-9']+")
+
+
+class ConsensusSummarizer:
+
+    def __init__(
+        self,
+        max_sentences: int = 2,
+        dim: int = 2048,
+        redundancy_threshold: float = 0.8,
+        min_relative_support: float = 0.5,
+        cache_size: int = 4096
+    ):
+        self.max_sentences = max_sentences
+        self.dim = dim
+        self.redundancy_threshold = redundancy_threshold
+        self.min_relative_support = min_relative_support
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[str, Tuple[np.ndarray, np.ndarray]]" = OrderedDict()
+
+    # ---------------------------------------------------------
+    # PUBLIC ENTRY POINT
+    # ---------------------------------------------------------
+    def summarize(self, texts: List[str]) -> str:
+        sentences, owners = [], []
+        for owner, text in enumerate(texts):
+            for sentence in _SENTENCE_SPLIT.split(text.strip()):
+                if sentence:
+                    sentences.append(sentence)
+                    owners.append(owner)
+
+        if not sentences:
+            return ""
+
+        vectors = self._matrix(sentences)
+        similarity = vectors @ vectors.T
+
+        scores = self._support(similarity, np.asarray(owners))
+        chosen = self._select(scores, similarity)
+
+        return " ".join(sentences[i] for i in chosen)
+
+    # ---------------------------------------------------------
+    # SCORING
+    # ---------------------------------------------------------
+    def _support(self, similarity: np.ndarray, owners: np.ndarray) -> np.ndarray:
+        """
+        Sum over other responses of each sentence's best match there.
+        Sentences of one response are contiguous, so reduceat over the
+        column blocks gives the per-response maximum in one call.
+        """
+        present = np.unique(owners)
+        if len(present) < 2:
+            # A single response: fall back to plain degree centrality
+            return similarity.sum(axis=1)
+
+        starts = np.searchsorted(owners, present)
+        best = np.maximum.reduceat(similarity, starts, axis=1)
+        best[owners[:, None] == present[None, :]] = 0.0
+        return best.sum(axis=1)
+
+    def _select(self, scores: np.ndarray, similarity: np.ndarray) -> List[int]:
+        chosen: List[int] = []
+        order = np.argsort(-scores, kind="stable")
+        floor = scores[order[0]] * self.min_relative_support
+
+        for index in order:
+            if len(chosen) >= self.max_sentences or scores[index] < floor:
+                break
+            if any(similarity[index, c] > self.redundancy_threshold for c in chosen):
+                continue
+            chosen.append(int(index))
+
+        return chosen
+
+    # ---------------------------------------------------------
+    # SENTENCE VECTORS
+    # ---------------------------------------------------------
+    def _matrix(self, sentences: List[str]) -> np.ndarray:
+        matrix = np.zeros((len(sentences), self.dim), dtype=np.float32)
+        for row, sentence in enumerate(sentences):
+            columns, values = self._vector(sentence)
+            matrix[row, columns] = values
+        return matrix
+
+    def _vector(self, sentence: str) -> Tuple[np.ndarray, np.ndarray]:
+        cached = self._cache.get(sentence)
+        if cached is not None:
+            self._cache.move_to_end(sentence)
+            return cached
+
+        tokens = _TOKEN.findall(sentence.lower())
+        buckets = np.fromiter(
+            (zlib.crc32(t.encode("utf-8")) % self.dim for t in tokens),
+            dtype=np.int64,
+            count=len(tokens),
+        )
+        columns, counts = np.unique(buckets, return_counts=True)
+
+        values = counts.astype(np.float32)
+        norm = np.linalg.norm(values)
+        if norm:
+            values /= norm
+
+        self._cache[sentence] = (columns, values)
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+        return columns, values
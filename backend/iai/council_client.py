@@ -0,0 +1,192 @@
+"""
+Mirror of Tomorrow - Council Client
+-----------------------------------
+Gathers the 5-model council responses that IAISynthesis.find_the_gap
+consumes.
+
+It:
+  - queries every configured model endpoint concurrently
+  - reuses pooled keep-alive HTTP connections across calls
+  - enforces a per-model deadline
+  - hedges stragglers with a second request after a delay
+  - synthesizes from a partial quorum when some models time out
+
+Model endpoint protocol:
+  POST <url>   Body: { "prompt": "..." }   Response: { "text": "..." }
+
+See backend/iai/council_stub.py for a local stub implementing it.
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+
+@dataclass
+class ModelEndpoint:
+    name: str
+    url: str
+    deadline: float = 10.0               # seconds, including hedges
+    hedge_after: Optional[float] = 2.0   # seconds; None disables hedging
+
+
+@dataclass
+class CouncilResult:
+    perspectives: Dict[str, str] = field(default_factory=dict)
+    timed_out: List[str] = field(default_factory=list)
+    failed: Dict[str, str] = field(default_factory=dict)
+    latencies: Dict[str, float] = field(default_factory=dict)
+    hedged: List[str] = field(default_factory=list)
+
+
+class CouncilQuorumError(RuntimeError):
+    """
+    Raised when fewer than `quorum` models answered in time.
+    """
+
+    def __init__(self, result: CouncilResult, quorum: int):
+        self.result = result
+        super().__init__(
+            f"Council quorum not reached: {len(result.perspectives)}/{quorum} responses"
+        )
+
+
+class CouncilClient:
+
+    def __init__(
+        self,
+        endpoints: List[ModelEndpoint],
+        quorum: int = 3,
+        max_connections: int = 50,
+        keepalive_expiry: float = 30.0
+    ):
+        self.endpoints = endpoints
+        self.quorum = quorum
+        self._client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+                keepalive_expiry=keepalive_expiry,
+            ),
+            timeout=None,  # deadlines are enforced per model below
+        )
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.aclose()
+
+    async def aclose(self):
+        await self._client.aclose()
+
+    # ---------------------------------------------------------
+    # PUBLIC ENTRY POINTS
+    # ---------------------------------------------------------
+    async def gather(self, prompt: str, stream=None) -> CouncilResult:
+        """
+        Queries every model concurrently and collects whatever arrives
+        before each model's deadline.
+
+        If `stream` (IAISynthesis.stream()) is given, each response is
+        added to it on arrival so provisional synthesis is available
+        while stragglers are still outstanding.
+        """
+        result = CouncilResult()
+
+        await asyncio.gather(
+            *(self._collect(endpoint, prompt, result, stream) for endpoint in self.endpoints)
+        )
+
+        # Keep the configured council order regardless of arrival order
+        result.perspectives = {
+            e.name: result.perspectives[e.name]
+            for e in self.endpoints if e.name in result.perspectives
+        }
+        return result
+
+    async def deliberate(self, prompt: str, synthesis) -> Dict[str, Any]:
+        """
+        Gathers the council and runs IAISynthesis.find_the_gap over the
+        responses, accepting a partial council once quorum is met.
+        """
+        result = await self.gather(prompt)
+
+        if len(result.perspectives) < self.quorum:
+            raise CouncilQuorumError(result, self.quorum)
+
+        output = synthesis.find_the_gap(result.perspectives)
+        output["council"] = {
+            "responded": list(result.perspectives),
+            "timed_out": result.timed_out,
+            "failed": result.failed,
+            "hedged": result.hedged,
+            "partial": len(result.perspectives) < len(self.endpoints),
+            "latencies": result.latencies,
+        }
+        return output
+
+    # ---------------------------------------------------------
+    # PER-MODEL QUERYING
+    # ---------------------------------------------------------
+    async def _collect(self, endpoint: ModelEndpoint, prompt: str, result: CouncilResult, stream=None):
+        start = time.perf_counter()
+
+        try:
+            text = await asyncio.wait_for(
+                self._hedged(endpoint, prompt, result), endpoint.deadline
+            )
+        except asyncio.TimeoutError:
+            result.timed_out.append(endpoint.name)
+            return
+        except (httpx.HTTPError, ValueError, KeyError) as exc:
+            result.failed[endpoint.name] = str(exc) or type(exc).__name__
+            return
+
+        result.perspectives[endpoint.name] = text
+        result.latencies[endpoint.name] = time.perf_counter() - start
+        if stream is not None:
+            stream.add(endpoint.name, text)
+
+    async def _hedged(self, endpoint: ModelEndpoint, prompt: str, result: CouncilResult) -> str:
+        """
+        Sends the request and, if it has not completed after
+        `hedge_after`, a second copy. The first success wins; a failure
+        only counts once every attempt has failed.
+        """
+        attempts = {asyncio.ensure_future(self._request(endpoint, prompt))}
+
+        try:
+            if endpoint.hedge_after is not None:
+                done, _ = await asyncio.wait(attempts, timeout=endpoint.hedge_after)
+                if not done:
+                    attempts.add(asyncio.ensure_future(self._request(endpoint, prompt)))
+                    result.hedged.append(endpoint.name)
+
+            error: Optional[BaseException] = None
+            pending = set(attempts)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    error = task.exception()
+
+            raise error
+        finally:
+            for task in attempts:
+                task.cancel()
+
+    async def _request(self, endpoint: ModelEndpoint, prompt: str) -> str:
+        response = await self._client.post(endpoint.url, json={"prompt": prompt})
+        response.raise_for_status()
+        body = response.json()
+        # A malformed reply counts as this member failing, like any other error
+        if not isinstance(body, dict):
+            raise ValueError(f"Expected a JSON object, got {type(body).__name__}")
+        if not isinstance(body.get("text"), str):
+            raise ValueError("Expected a string \"text\" in the reply")
+        return body["text"]
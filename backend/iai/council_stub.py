@@ -0,0 +1,117 @@
+"""
+Mirror of Tomorrow - Council Stub Server
+----------------------------------------
+A local stand-in for the 5-model council so CouncilClient and
+IAISynthesis can be exercised and load-tested offline.
+
+Each model answers POST /models/{name} with { "text": "..." } after a
+simulated latency. A configurable fraction of requests are stragglers
+or failures, which is what hedging and partial quorum exist for.
+
+Run with:
+    python -m backend.iai.council_stub --port 9100 --latency 0.05 --straggler-rate 0.1
+"""
+
+import argparse
+import asyncio
+import random
+from typing import Dict, List
+
+from fastapi import FastAPI, HTTPException
+from pydantic import BaseModel
+
+from backend.iai.council_client import ModelEndpoint
+
+
+COUNCIL = ["claude", "gpt", "grok", "gemini", "copilot"]
+
+_SHARED = (
+    "The strongest path forward is to build consistent daily habits, "
+    "reduce stress through rest, and focus on one long-term goal at a time."
+)
+
+_ANSWERS = {
+    "claude": _SHARED + " Reflect weekly on what is working.",
+    "gpt": _SHARED + " Track progress so small wins stay visible.",
+    "grok": _SHARED + " Keep the plan simple enough to survive bad days.",
+    "gemini": _SHARED + " Ask friends or family for accountability.",
+    "copilot": (
+        "Consider whether the goal itself still fits: sometimes stalled "
+        "progress signals a mismatch between values and plans."
+    ),
+}
+
+
+class PromptRequest(BaseModel):
+    prompt: str
+
+
+def create_stub_app(
+    latency: float = 0.05,
+    jitter: float = 0.02,
+    straggler_rate: float = 0.0,
+    straggler_latency: float = 2.0,
+    failure_rate: float = 0.0,
+    seed: int = 0
+) -> FastAPI:
+    """
+    Builds the stub council app with the given latency profile.
+    """
+    app = FastAPI(title="Mirror of Tomorrow Council Stub")
+    rng = random.Random(seed)
+
+    @app.post("/models/{name}")
+    async def answer(name: str, request: PromptRequest) -> Dict:
+        if name not in _ANSWERS:
+            raise HTTPException(status_code=404, detail=f"Unknown model '{name}'")
+
+        delay = latency + rng.uniform(0, jitter)
+        if rng.random() < straggler_rate:
+            delay += straggler_latency
+        await asyncio.sleep(delay)
+
+        if rng.random() < failure_rate:
+            raise HTTPException(status_code=503, detail="Simulated model failure")
+
+        return {"text": _ANSWERS[name]}
+
+    return app
+
+
+def stub_endpoints(
+    base_url: str,
+    deadline: float = 1.0,
+    hedge_after: float = 0.25
+) -> List[ModelEndpoint]:
+    """
+    ModelEndpoint list pointing at a running stub server.
+    """
+    return [
+        ModelEndpoint(name, f"{base_url}/models/{name}", deadline, hedge_after)
+        for name in COUNCIL
+    ]
+
+
+def main():
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Local council stub server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9100)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--jitter", type=float, default=0.02)
+    parser.add_argument("--straggler-rate", type=float, default=0.0)
+    parser.add_argument("--straggler-latency", type=float, default=2.0)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    app = create_stub_app(
+        args.latency, args.jitter, args.straggler_rate,
+        args.straggler_latency, args.failure_rate, args.seed
+    )
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -20,17 +20,18 @@ class FinalOutputEngine:
     def build(self, data: dict) -> dict:
         """
         Build the final output structure from all intelligence signals.
-        For now, returns placeholder final output.
+        Confidence and coherence come from signal fusion.
         """
 
-        # Placeholder — real final output logic will go here
+        fused = data.get("fused", {})
+
         return {
             "summary": data.get("summary", "System operating normally."),
             "trajectory": data.get("trajectory", "stable"),
             "emotion": data.get("emotion", "neutral"),
             "insights": data.get("insights", []),
-            "confidence": "medium",
-            "coherence": "high",
-            "stability": "stable",
+            "confidence": fused.get("confidence", "medium"),
+            "coherence": fused.get("coherence", "high"),
+            "stability": data.get("stability", "stable"),
             "raw": data
         }
@@ -1,33 +1,150 @@
 """
 Mirror of Tomorrow - Meta Engine
 --------------------------------
-This module will eventually:
-  - oversee all intelligence engines
-  - evaluate engine performance
-  - adjust weights dynamically
-  - detect anomalies
-  - coordinate multi-engine behavior
-  - provide meta-level reasoning
-
-For now, it provides a placeholder interface so the orchestrator
-can integrate it later without breaking the pipeline.
+Oversees the other engines with constant-memory online statistics
+(see online_stats.py):
+
+  - every numeric output signal (the fields of signals.SIGNAL_FIELDS)
+    has a StreamMonitor; evaluate() reports the signals that are
+    outliers against their own history or drifting away from it
+  - every Orchestrator stage's latency has a StreamMonitor too, fed
+    by observe_latency(); an optional stage whose latency keeps landing
+    in the upper tail trips its CircuitBreaker, and allow() tells the
+    Orchestrator to bypass it until a probe call comes back normal.
+    Required stages always run, so they are monitored without a breaker
+
+All updates are O(1) per request and guarded by one lock, so a single
+MetaEngine serves every request thread.
 """
 
+import threading
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from .online_stats import CircuitBreaker, StreamMonitor
+from .signals import FIELD_NAMES, signal_vector
+
+
+# Latency outliers closer than this to the mean are jitter, not a
+# degraded engine (seconds)
+MIN_LATENCY_EXCESS = 0.005
+
+
 class MetaEngine:
 
-    def __init__(self):
-        pass  # future initialization for meta-level logic
+    def __init__(
+        self,
+        breaker_threshold: int = 5,
+        breaker_cooldown: float = 30.0,
+        breaker_stages: Optional[Iterable[str]] = None
+    ):
+        """
+        `breaker_stages` are the stages that can be bypassed and so get
+        a circuit breaker; None gives every stage one.
+        """
+        self.breaker_threshold = breaker_threshold
+        self.breaker_cooldown = breaker_cooldown
+        self.breaker_stages = None if breaker_stages is None else frozenset(breaker_stages)
+
+        # Signals live on a small discrete scale: a z-test is enough
+        self._signals = {name: StreamMonitor(tail=None) for name in FIELD_NAMES}
+        self._latency: Dict[str, StreamMonitor] = {}
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
 
-    def evaluate(self, signals: dict) -> dict:
+    def evaluate(self, signals: dict, latency_anomalies: Optional[List[str]] = None) -> dict:
         """
         Perform meta-level evaluation across all engine outputs.
-        For now, returns placeholder meta signals.
+        `latency_anomalies` lists the stages of this request that were
+        slow outliers so far.
         """
+        vector = signal_vector(signals)
+        outliers, drifting = [], []
+
+        with self._lock:
+            for name, value in zip(FIELD_NAMES, vector):
+                if np.isnan(value):
+                    continue
+                flags = self._signals[name].observe(float(value))
+                if flags["outlier"]:
+                    outliers.append(name)
+                if flags["drift"]:
+                    drifting.append(name)
+
+        slow = list(latency_anomalies or [])
+        anomalies = len(outliers) + len(slow)
+        present = int(np.count_nonzero(~np.isnan(vector)))
+
+        if not anomalies and not drifting:
+            summary = "All engines operating within expected ranges."
+        else:
+            parts = []
+            if outliers:
+                parts.append(f"{len(outliers)} outlying signal{'s' if len(outliers) != 1 else ''}")
+            if drifting:
+                parts.append(f"{len(drifting)} drifting signal{'s' if len(drifting) != 1 else ''}")
+            if slow:
+                parts.append(f"slow stages: {', '.join(slow)}")
+            summary = "Detected " + "; ".join(parts) + "."
 
-        # Placeholder — real meta reasoning will go here
         return {
-            "meta_confidence": "medium",
-            "engine_alignment": "high",
-            "anomalies_detected": False,
-            "meta_summary": "All engines operating within expected ranges."
+            "meta_confidence": "high" if not anomalies else "medium" if anomalies <= 2 else "low",
+            "engine_alignment": "high" if not outliers else "medium" if len(outliers) <= present // 4 else "low",
+            "anomalies_detected": bool(anomalies),
+            "anomalies": {"signals": outliers, "latency": slow},
+            "drifting_signals": drifting,
+            "meta_summary": summary
         }
+
+    # ---------------------------------------------------------
+    # STAGE LATENCY + CIRCUIT BREAKERS
+    # ---------------------------------------------------------
+    def observe_latency(self, stage: str, seconds: float) -> bool:
+        """
+        Records one stage run and returns whether it was a slow
+        outlier. Feeds the stage's circuit breaker, if it has one.
+        """
+        with self._lock:
+            monitor = self._latency.get(stage)
+            if monitor is None:
+                monitor = self._latency[stage] = StreamMonitor(min_std=0.0, min_excess=MIN_LATENCY_EXCESS)
+            slow = monitor.observe(seconds)["high"]
+            if self._has_breaker(stage):
+                self._breaker(stage).record(slow)
+        return slow
+
+    def allow(self, stage: str) -> bool:
+        """
+        Whether `stage` should run, or be bypassed while its breaker is
+        open. Stages without a breaker always run.
+        """
+        if not self._has_breaker(stage):
+            return True
+        with self._lock:
+            return self._breaker(stage).allow()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "latency_ms": {
+                    stage: {
+                        key: round(value * 1000, 4) if key in ("mean", "std", "recent_mean", "p50", "p99") else value
+                        for key, value in monitor.stats().items()
+                    }
+                    for stage, monitor in self._latency.items()
+                },
+                "breakers": {stage: breaker.stats() for stage, breaker in self._breakers.items()},
+                "signal_outliers": {
+                    name: monitor.outliers for name, monitor in self._signals.items() if monitor.outliers
+                },
+            }
+
+    def _has_breaker(self, stage: str) -> bool:
+        return self.breaker_stages is None or stage in self.breaker_stages
+
+    def _breaker(self, stage: str) -> CircuitBreaker:
+        breaker = self._breakers.get(stage)
+        if breaker is None:
+            breaker = self._breakers[stage] = CircuitBreaker(self.breaker_threshold, self.breaker_cooldown)
+        return breaker
@@ -0,0 +1,205 @@
+"""
+Mirror of Tomorrow - Online Statistics
+--------------------------------------
+Constant-memory streaming statistics for MetaEngine.
+
+  - Welford          exact running mean / variance
+  - EWMA             exponentially weighted mean / variance, which
+                     follows recent behavior
+  - StreamMonitor    both, plus a t-digest (analytics.sketches.TDigest)
+                     for tail quantiles; flags outliers and drift
+  - CircuitBreaker   opens after repeated anomalies, probes again after
+                     a cooldown
+
+Every observe() is O(1). The t-digest buffers values and compresses
+every few hundred adds (amortized O(1)), and the quantile used for the
+outlier test is only re-read every `refresh` observations.
+"""
+
+import math
+import time
+from typing import Dict, Optional
+
+from backend.analytics.sketches import TDigest
+
+
+class Welford:
+
+    __slots__ = ("count", "mean", "_m2")
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+
+    def add(self, value: float):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+
+    @property
+    def variance(self) -> float:
+        return self._m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.variance)
+
+
+class EWMA:
+
+    __slots__ = ("alpha", "mean", "variance", "count")
+
+    def __init__(self, alpha: float = 0.05):
+        self.alpha = alpha
+        self.mean = 0.0
+        self.variance = 0.0
+        self.count = 0
+
+    def add(self, value: float):
+        if not self.count:
+            self.mean = value
+        else:
+            delta = value - self.mean
+            self.mean += self.alpha * delta
+            self.variance = (1 - self.alpha) * (self.variance + self.alpha * delta * delta)
+        self.count += 1
+
+
+class StreamMonitor:
+    """
+    Watches one numeric stream. observe() returns what was unusual
+    about the new value, judged against the history before it:
+
+      outlier   more than `z_threshold` standard deviations from the
+                long-run mean, and (for upper tails) above the long-run
+                `tail` quantile; "high" marks upper-tail outliers.
+                With tail=None no digest is kept and the z-test alone
+                decides (cheaper, for bounded or discrete signals)
+      drift     the recent (EWMA) mean has moved more than
+                `drift_threshold` standard deviations from the long-run
+                mean
+
+    Nothing is flagged before `warmup` observations. `min_std` keeps a
+    near-constant stream from turning every small change into an
+    outlier; `min_excess` ignores outliers closer than that to the mean
+    in absolute terms (e.g. sub-millisecond latency jitter).
+    """
+
+    def __init__(
+        self,
+        warmup: int = 50,
+        z_threshold: float = 4.0,
+        drift_threshold: float = 2.0,
+        tail: Optional[float] = 0.99,
+        refresh: int = 500,
+        alpha: float = 0.05,
+        min_std: float = 0.05,
+        min_excess: float = 0.0
+    ):
+        self.warmup = warmup
+        self.z_threshold = z_threshold
+        self.drift_threshold = drift_threshold
+        self.tail = tail
+        self.refresh = refresh
+        self.min_std = min_std
+        self.min_excess = min_excess
+
+        self.long_run = Welford()
+        self.recent = EWMA(alpha)
+        self.digest = TDigest() if tail is not None else None
+        self._tail_value = math.inf if tail is not None else -math.inf
+        self.outliers = 0
+        self.drifting = False
+
+    def observe(self, value: float) -> Dict[str, bool]:
+        flags = {"outlier": False, "high": False, "drift": False}
+
+        if self.long_run.count >= self.warmup:
+            std = max(self.long_run.std, self.min_std)
+            excess = value - self.long_run.mean
+            if abs(excess) > max(self.z_threshold * std, self.min_excess):
+                flags["outlier"] = excess < 0 or value > self._tail_value
+                flags["high"] = flags["outlier"] and excess > 0
+            flags["drift"] = abs(self.recent.mean - self.long_run.mean) > self.drift_threshold * std
+
+        self.long_run.add(value)
+        self.recent.add(value)
+        if self.digest is not None:
+            self.digest.add(value)
+            if self.long_run.count == self.warmup or self.long_run.count % self.refresh == 0:
+                self._tail_value = self.digest.quantile(self.tail)
+
+        self.outliers += flags["outlier"]
+        self.drifting = flags["drift"]
+        return flags
+
+    def stats(self) -> Dict[str, float]:
+        stats = {
+            "count": self.long_run.count,
+            "mean": self.long_run.mean,
+            "std": self.long_run.std,
+            "recent_mean": self.recent.mean,
+            "outliers": self.outliers,
+            "drifting": self.drifting,
+        }
+        if self.digest is not None and self.long_run.count:
+            stats["p50"] = self.digest.quantile(0.5)
+            stats["p99"] = self.digest.quantile(0.99)
+        return stats
+
+
+class CircuitBreaker:
+    """
+    closed     calls run; `threshold` anomalies in a row open it
+    open       calls are bypassed for `cooldown` seconds
+    half_open  one probe call runs; normal closes, anomalous reopens
+    """
+
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+    def __init__(self, threshold: int = 5, cooldown: float = 30.0):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.state = self.CLOSED
+        self.streak = 0
+        self.opened_at: Optional[float] = None
+        self.trips = 0
+        self.bypassed = 0
+        self._probing = False
+
+    def allow(self) -> bool:
+        if self.state == self.OPEN:
+            if time.monotonic() - self.opened_at < self.cooldown:
+                self.bypassed += 1
+                return False
+            self.state = self.HALF_OPEN
+        if self.state == self.HALF_OPEN:
+            if self._probing:
+                self.bypassed += 1
+                return False
+            self._probing = True
+        return True
+
+    def record(self, anomalous: bool):
+        if self.state == self.HALF_OPEN:
+            self._probing = False
+            if anomalous:
+                self._open()
+            else:
+                self.state = self.CLOSED
+                self.streak = 0
+            return
+
+        self.streak = self.streak + 1 if anomalous else 0
+        if self.state == self.CLOSED and self.streak >= self.threshold:
+            self._open()
+
+    def _open(self):
+        self.state = self.OPEN
+        self.opened_at = time.monotonic()
+        self.trips += 1
+
+    def stats(self) -> Dict:
+        return {"state": self.state, "trips": self.trips, "bypassed": self.bypassed}
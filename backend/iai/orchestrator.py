@@ -9,8 +9,25 @@ This is the central brain that:
     memory, insight, fusion, meta, and synthesis engines
   - merges their outputs
   - produces a final intelligence package
+
+Deadlines: process() takes an optional absolute deadline
+(time.monotonic() seconds). Every engine's cost is learned as an EWMA
+of its measured run time. Optional stages (context, meta, insight) are
+skipped, and replaced by an empty fallback, when the time left would not
+cover their estimated cost plus the estimated cost of the required
+stages still to come. The output lists them under "skipped_stages".
+
+Every stage's latency is also reported to MetaEngine, which keeps
+streaming statistics per stage and a circuit breaker per optional
+stage. An optional stage whose latency keeps landing in the upper tail
+is bypassed (empty fallback, listed under "bypassed_stages") until its
+breaker closes again. Required stages are monitored but always run.
 """
 
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
 from .emotional_engine import EmotionalEngine
 from .predictive_engine import PredictiveEngine
 from .pattern_engine import PatternEngine
@@ -25,6 +42,22 @@ from .synthesis_engine import SynthesisEngine
 from .final_output_engine import FinalOutputEngine
 
 
+# Run order of the engines
+STAGES = (
+    "emotional", "predictive", "pattern", "cognitive", "context", "memory",
+    "meta", "insight", "ethical", "fusion", "synthesis", "final_output"
+)
+
+# Stages the output can do without when time is short
+OPTIONAL_STAGES = frozenset({"context", "meta", "insight"})
+
+# Weight of the newest timing in each stage's cost estimate
+EWMA_ALPHA = 0.2
+
+# Cost assumed for a stage before it has been timed (seconds)
+INITIAL_COST = 0.001
+
+
 class Orchestrator:
 
     def __init__(self):
@@ -38,22 +71,48 @@ class Orchestrator:
         self.memory = MemoryEngine()
         self.insight = InsightEngine()
         self.fusion = SignalFusionEngine()
-        self.meta = MetaEngine()
+        self.meta = MetaEngine(breaker_stages=OPTIONAL_STAGES)
         self.synthesis = SynthesisEngine()
         self.final_output = FinalOutputEngine()
 
-    def process(self, text: str) -> dict:
+        # Learned per-stage cost (seconds) and skip counters
+        self.costs: Dict[str, float] = {name: INITIAL_COST for name in STAGES}
+        self.skips: Dict[str, int] = {name: 0 for name in OPTIONAL_STAGES}
+        self._lock = threading.Lock()
+
+    def process(self, text: str, deadline: Optional[float] = None) -> dict:
         """
         Run all engines and produce a unified intelligence state.
+        With a deadline, optional stages may be skipped to meet it.
         """
+        skipped: List[str] = []
+        bypassed: List[str] = []
+        slow: List[str] = []
+
+        def stage(name: str, fn: Callable, *args, fallback=None):
+            if name in OPTIONAL_STAGES:
+                if deadline is not None and not self._fits(name, deadline):
+                    skipped.append(name)
+                    return fallback
+                if not self.meta.allow(name):
+                    bypassed.append(name)
+                    return fallback
+            started = time.perf_counter()
+            try:
+                return fn(*args)
+            finally:
+                elapsed = time.perf_counter() - started
+                self._observe(name, elapsed)
+                if self.meta.observe_latency(name, elapsed):
+                    slow.append(name)
 
         # 1. Run base engines
-        emotional = self.emotional.analyze(text)
-        predictive = self.predictive.predict(text)
-        pattern = self.pattern.detect(text)
-        cognitive = self.cognitive.evaluate(text)
-        context = self.context.interpret(text)
-        memory = self.memory.recall(text)
+        emotional = stage("emotional", self.emotional.analyze, text)
+        predictive = stage("predictive", self.predictive.predict, text)
+        pattern = stage("pattern", self.pattern.detect, text)
+        cognitive = stage("cognitive", self.cognitive.evaluate, text)
+        context = stage("context", self.context.interpret, text, fallback={})
+        memory = stage("memory", self.memory.recall, text)
 
         # 2. Combine raw signals
         combined = {
@@ -66,25 +125,58 @@ class Orchestrator:
         }
 
         # 3. Meta-level evaluation
-        meta = self.meta.evaluate(combined)
+        meta = stage("meta", self.meta.evaluate, combined, list(slow), fallback={})
         combined["meta"] = meta
 
         # 4. Insight generation
-        insights = self.insight.generate(combined)
+        insights = stage("insight", self.insight.generate, combined, fallback={})
         combined["insights"] = insights.get("insights", [])
         combined["summary"] = insights.get("summary", "")
 
         # 5. Ethical evaluation
-        ethical = self.ethical.evaluate(combined)
+        ethical = stage("ethical", self.ethical.evaluate, combined)
         combined["ethical"] = ethical
 
         # 6. Fuse signals
-        fused = self.fusion.fuse(combined)
+        fused = stage("fusion", self.fusion.fuse, combined)
 
         # 7. Synthesize final intelligence
-        synthesized = self.synthesis.synthesize(fused)
+        synthesized = stage("synthesis", self.synthesis.synthesize, fused)
 
         # 8. Build final output
-        final_output = self.final_output.build(synthesized)
+        final_output = stage("final_output", self.final_output.build, synthesized)
+        final_output["skipped_stages"] = skipped
+        final_output["bypassed_stages"] = bypassed
+
+        if skipped:
+            with self._lock:
+                for name in skipped:
+                    self.skips[name] += 1
+                    # A skipped stage is not re-timed; let its estimate
+                    # decay so it gets another chance once load drops
+                    self.costs[name] *= 1 - EWMA_ALPHA
 
         return final_output
+
+    def stats(self) -> Dict:
+        return {
+            "stage_cost_ms": {name: round(cost * 1000, 4) for name, cost in self.costs.items()},
+            "skipped": dict(self.skips),
+            "meta": self.meta.stats()
+        }
+
+    # ---------------------------------------------------------
+    # BUDGETING
+    # ---------------------------------------------------------
+    def _fits(self, name: str, deadline: float) -> bool:
+        """
+        Whether `name` and every required stage after it fit before the
+        deadline, going by the learned costs.
+        """
+        later = STAGES[STAGES.index(name) + 1:]
+        needed = self.costs[name] + sum(self.costs[s] for s in later if s not in OPTIONAL_STAGES)
+        return time.monotonic() + needed <= deadline
+
+    def _observe(self, name: str, seconds: float):
+        with self._lock:
+            self.costs[name] += EWMA_ALPHA * (seconds - self.costs[name])
@@ -1,33 +1,227 @@
 """
 Mirror of Tomorrow - Signal Fusion Engine
 -----------------------------------------
-This module will eventually:
-  - merge outputs from all engines
-  - normalize signals
-  - weight importance
-  - resolve conflicts
-  - produce a unified intelligence state
-
-For now, it provides a placeholder interface so the orchestrator
-can integrate it later without breaking the pipeline.
+Merges the engines' outputs into one intelligence state.
+
+Each analysis becomes a signal vector (see signals.py). Fusion is a
+weighted, normalized combination of it: a weight matrix W (channels x
+fields) turns the vectors into channel scores in [-1, 1]
+
+    score = (W @ x) / (|W| @ present)
+
+where missing fields drop out of both the sum and the normalizer, so a
+skipped engine does not drag scores toward zero. A batch is the same
+expression with a matrix of vectors, so fuse_batch() fuses N analyses
+with one matrix product.
+
+Conflicts are pairs of fields that should agree (upward trajectory and
+a constructive emotional alignment, low risk and no ethical concern)
+but sit far apart. They are found with one vectorized difference over
+all pairs; their mean disagreement sets coherence, and coverage times
+coherence sets confidence.
+
+Weights are configured in CHANNEL_WEIGHTS, overridden per deployment
+with a JSON file ({"channel": {"engine.key": weight}}) named by
+MIRROR_FUSION_WEIGHTS, or learned from labelled outcomes with fit().
 """
 
+import json
+import os
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from .signals import FIELD_INDEX, FIELD_NAMES, SIGNAL_FIELDS, field_indices, signal_matrix, vector_to_dict
+
+
+CHANNEL_WEIGHTS: Dict[str, Dict[str, float]] = {
+    "outlook": {
+        "predictive.trajectory": 1.5,
+        "predictive.momentum": 1.0,
+        "predictive.reward": 0.5,
+        "emotional.alignment": 1.0,
+        "emotional.confidence": 0.5,
+        "pattern.cycle": 1.0,
+    },
+    "stability": {
+        "predictive.stability": 1.5,
+        "pattern.volatility": 1.0,
+        "pattern.consistency": 1.0,
+        "emotional.stress": 0.5,
+        "context.continuity": 0.5,
+        "memory.continuity_score": 0.5,
+    },
+    "safety": {
+        "predictive.risk": 1.5,
+        "ethical.severity": 1.5,
+        "ethical.allowed": 1.0,
+        "emotional.stress": 0.5,
+        "meta.anomalies_detected": 0.5,
+    },
+    "clarity": {
+        "cognitive.clarity": 1.0,
+        "cognitive.coherence": 1.0,
+        "cognitive.logic_flow": 1.0,
+        "cognitive.cognitive_load": 0.5,
+        "pattern.signal_clarity": 1.0,
+    },
+}
+
+# Field pairs expected to point the same way
+AGREEMENT_PAIRS = (
+    ("predictive.trajectory", "emotional.alignment"),
+    ("predictive.trajectory", "pattern.cycle"),
+    ("predictive.stability", "pattern.volatility"),
+    ("predictive.risk", "ethical.severity"),
+    ("predictive.risk", "emotional.stress"),
+    ("cognitive.coherence", "meta.engine_alignment"),
+)
+
+# |difference| at or above which an agreement pair is a conflict
+# (opposite ends of a three-level scale are 2 apart)
+CONFLICT_THRESHOLD = 1.5
+
+
+def _level(value: float, high: float, low: float, labels=("high", "medium", "low")) -> str:
+    if value >= high:
+        return labels[0]
+    return labels[1] if value >= low else labels[2]
+
+
 class SignalFusionEngine:
 
-    def __init__(self):
-        pass  # future initialization for fusion logic
+    def __init__(
+        self,
+        weights: Optional[Dict[str, Dict[str, float]]] = None,
+        conflict_threshold: float = CONFLICT_THRESHOLD
+    ):
+        source = "weights"
+        if weights is None:
+            weights = {channel: dict(w) for channel, w in CHANNEL_WEIGHTS.items()}
+            path = os.environ.get("MIRROR_FUSION_WEIGHTS")
+            if path:
+                source = path
+                with open(path, "r", encoding="utf-8") as f:
+                    for channel, overrides in json.load(f).items():
+                        weights.setdefault(channel, {}).update(overrides)
+
+        for channel, fields in weights.items():
+            unknown = [name for name in fields if name not in FIELD_INDEX]
+            if unknown:
+                raise ValueError(
+                    f"Unknown signal field(s) {', '.join(map(repr, unknown))} in channel "
+                    f"{channel!r} of {source}; expected names from signals.SIGNAL_FIELDS"
+                )
+
+        self.channels: List[str] = list(weights)
+        self.weights = np.zeros((len(self.channels), len(SIGNAL_FIELDS)))
+        for row, channel in enumerate(self.channels):
+            for name, weight in weights[channel].items():
+                self.weights[row, field_indices([name])[0]] = weight
+
+        self.conflict_threshold = conflict_threshold
+        self._left = np.array(field_indices([a for a, _ in AGREEMENT_PAIRS]))
+        self._right = np.array(field_indices([b for _, b in AGREEMENT_PAIRS]))
 
+    # ---------------------------------------------------------
+    # PUBLIC ENTRY POINTS
+    # ---------------------------------------------------------
     def fuse(self, signals: dict) -> dict:
         """
         Combine signals from all engines into a unified structure.
-        For now, returns placeholder fused output.
         """
+        return self.fuse_batch([signals])[0]
+
+    def fuse_batch(self, batch: Sequence[dict]) -> List[dict]:
+        """
+        fuse() for many analyses with one pass of matrix operations.
+        """
+        vectors = signal_matrix(batch)
+        scores, coverage = self.scores(vectors)
+        conflicts, coherence = self.conflicts(vectors)
+        confidence = coverage * coherence
+        stability = scores[:, self.channels.index("stability")]
+
+        fused = []
+        for i, signals in enumerate(batch):
+            found = [
+                {"fields": list(AGREEMENT_PAIRS[p]), "difference": round(float(d), 3)}
+                for p, d in conflicts[i]
+            ]
+            fused.append({
+                "summary": (
+                    f"Signals fused with {len(found)} conflict{'s' if len(found) != 1 else ''}."
+                    if found else "Signals fused successfully."
+                ),
+                "coherence": _level(coherence[i], 0.75, 0.5),
+                "confidence": _level(confidence[i], 0.75, 0.4),
+                "stability": _level(stability[i], 0.33, -0.33, ("stable", "shifting", "volatile")),
+                "scores": {channel: round(float(scores[i, c]), 4) for c, channel in enumerate(self.channels)},
+                "conflicts": found,
+                "vector": vector_to_dict(vectors[i]),
+                "raw_signals": signals
+            })
+        return fused
+
+    # ---------------------------------------------------------
+    # VECTOR OPERATIONS
+    # ---------------------------------------------------------
+    def scores(self, vectors: np.ndarray):
+        """
+        Channel scores (N x channels) and each row's weighted coverage
+        (share of the total weight whose fields were present).
+        """
+        present = ~np.isnan(vectors)
+        values = np.where(present, vectors, 0.0)
+        magnitude = np.abs(self.weights)
+
+        weight_present = present @ magnitude.T
+        with np.errstate(invalid="ignore", divide="ignore"):
+            scores = np.where(weight_present > 0, (values @ self.weights.T) / weight_present, 0.0)
+
+        total = magnitude.sum()
+        coverage = weight_present.sum(axis=1) / total if total else np.zeros(len(vectors))
+        return scores, coverage
+
+    def conflicts(self, vectors: np.ndarray):
+        """
+        Per row, the (pair index, difference) of every conflicting
+        agreement pair, and coherence: 1 - mean pair disagreement / 2
+        (1.0 when no pair can be compared).
+        """
+        diffs = np.abs(vectors[:, self._left] - vectors[:, self._right])
+        comparable = ~np.isnan(diffs)
+        counts = comparable.sum(axis=1)
+        disagreement = np.where(comparable, diffs, 0.0).sum(axis=1)
+        coherence = 1.0 - np.divide(disagreement, 2 * counts, out=np.zeros(len(vectors)), where=counts > 0)
+
+        hits = comparable & (np.where(comparable, diffs, 0.0) >= self.conflict_threshold)
+        rows, pairs = np.nonzero(hits)
+        found: List[List] = [[] for _ in range(len(vectors))]
+        for row, pair in zip(rows, pairs):
+            found[row].append((int(pair), diffs[row, pair]))
+        return found, coherence
+
+    # ---------------------------------------------------------
+    # LEARNING
+    # ---------------------------------------------------------
+    def fit(self, channel: str, vectors: np.ndarray, targets: np.ndarray, ridge: float = 1e-2) -> Dict[str, float]:
+        """
+        Learns one channel's weights from labelled outcomes (targets in
+        [-1, 1], one per vector) by ridge regression, then rescales them
+        to the channel's current total weight. Missing fields count as 0.
+        Returns the learned weights by field name.
+        """
+        x = np.nan_to_num(vectors, nan=0.0)
+        gram = x.T @ x + ridge * np.eye(x.shape[1])
+        learned = np.linalg.solve(gram, x.T @ np.asarray(targets, dtype=float))
+
+        if channel not in self.channels:
+            self.channels.append(channel)
+            self.weights = np.vstack([self.weights, np.zeros(len(SIGNAL_FIELDS))])
+        row = self.channels.index(channel)
+        scale = np.abs(self.weights[row]).sum() or 1.0
+        norm = np.abs(learned).sum()
+        self.weights[row] = learned * (scale / norm) if norm else learned
 
-        # Placeholder — real fusion logic will go here
-        return {
-            "summary": "Signals fused successfully.",
-            "coherence": "high",
-            "confidence": "medium",
-            "stability": "stable",
-            "raw_signals": signals
-        }
+        return {name: float(w) for name, w in zip(FIELD_NAMES, self.weights[row]) if w}
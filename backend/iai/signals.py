@@ -0,0 +1,107 @@
+"""
+Mirror of Tomorrow - Signal Vectors
+-----------------------------------
+A fixed numeric layout for the engines' string labels, so fusion works
+on float arrays instead of re-reading "low" / "medium" / "high".
+
+Every field in SIGNAL_FIELDS reads one key of one engine's output and
+maps its label onto [-1, 1], where +1 is the constructive end (low risk,
+upward trajectory, high clarity, ...). Labels outside a field's scale,
+and missing engines (e.g. a deadline-skipped stage), become NaN.
+
+Field order is the vector layout and is versioned by SCHEMA_VERSION:
+append new fields, never reorder, and bump the version.
+"""
+
+from typing import Any, Dict, List, NamedTuple, Sequence
+
+import numpy as np
+
+
+SCHEMA_VERSION = 1
+
+
+class SignalField(NamedTuple):
+    engine: str
+    key: str
+    scale: Dict[Any, float]
+
+    @property
+    def name(self) -> str:
+        return f"{self.engine}.{self.key}"
+
+
+_LOW_GOOD = {"low": 1.0, "moderate": 0.0, "medium": 0.0, "high": -1.0}
+_HIGH_GOOD = {"low": -1.0, "moderate": 0.0, "medium": 0.0, "high": 1.0}
+_STRENGTH = {"weak": -1.0, "moderate": 0.0, "strong": 1.0}
+_DIRECTION = {"constructive": 1.0, "neutral": 0.0, "destructive": -1.0}
+_STABILITY = {"stable": 1.0, "shifting": 0.0, "volatile": -1.0}
+
+SIGNAL_FIELDS = (
+    SignalField("emotional", "alignment", _DIRECTION),
+    SignalField("emotional", "stress", _LOW_GOOD),
+    SignalField("emotional", "confidence", {"rising": 1.0, "steady": 0.0, "stable": 0.0, "falling": -1.0}),
+    SignalField("predictive", "trajectory", {"up": 1.0, "flat": 0.0, "down": -1.0}),
+    SignalField("predictive", "momentum", {"increasing": 1.0, "steady": 0.0, "decreasing": -1.0}),
+    SignalField("predictive", "risk", _LOW_GOOD),
+    SignalField("predictive", "reward", _HIGH_GOOD),
+    SignalField("predictive", "stability", _STABILITY),
+    SignalField("pattern", "consistency", {"steady": 1.0, "variable": 0.0, "erratic": -1.0}),
+    SignalField("pattern", "volatility", _LOW_GOOD),
+    SignalField("pattern", "signal_clarity", _HIGH_GOOD),
+    SignalField("pattern", "cycle", _DIRECTION),
+    SignalField("cognitive", "clarity", _HIGH_GOOD),
+    SignalField("cognitive", "coherence", _STRENGTH),
+    SignalField("cognitive", "cognitive_load", _LOW_GOOD),
+    SignalField("cognitive", "logic_flow", {"consistent": 1.0, "mixed": 0.0, "inconsistent": -1.0}),
+    SignalField("context", "personal_alignment", _STRENGTH),
+    SignalField("context", "continuity", _STABILITY),
+    SignalField("memory", "continuity_score", _STABILITY),
+    SignalField("meta", "engine_alignment", _HIGH_GOOD),
+    SignalField("meta", "anomalies_detected", {False: 1.0, True: -1.0}),
+    SignalField("ethical", "allowed", {True: 1.0, False: -1.0}),
+    SignalField("ethical", "severity", {"none": 1.0, "low": 0.5, "medium": -0.5, "high": -1.0}),
+)
+
+FIELD_NAMES = tuple(field.name for field in SIGNAL_FIELDS)
+FIELD_INDEX = {name: i for i, name in enumerate(FIELD_NAMES)}
+
+
+def signal_vector(signals: Dict[str, Dict]) -> np.ndarray:
+    """
+    The float vector for one analysis (the Orchestrator's combined
+    engine outputs).
+    """
+    vector = np.full(len(SIGNAL_FIELDS), np.nan)
+    for i, field in enumerate(SIGNAL_FIELDS):
+        label = (signals.get(field.engine) or {}).get(field.key)
+        if isinstance(label, str):
+            label = label.lower()
+        try:
+            vector[i] = field.scale[label]
+        except (KeyError, TypeError):
+            pass  # unknown or missing label stays NaN
+    return vector
+
+
+def signal_matrix(batch: Sequence[Dict[str, Dict]]) -> np.ndarray:
+    """
+    One row per analysis, shape (len(batch), len(SIGNAL_FIELDS)).
+    """
+    if not batch:
+        return np.empty((0, len(SIGNAL_FIELDS)))
+    return np.vstack([signal_vector(signals) for signals in batch])
+
+
+def vector_to_dict(vector: np.ndarray) -> Dict[str, Any]:
+    """
+    JSON-safe form of a vector: named values, None for missing.
+    """
+    return {
+        "schema": SCHEMA_VERSION,
+        "values": {name: None if np.isnan(v) else float(v) for name, v in zip(FIELD_NAMES, vector)},
+    }
+
+
+def field_indices(names: Sequence[str]) -> List[int]:
+    return [FIELD_INDEX[name] for name in names]
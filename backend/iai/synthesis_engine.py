@@ -2,6 +2,10 @@ from typing import Dict, List, Any
 from dataclasses import dataclass
 import difflib
 
+from .consensus_summarizer import ConsensusSummarizer
+from .lsh import MinHashLSH
+from .text_vectors import VectorSum, norm_sq, term_vector
+
 
 @dataclass
 class GapInsight:
@@ -24,12 +28,21 @@ class IAISynthesis:
       - Expert Alignment (Retained Lessons)
     """
 
+    CLUSTER_THRESHOLD = 0.70
+    OUTLIER_THRESHOLD = 0.40
+
+    # Above this many perspectives, clustering only compares LSH
+    # candidate pairs instead of all pairs
+    LSH_MIN_PERSPECTIVES = 64
+
     def __init__(self, retained_memory):
         """
         retained_memory must provide:
             - get_retained_lessons() -> List[str]
         """
         self.memory = retained_memory
+        self.lsh = MinHashLSH()
+        self.summarizer = ConsensusSummarizer()
 
     # ---------------------------------------------------------
     # PUBLIC ENTRY POINT
@@ -56,7 +69,7 @@ class IAISynthesis:
         clusters, major_opinion = self._cluster_responses(perspectives)
 
         # 3. Logical Gaps (Unique insights)
-        gaps = self._find_unique_insights(perspectives, responses)
+        gaps = self._find_unique_insights(perspectives)
 
         # 4. Expert Alignment (Retained Lessons)
         alignment_status = self._check_expert_alignment(consensus_summary)
@@ -69,18 +82,34 @@ class IAISynthesis:
             "expert_alignment": alignment_status,
         }
 
+    def stream(self) -> "SynthesisStream":
+        """
+        Starts an incremental synthesis that accepts perspectives one at
+        a time as council responses arrive.
+        """
+        return SynthesisStream(self)
+
     # ---------------------------------------------------------
     # INTERNAL LOGIC
     # ---------------------------------------------------------
 
-    def _cluster_responses(self, perspectives: Dict[str, str]):
+    def _cluster_responses(self, perspectives: Dict[str, str], exact: bool = False):
         """
         Groups similar responses using rough text similarity.
         In production, replace with embeddings + LanceDB.
+
+        Large perspective sets only compare pairs that share a MinHash
+        LSH bucket (see lsh.py); the greedy rule and the exact
+        similarity check are unchanged. Pass exact=True to force the
+        all-pairs pass, e.g. to measure LSH accuracy.
         """
         model_names = list(perspectives.keys())
         texts = list(perspectives.values())
 
+        neighbours = None
+        if not exact and len(texts) >= self.LSH_MIN_PERSPECTIVES:
+            neighbours = self.lsh.candidates(texts)
+
         clusters = []
         used = set()
 
@@ -91,12 +120,13 @@ class IAISynthesis:
             cluster = [model_names[i]]
             used.add(i)
 
-            for j, other in enumerate(texts):
+            others = range(len(texts)) if neighbours is None else neighbours[i]
+            for j in others:
                 if j in used:
                     continue
 
-                sim = self._similarity(base, other)
-                if sim > 0.70:  # similarity threshold
+                sim = self._similarity(base, texts[j])
+                if sim > self.CLUSTER_THRESHOLD:
                     cluster.append(model_names[j])
                     used.add(j)
 
@@ -106,29 +136,52 @@ class IAISynthesis:
         major_opinion = max(clusters, key=len) if clusters else []
         return clusters, major_opinion
 
-    def _find_unique_insights(
-        self, perspectives: Dict[str, str], all_responses: List[str]
-    ) -> List[GapInsight]:
+    def _find_unique_insights(self, perspectives: Dict[str, str]) -> List[GapInsight]:
         """
         Detects outlier ideas — the "Gap".
+
+        Each perspective is compared against the centroid of all the
+        others. The total term vector is built once and each
+        leave-one-out centroid is derived from it by subtraction, so
+        scoring everything is O(n·d) with no string concatenation.
+        Comparison is by position, so identical responses from different
+        models still count as each other's "others".
         """
+        vectors = [term_vector(text) for text in perspectives.values()]
+        norms = [norm_sq(vec) for vec in vectors]
+
+        total = VectorSum()
+        for vec in vectors:
+            total.add(vec)
+
+        return self._gaps_from_vectors(
+            list(perspectives.keys()), list(perspectives.values()), vectors, norms, total
+        )
+
+    def _gaps_from_vectors(
+        self,
+        names: List[str],
+        texts: List[str],
+        vectors: List[Dict[str, int]],
+        norms: List[int],
+        total: VectorSum
+    ) -> List[GapInsight]:
         gaps: List[GapInsight] = []
 
-        for name, text in perspectives.items():
-            others = " ".join([r for r in all_responses if r != text])
-            sim = self._similarity(text, others)
-
-            if sim < 0.40:  # outlier threshold
-                gaps.append(
-                    GapInsight(
-                        source=name,
-                        insight=text[:240] + ("..." if len(text) > 240 else ""),
-                        similarity_score=sim,
-                    )
-                )
+        for name, text, vec, vn in zip(names, texts, vectors, norms):
+            sim = total.leave_one_out_similarity(vec, vn)
+            if sim < self.OUTLIER_THRESHOLD:
+                gaps.append(self._gap_insight(name, text, sim))
 
         return gaps
 
+    def _gap_insight(self, name: str, text: str, sim: float) -> GapInsight:
+        return GapInsight(
+            source=name,
+            insight=text[:240] + ("..." if len(text) > 240 else ""),
+            similarity_score=sim,
+        )
+
     def _check_expert_alignment(self, consensus_summary: str) -> Dict[str, Any]:
         """
         Compares consensus against retained lessons.
@@ -160,10 +213,10 @@ class IAISynthesis:
 
     def _summarize_consensus(self, texts: List[str]) -> str:
         """
-        Placeholder for LLM-based summarization.
-        Replace with your local LLM call.
+        Extractive summary: the sentences best supported across the
+        council responses (see consensus_summarizer.py).
         """
-        return "The primary agreement across models centers on shared themes and overlapping logic."
+        return self.summarizer.summarize(texts)
 
     def _similarity(self, a: str, b: str) -> float:
         """
@@ -171,3 +224,108 @@ class IAISynthesis:
         Replace with embeddings for production.
         """
         return difflib.SequenceMatcher(None, a, b).ratio()
+
+
+class SynthesisStream:
+    """
+    Incremental form of IAISynthesis.find_the_gap.
+
+    Each add() costs one similarity check per existing cluster base plus
+    an O(nnz) update of the running term-vector sum. result() can be
+    called at any moment for a provisional answer.
+
+    Clusters follow the same greedy rule as _cluster_responses — a new
+    perspective joins the first cluster whose base is similar enough,
+    otherwise it founds a new cluster — so once every perspective is in,
+    the result equals find_the_gap over the same arrival order. Outlier
+    scores use the same leave-one-out vector sum as the batch pass, kept
+    up to date as perspectives arrive.
+    """
+
+    def __init__(self, synthesis: IAISynthesis):
+        self.synthesis = synthesis
+
+        self._names: List[str] = []
+        self._texts: List[str] = []
+        self._vectors: List[Dict[str, int]] = []
+        self._norms: List[int] = []
+        self._sum = VectorSum()
+
+        self._clusters: List[List[str]] = []
+        self._bases: List[str] = []
+        self._major = -1
+
+    def __len__(self):
+        return len(self._names)
+
+    def add(self, name: str, text: str):
+        if name in self._names:
+            raise ValueError(f"Perspective '{name}' was already added")
+
+        self._names.append(name)
+        self._texts.append(text)
+
+        # Clustering: first matching base wins, as in the batch pass
+        for index, base in enumerate(self._bases):
+            if self.synthesis._similarity(base, text) > self.synthesis.CLUSTER_THRESHOLD:
+                self._clusters[index].append(name)
+                break
+        else:
+            index = len(self._clusters)
+            self._clusters.append([name])
+            self._bases.append(text)
+
+        # Major opinion = first largest cluster, like max() in the batch pass
+        if self._major < 0:
+            self._major = index
+        else:
+            size, major_size = len(self._clusters[index]), len(self._clusters[self._major])
+            if size > major_size or (size == major_size and index < self._major):
+                self._major = index
+
+        vec = term_vector(text)
+        self._vectors.append(vec)
+        self._norms.append(norm_sq(vec))
+        self._sum.add(vec)
+
+    def result(self) -> Dict[str, Any]:
+        """
+        Provisional find_the_gap output for the perspectives seen so far.
+        """
+        synthesis = self.synthesis
+        consensus_summary = synthesis._summarize_consensus(list(self._texts))
+
+        gaps = synthesis._gaps_from_vectors(
+            self._names, self._texts, self._vectors, self._norms, self._sum
+        )
+
+        return {
+            "consensus": consensus_summary,
+            "major_opinion": list(self._clusters[self._major]) if self._clusters else [],
+            "clusters": [list(c) for c in self._clusters],
+            "logical_gaps": [g.__dict__ for g in gaps],
+            "expert_alignment": synthesis._check_expert_alignment(consensus_summary),
+        }
+
+
+class SynthesisEngine:
+    """
+    Orchestrator stage that turns the fused signal state into the
+    structure FinalOutputEngine expects. Council synthesis proper lives
+    in IAISynthesis; this stage passes the fused signals through.
+    """
+
+    def __init__(self):
+        pass  # future initialization for synthesis models
+
+    def synthesize(self, fused: dict) -> dict:
+        raw = fused.get("raw_signals", {})
+
+        return {
+            "summary": raw.get("summary") or fused.get("summary", ""),
+            "trajectory": raw.get("predictive", {}).get("trajectory", "flat"),
+            "emotion": raw.get("emotional", {}).get("emotion", "neutral"),
+            "insights": raw.get("insights", []),
+            "stability": fused.get("stability", "stable"),
+            "fused": fused
+        }
@@ -0,0 +1,73 @@
+"""
+Mirror of Tomorrow - Text Vectors
+---------------------------------
+Sparse term-frequency vectors for the synthesis engines.
+
+Vectors are plain {term: count} dicts. Counts stay integers, so running
+sums and squared norms are exact and can be updated incrementally or
+"subtracted out" for leave-one-out comparisons without rebuilding
+anything.
+"""
+
+import math
+import re
+from collections import Counter
+from typing import Dict
+
+
+Vector = Dict[str, int]
+
+_TOKEN = re.compile(r"[a-z0-9']+")
+
+
+def term_vector(text: str) -> Vector:
+    return Counter(_TOKEN.findall(text.lower()))
+
+
+def dot(a: Vector, b: Vector) -> int:
+    if len(a) > len(b):
+        a, b = b, a
+    return sum(count * b.get(term, 0) for term, count in a.items())
+
+
+def norm_sq(a: Vector) -> int:
+    return sum(count * count for count in a.values())
+
+
+def cosine(a: Vector, b: Vector) -> float:
+    denom = norm_sq(a) * norm_sq(b)
+    return dot(a, b) / math.sqrt(denom) if denom else 0.0
+
+
+class VectorSum:
+    """
+    Running sum of vectors that answers "how similar is member v to the
+    sum of everyone else?" in O(nnz(v)) — the rest is never materialized:
+
+        v . (T - v)   = v . T - |v|^2
+        |T - v|^2     = |T|^2 - 2 v . T + |v|^2
+    """
+
+    def __init__(self):
+        self.total: Counter = Counter()
+        self.total_norm_sq = 0
+        self.count = 0
+
+    def add(self, vec: Vector):
+        self.total_norm_sq += 2 * dot(self.total, vec) + norm_sq(vec)
+        self.total.update(vec)
+        self.count += 1
+
+    def leave_one_out_similarity(self, vec: Vector, vec_norm_sq: int = None) -> float:
+        """
+        Cosine similarity between `vec` (a member of the sum) and the
+        sum of all other members.
+        """
+        vn = norm_sq(vec) if vec_norm_sq is None else vec_norm_sq
+        vt = dot(vec, self.total)
+
+        rest_norm_sq = self.total_norm_sq - 2 * vt + vn
+        if vn == 0 or rest_norm_sq <= 0:
+            return 0.0
+
+        return (vt - vn) / math.sqrt(vn * rest_norm_sq)
@@ -0,0 +1,153 @@
+"""
+Mirror of Tomorrow - Job Handlers
+---------------------------------
+What each job kind does. A handler takes the job's payload and returns
+a JSON-serializable result; raising marks the attempt as failed (and
+retried, see queue.py).
+
+Kinds:
+  analyze       {"text": ..., "user_id": ... (optional)}
+                or {"path": ..., "user_id": ... (optional)}
+                the /analyze response for one (possibly huge) document,
+                mapped over sentence-aligned chunks; a "path" names a
+                regular file under MIRROR_INGEST_ROOT (relative paths
+                are taken from there), which is memory-mapped and
+                streamed (see backend/bulk/ingest.py) instead of
+                travelling in the payload. Without MIRROR_INGEST_ROOT,
+                "path" payloads are refused
+  batch         {"texts": [...]}
+                one /analyze response per text, scored independently
+  splat_deltas  {"splat_model": ..., "deltas": {...}}
+                applies IAI deltas to a splat model
+
+Pipelines are built lazily, once per worker process. validate() checks
+a payload's shape up front, so a job that can never succeed is refused
+at submit time instead of failing on every attempt.
+"""
+
+import os
+from typing import Any, Callable, Dict, Optional
+
+
+_state: Dict[str, Any] = {}
+
+
+def _pipelines():
+    if not _state:
+        from backend.agents.mapreduce import ChunkedPipeline
+        from backend.agents.pipeline import AgentsPipeline
+        from backend.iai.orchestrator import Orchestrator
+        from backend.renderer.renderer import Renderer
+
+        _state["chunked"] = ChunkedPipeline(AgentsPipeline(), workers=1)
+        _state["orchestrator"] = Orchestrator()
+        _state["renderer"] = Renderer()
+    return _state
+
+
+def _render(text: str, user_id: Optional[str] = None) -> Dict:
+    return _render_agents(text, _pipelines()["chunked"].run(text, user_id))
+
+
+def ingest_path(path: str) -> str:
+    """
+    The real path of an "analyze" job's file. Raises ValueError unless
+    it is a regular file inside MIRROR_INGEST_ROOT, so a client can
+    never point a worker at anything else the worker could read.
+    """
+    root = os.environ.get("MIRROR_INGEST_ROOT")
+    if not root:
+        raise ValueError("analyze \"path\" payloads are disabled (MIRROR_INGEST_ROOT is not set)")
+
+    root = os.path.realpath(root)
+    resolved = os.path.realpath(os.path.join(root, path))
+    if os.path.commonpath([root, resolved]) != root or not os.path.isfile(resolved):
+        raise ValueError("analyze \"path\" must name a file inside the ingest root")
+    return resolved
+
+
+def _render_file(path: str, user_id: Optional[str] = None) -> Dict:
+    from backend.bulk.ingest import iter_chunks
+
+    agents_output = _pipelines()["chunked"].run_chunks(iter_chunks(ingest_path(path)), user_id)
+    return _render_agents(agents_output["logic"]["cleaned_text"], agents_output)
+
+
+def _render_agents(text: str, agents_output: Dict) -> Dict:
+    state = _pipelines()
+    if agents_output["tier"] == "prefilter":
+        return state["renderer"].render_grounded(agents_output)
+    pipeline_output = state["orchestrator"].process(text)
+    pipeline_output["agents"] = agents_output["synthesis"]
+    return state["renderer"].render(pipeline_output)
+
+
+def analyze(payload: Dict) -> Dict:
+    if "path" in payload:
+        return _render_file(payload["path"], payload.get("user_id"))
+    return _render(payload["text"], payload.get("user_id"))
+
+
+def batch(payload: Dict) -> Dict:
+    return {"results": [_render(text) for text in payload["texts"]]}
+
+
+def splat_deltas(payload: Dict) -> Dict:
+    from backend.agents.backend.renderer.delta_applier import DeltaApplier
+
+    model = DeltaApplier().apply_deltas(payload["splat_model"], payload["deltas"])
+    return {"splat_model": model}
+
+
+HANDLERS: Dict[str, Callable[[Dict], Any]] = {
+    "analyze": analyze,
+    "batch": batch,
+    "splat_deltas": splat_deltas,
+}
+
+
+# ---------------------------------------------------------
+# PAYLOAD VALIDATION
+# ---------------------------------------------------------
+def _check_analyze(payload: Dict) -> Optional[str]:
+    if "path" in payload:
+        if not isinstance(payload["path"], str):
+            return "analyze \"path\" must be a string"
+        try:
+            ingest_path(payload["path"])
+        except ValueError as exc:
+            return str(exc)
+    elif not isinstance(payload.get("text"), str):
+        return "analyze needs a string \"text\" or \"path\""
+    if payload.get("user_id") is not None and not isinstance(payload["user_id"], str):
+        return "analyze \"user_id\" must be a string"
+    return None
+
+
+def _check_batch(payload: Dict) -> Optional[str]:
+    texts = payload.get("texts")
+    if not isinstance(texts, list) or not all(isinstance(text, str) for text in texts):
+        return "batch needs \"texts\", a list of strings"
+    return None
+
+
+def _check_splat_deltas(payload: Dict) -> Optional[str]:
+    if "splat_model" not in payload or not isinstance(payload.get("deltas"), dict):
+        return "splat_deltas needs \"splat_model\" and a \"deltas\" object"
+    return None
+
+
+_CHECKS: Dict[str, Callable[[Dict], Optional[str]]] = {
+    "analyze": _check_analyze,
+    "batch": _check_batch,
+    "splat_deltas": _check_splat_deltas,
+}
+
+
+def validate(kind: str, payload: Dict) -> Optional[str]:
+    """
+    Why `payload` cannot run as a `kind` job, or None if it can.
+    """
+    if kind not in HANDLERS:
+        return f"kind must be one of {', '.join(HANDLERS)}"
+    return _CHECKS[kind](payload)
@@ -0,0 +1,296 @@
+"""
+Mirror of Tomorrow - Durable Job Queue
+--------------------------------------
+An embedded job queue in one SQLite database (WAL mode), so long work
+(huge documents, bulk batches, splat delta application) runs outside
+the HTTP request and survives restarts.
+
+Lifecycle of a job:
+
+    queued --lease--> running --complete--> done
+                         |
+                         +--fail--> queued (after backoff) ... --> failed
+
+  - lease() claims due jobs for a worker for `lease_seconds`; the
+    claim is one UPDATE ... RETURNING under BEGIN IMMEDIATE, so two
+    workers can never hold the same job
+  - heartbeat() extends a lease while work is still going on; a
+    worker that dies stops heartbeating and its jobs are leased again
+    once their lease runs out (or fail, if that was the last attempt)
+  - fail() requeues with exponential backoff plus jitter until
+    max_attempts, then marks the job failed
+  - results are stored as zlib-compressed JSON and, like errors, expire
+    `ttl` seconds after the job finishes; purge_expired() deletes them
+
+WAL lets readers (GET /jobs/{id}) run alongside the single writer.
+Each thread gets its own connection.
+"""
+
+import json
+import os
+import random
+import sqlite3
+import threading
+import time
+import uuid
+import zlib
+from typing import Any, Dict, Iterable, List, Optional
+
+
+DEFAULT_PATH = os.environ.get("MIRROR_JOBS_DB", "mirror-jobs.db")
+
+QUEUED, RUNNING, DONE, FAILED = "queued", "running", "done", "failed"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id            TEXT PRIMARY KEY,
+    kind          TEXT NOT NULL,
+    payload       BLOB NOT NULL,
+    status        TEXT NOT NULL,
+    attempts      INTEGER NOT NULL DEFAULT 0,
+    max_attempts  INTEGER NOT NULL,
+    run_at        REAL NOT NULL,
+    lease_owner   TEXT,
+    lease_expires REAL,
+    created       REAL NOT NULL,
+    finished      REAL,
+    expires       REAL,
+    result        BLOB,
+    error         TEXT
+);
+CREATE INDEX IF NOT EXISTS jobs_due ON jobs (status, run_at);
+CREATE INDEX IF NOT EXISTS jobs_lease ON jobs (status, lease_expires);
+CREATE INDEX IF NOT EXISTS jobs_expires ON jobs (expires);
+"""
+
+
+def _pack(value: Any) -> bytes:
+    return zlib.compress(json.dumps(value, separators=(",", ":")).encode("utf-8"), 6)
+
+
+def _unpack(data: Optional[bytes]) -> Any:
+    return None if data is None else json.loads(zlib.decompress(data))
+
+
+class Job:
+
+    __slots__ = ("id", "kind", "payload", "attempts", "max_attempts")
+
+    def __init__(self, id: str, kind: str, payload: Any, attempts: int, max_attempts: int):
+        self.id = id
+        self.kind = kind
+        self.payload = payload
+        self.attempts = attempts
+        self.max_attempts = max_attempts
+
+
+class JobQueue:
+
+    def __init__(
+        self,
+        path: str = DEFAULT_PATH,
+        ttl: float = 24 * 3600.0,
+        backoff_base: float = 2.0,
+        backoff_max: float = 300.0
+    ):
+        self.path = path
+        self.ttl = ttl
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._local = threading.local()
+
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+
+    # ---------------------------------------------------------
+    # PRODUCERS
+    # ---------------------------------------------------------
+    def enqueue(self, kind: str, payload: Any, max_attempts: int = 5, delay: float = 0.0) -> str:
+        return self.enqueue_many(kind, [payload], max_attempts, delay)[0]
+
+    def enqueue_many(self, kind: str, payloads: Iterable[Any], max_attempts: int = 5, delay: float = 0.0) -> List[str]:
+        now = time.time()
+        rows = [
+            (uuid.uuid4().hex, kind, _pack(payload), QUEUED, max_attempts, now + delay, now)
+            for payload in payloads
+        ]
+        conn = self._connect()
+        with conn:
+            conn.execute("BEGIN")
+            conn.executemany(
+                "INSERT INTO jobs (id, kind, payload, status, max_attempts, run_at, created) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+        return [row[0] for row in rows]
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        """
+        Status (and result or error, once finished) of a job, or None
+        if it does not exist or has expired.
+        """
+        row = self._connect().execute(
+            "SELECT kind, status, attempts, created, finished, expires, result, error "
+            "FROM jobs WHERE id = ?",
+            (job_id,),
+        ).fetchone()
+        if row is None:
+            return None
+        kind, status, attempts, created, finished, expires, result, error = row
+        if expires is not None and expires <= time.time():
+            return None
+        return {
+            "id": job_id,
+            "kind": kind,
+            "status": status,
+            "attempts": attempts,
+            "created": created,
+            "finished": finished,
+            "result": _unpack(result),
+            "error": error,
+        }
+
+    # ---------------------------------------------------------
+    # WORKERS
+    # ---------------------------------------------------------
+    def lease(self, worker_id: str, limit: int = 1, lease_seconds: float = 30.0) -> List[Job]:
+        """
+        Claims up to `limit` due jobs (queued, or running on an expired
+        lease) for `worker_id`.
+        """
+        now = time.time()
+        conn = self._connect()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            # A job whose worker died on its last attempt is not retried
+            conn.execute(
+                "UPDATE jobs SET status = ?, error = ?, finished = ?, expires = ?, "
+                "lease_owner = NULL, lease_expires = NULL "
+                "WHERE status = ? AND lease_expires <= ? AND attempts >= max_attempts",
+                (FAILED, "lease expired", now, now + self.ttl, RUNNING, now),
+            )
+            rows = conn.execute(
+                "UPDATE jobs SET status = ?, lease_owner = ?, lease_expires = ?, attempts = attempts + 1 "
+                "WHERE id IN ("
+                "  SELECT id FROM jobs WHERE status = ? AND run_at <= ? "
+                "  UNION ALL "
+                "  SELECT id FROM jobs WHERE status = ? AND lease_expires <= ? "
+                "  LIMIT ?"
+                ") RETURNING id, kind, payload, attempts, max_attempts",
+                (RUNNING, worker_id, now + lease_seconds, QUEUED, now, RUNNING, now, limit),
+            ).fetchall()
+        return [Job(id, kind, _unpack(payload), attempts, max_attempts)
+                for id, kind, payload, attempts, max_attempts in rows]
+
+    def heartbeat(self, job_id: str, worker_id: str, lease_seconds: float = 30.0) -> bool:
+        """
+        Extends the lease. False means the worker no longer owns the
+        job (its lease expired and another worker took it).
+        """
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET lease_expires = ? WHERE id = ? AND status = ? AND lease_owner = ?",
+                (time.time() + lease_seconds, job_id, RUNNING, worker_id),
+            )
+        return cursor.rowcount == 1
+
+    def release(self, job_id: str, worker_id: str) -> bool:
+        """
+        Hands a leased job back untouched, without using up an attempt.
+        """
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET status = ?, attempts = attempts - 1, lease_owner = NULL, lease_expires = NULL "
+                "WHERE id = ? AND status = ? AND lease_owner = ?",
+                (QUEUED, job_id, RUNNING, worker_id),
+            )
+        return cursor.rowcount == 1
+
+    def complete(self, job_id: str, worker_id: str, result: Any) -> bool:
+        now = time.time()
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET status = ?, result = ?, finished = ?, expires = ?, "
+                "lease_owner = NULL, lease_expires = NULL "
+                "WHERE id = ? AND status = ? AND lease_owner = ?",
+                (DONE, _pack(result), now, now + self.ttl, job_id, RUNNING, worker_id),
+            )
+        return cursor.rowcount == 1
+
+    def complete_many(self, worker_id: str, results: Dict[str, Any]) -> int:
+        """
+        complete() for several jobs in one transaction.
+        """
+        now = time.time()
+        conn = self._connect()
+        with conn:
+            conn.execute("BEGIN")
+            cursor = conn.executemany(
+                "UPDATE jobs SET status = ?, result = ?, finished = ?, expires = ?, "
+                "lease_owner = NULL, lease_expires = NULL "
+                "WHERE id = ? AND status = ? AND lease_owner = ?",
+                [(DONE, _pack(result), now, now + self.ttl, job_id, RUNNING, worker_id)
+                 for job_id, result in results.items()],
+            )
+        return cursor.rowcount
+
+    def fail(self, job_id: str, worker_id: str, error: str) -> str:
+        """
+        Requeues the job with backoff, or marks it failed once it has
+        used all its attempts. Returns the new status.
+        """
+        now = time.time()
+        conn = self._connect()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                "SELECT attempts, max_attempts FROM jobs WHERE id = ? AND status = ? AND lease_owner = ?",
+                (job_id, RUNNING, worker_id),
+            ).fetchone()
+            if row is None:
+                return RUNNING  # no longer ours
+            attempts, max_attempts = row
+
+            if attempts >= max_attempts:
+                conn.execute(
+                    "UPDATE jobs SET status = ?, error = ?, finished = ?, expires = ?, "
+                    "lease_owner = NULL, lease_expires = NULL WHERE id = ?",
+                    (FAILED, error, now, now + self.ttl, job_id),
+                )
+                return FAILED
+
+            conn.execute(
+                "UPDATE jobs SET status = ?, error = ?, run_at = ?, "
+                "lease_owner = NULL, lease_expires = NULL WHERE id = ?",
+                (QUEUED, error, now + self._backoff(attempts), job_id),
+            )
+            return QUEUED
+
+    # ---------------------------------------------------------
+    # MAINTENANCE
+    # ---------------------------------------------------------
+    def purge_expired(self) -> int:
+        with self._connect() as conn:
+            cursor = conn.execute("DELETE FROM jobs WHERE expires <= ?", (time.time(),))
+        return cursor.rowcount
+
+    def stats(self) -> Dict[str, int]:
+        counts = dict(self._connect().execute("SELECT status, COUNT(*) FROM jobs GROUP BY status"))
+        return {status: counts.get(status, 0) for status in (QUEUED, RUNNING, DONE, FAILED)}
+
+    # ---------------------------------------------------------
+    # INTERNALS
+    # ---------------------------------------------------------
+    def _backoff(self, attempts: int) -> float:
+        delay = min(self.backoff_max, self.backoff_base * 2 ** (attempts - 1))
+        return delay * random.uniform(0.5, 1.0)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # Autocommit; `with conn` still scopes the explicit BEGINs
+            conn = sqlite3.connect(self.path, timeout=30.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
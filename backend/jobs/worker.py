@@ -0,0 +1,170 @@
+"""
+Mirror of Tomorrow - Job Worker
+-------------------------------
+Worker processes for the durable job queue (see queue.py).
+
+Each process repeatedly:
+  - leases a small batch of due jobs
+  - runs them one by one while a heartbeat thread keeps the batch's
+    leases alive, so a long document is not handed to a second worker
+    mid-run
+  - completes each job with its result, or fails it (retried with
+    backoff until max attempts)
+
+Idle workers poll with a growing delay, and every process purges
+expired results now and then. SIGTERM / SIGINT finish the current job,
+hand the rest of the batch back to the queue, and exit.
+
+Run with:
+    python -m backend.jobs.worker --db mirror-jobs.db --processes 4
+"""
+
+import argparse
+import multiprocessing
+import os
+import signal
+import socket
+import threading
+import time
+import traceback
+from typing import Any, Callable, Dict, List, Optional
+
+from backend.jobs.queue import DEFAULT_PATH, Job, JobQueue
+
+
+PURGE_INTERVAL = 60.0
+
+
+class _Heartbeat(threading.Thread):
+    """
+    Renews the leases of the jobs still held by this worker.
+    """
+
+    def __init__(self, queue: JobQueue, worker_id: str, lease_seconds: float):
+        super().__init__(name="job-heartbeat", daemon=True)
+        self.queue = queue
+        self.worker_id = worker_id
+        self.lease_seconds = lease_seconds
+        self.held: List[str] = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+
+    def hold(self, job_ids: List[str]):
+        with self._lock:
+            self.held = list(job_ids)
+
+    def release(self, job_id: str):
+        with self._lock:
+            self.held.remove(job_id)
+
+    def run(self):
+        while not self._stop.wait(self.lease_seconds / 3):
+            with self._lock:
+                held = list(self.held)
+            for job_id in held:
+                self.queue.heartbeat(job_id, self.worker_id, self.lease_seconds)
+
+    def stop(self):
+        self._stop.set()
+
+
+def work(
+    path: str = DEFAULT_PATH,
+    handlers: Optional[Dict[str, Callable[[Dict], Any]]] = None,
+    batch: int = 4,
+    lease_seconds: float = 30.0,
+    poll: float = 0.05,
+    max_poll: float = 2.0,
+    exit_when_idle: bool = False,
+    stop: Optional[threading.Event] = None
+) -> int:
+    """
+    Runs one worker loop until `stop` is set (or the queue is empty, with
+    exit_when_idle). Returns the number of jobs this worker finished.
+    """
+    if handlers is None:
+        from backend.jobs.handlers import HANDLERS
+        handlers = HANDLERS
+
+    queue = JobQueue(path)
+    worker_id = f"{socket.gethostname()}:{os.getpid()}:{threading.get_ident()}"
+    stop = stop or threading.Event()
+    heartbeat = _Heartbeat(queue, worker_id, lease_seconds)
+    heartbeat.start()
+
+    finished = 0
+    delay = poll
+    purged = time.monotonic()
+    try:
+        while not stop.is_set():
+            jobs = queue.lease(worker_id, batch, lease_seconds)
+            if not jobs:
+                if exit_when_idle:
+                    break
+                stop.wait(delay)
+                delay = min(max_poll, delay * 2)
+                continue
+            delay = poll
+
+            heartbeat.hold([job.id for job in jobs])
+            for job in jobs:
+                if stop.is_set():
+                    queue.release(job.id, worker_id)
+                else:
+                    _run_job(queue, worker_id, job, handlers)
+                    finished += 1
+                heartbeat.release(job.id)
+
+            if time.monotonic() - purged >= PURGE_INTERVAL:
+                queue.purge_expired()
+                purged = time.monotonic()
+    finally:
+        heartbeat.stop()
+    return finished
+
+
+def _run_job(queue: JobQueue, worker_id: str, job: Job, handlers: Dict[str, Callable[[Dict], Any]]):
+    handler = handlers.get(job.kind)
+    if handler is None:
+        queue.fail(job.id, worker_id, f"Unknown job kind {job.kind!r}")
+        return
+    try:
+        result = handler(job.payload)
+    except Exception:
+        queue.fail(job.id, worker_id, traceback.format_exc(limit=5))
+    else:
+        queue.complete(job.id, worker_id, result)
+
+
+def _process_main(path: str, batch: int, lease_seconds: float):
+    stop = threading.Event()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        signal.signal(sig, lambda *_: stop.set())
+    work(path, batch=batch, lease_seconds=lease_seconds, stop=stop)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run job queue workers")
+    parser.add_argument("--db", default=DEFAULT_PATH, help="queue database")
+    parser.add_argument("--processes", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--batch", type=int, default=4, help="jobs leased at a time")
+    parser.add_argument("--lease", type=float, default=30.0, help="lease length in seconds")
+    args = parser.parse_args()
+
+    JobQueue(args.db)  # create the schema once, before the workers start
+    processes = [
+        multiprocessing.Process(target=_process_main, args=(args.db, args.batch, args.lease))
+        for _ in range(args.processes)
+    ]
+    for process in processes:
+        process.start()
+    try:
+        for process in processes:
+            process.join()
+    except KeyboardInterrupt:
+        for process in processes:
+            process.join()
+
+
+if __name__ == "__main__":
+    main()
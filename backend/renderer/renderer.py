@@ -34,3 +34,23 @@ class Renderer:
             # Keep raw data available for debugging or advanced UI features
             "raw": data
         }
+
+    def render_grounded(self, agents_output: dict) -> dict:
+        """
+        Frontend-ready object for input the agents' safety prefilter
+        vetoed: the grounding synthesis is the response, with no
+        Orchestrator projection behind it.
+        """
+        synthesis = agents_output["synthesis"]
+        data = {
+            key: synthesis[key]
+            for key in ("summary", "trajectory", "emotion", "risk", "reward", "stability", "insights")
+        }
+        data.update({
+            "tier": "prefilter",
+            "ethical": agents_output["ethical"],
+            "agents": synthesis,
+            "skipped_stages": [],
+            "bypassed_stages": []
+        })
+        return self.render(data)
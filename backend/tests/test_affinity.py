@@ -0,0 +1,52 @@
+"""
+Affinity dispatcher recovery from dead worker processes.
+
+Run with:
+    python -m pytest backend/tests
+"""
+
+import pytest
+
+from backend.api.affinity import AffinityDispatcher
+
+
+@pytest.fixture
+def dispatcher():
+    dispatcher = AffinityDispatcher(workers=2, start_method="fork")
+    yield dispatcher
+    dispatcher.close()
+
+
+def _kill(dispatcher: AffinityDispatcher, name: str):
+    worker = dispatcher._workers[name]
+    worker.process.kill()
+    worker.process.join(5)
+    worker._reader.join(5)
+    assert not worker.alive
+
+
+def test_dead_worker_is_restarted_under_its_name(dispatcher):
+    text = "I keep making progress."
+    expected = dispatcher.run(text, "alice")
+    owner = dispatcher.owner("alice")
+
+    _kill(dispatcher, owner)
+    assert dispatcher.run(text, "alice")["synthesis"] == expected["synthesis"]
+
+    assert dispatcher.owner("alice") == owner
+    assert dispatcher.restarts == 1
+    assert all(worker["alive"] for worker in dispatcher.stats()["workers"].values())
+
+
+def test_resize_after_a_worker_died(dispatcher):
+    dispatcher.run("Work is steady.", "bob")
+    _kill(dispatcher, dispatcher.owner("bob"))
+
+    name = dispatcher.add_worker()
+    assert dispatcher.restarts == 1
+    assert set(dispatcher.resident_users()) == {"worker-0", "worker-1", name}
+
+    _kill(dispatcher, name)
+    assert dispatcher.remove_worker(name) == name
+    assert set(dispatcher.stats()["workers"]) == {"worker-0", "worker-1"}
+    assert dispatcher.run("Tomorrow I will rest.", "bob")["synthesis"]
@@ -0,0 +1,47 @@
+"""
+Analytics shard files shared between worker processes.
+
+Run with:
+    python -m pytest backend/tests
+"""
+
+import json
+import os
+import time
+
+from backend.analytics.aggregator import Analytics, AnalyticsShard
+
+
+def _output(risk: str = "low") -> dict:
+    return {"predictive": {"risk_level": risk}, "pattern": {"keyword_frequency": {"work": 1}}}
+
+
+def test_processes_sharing_a_pid_keep_separate_shards(tmp_path):
+    # Same pid, as for a restarted worker that got its predecessor's pid
+    first = Analytics(str(tmp_path), flush_interval=0, cache_ttl=0)
+    second = Analytics(str(tmp_path), flush_interval=0, cache_ttl=0)
+    first.record(_output(), "a")
+    second.record(_output(), "b")
+
+    assert first.read()["analyses"] == 2
+    assert second.read()["analyses"] == 2
+    assert len(os.listdir(tmp_path)) == 2
+
+
+def test_stale_shards_are_pruned(tmp_path):
+    stale = tmp_path / "shard-4242.json"
+    stale.write_text(json.dumps(AnalyticsShard().to_dict()))
+    leftover = tmp_path / "shard-4242-0123456789ab.json.tmp"
+    leftover.write_text("{")
+    week_ago = time.time() - 7 * 24 * 3600
+    for path in (stale, leftover):
+        os.utime(path, (week_ago, week_ago))
+
+    analytics = Analytics(str(tmp_path), flush_interval=0, cache_ttl=0)
+    analytics.record(_output("high"))
+    summary = analytics.read()
+
+    assert summary["analyses"] == 1
+    assert not stale.exists()
+    assert not leftover.exists()
+    assert len(os.listdir(tmp_path)) == 1
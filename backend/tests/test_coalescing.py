@@ -0,0 +1,94 @@
+"""
+Single-flight coalescing of identical in-flight analyses.
+
+Run with:
+    python -m pytest backend/tests
+"""
+
+import asyncio
+
+import pytest
+
+from backend.api.coalescing import SingleFlight, coalescing_key
+
+
+def test_key_normalizes_whitespace_and_scopes_users():
+    assert coalescing_key("  a \n b ") == coalescing_key("a b")
+    assert coalescing_key("a b", "u1") != coalescing_key("a b")
+    assert coalescing_key("a b", "u1") != coalescing_key("a b", "u2")
+
+
+def test_concurrent_callers_share_one_execution():
+    async def scenario():
+        flight, calls = SingleFlight(), []
+
+        async def work(value):
+            calls.append(value)
+            await asyncio.sleep(0.01)
+            return {"value": value}
+
+        results = await asyncio.gather(*(flight.run("k", work, 1) for _ in range(3)))
+        assert results == [{"value": 1}] * 3
+        assert calls == [1]
+        assert flight.stats()["coalesced"] == 2
+        assert flight.stats()["in_flight"] == 0
+
+    asyncio.run(scenario())
+
+
+def test_errors_reach_every_caller():
+    async def scenario():
+        flight = SingleFlight()
+
+        async def work():
+            await asyncio.sleep(0.01)
+            raise RuntimeError("boom")
+
+        results = await asyncio.gather(flight.run("k", work), flight.run("k", work), return_exceptions=True)
+        assert all(isinstance(result, RuntimeError) for result in results)
+        assert flight.stats()["errors"] == 1
+
+    asyncio.run(scenario())
+
+
+def test_run_survives_first_caller_leaving():
+    async def scenario():
+        flight = SingleFlight()
+
+        async def work():
+            await asyncio.sleep(0.05)
+            return "done"
+
+        first = asyncio.ensure_future(flight.run("k", work))
+        second = asyncio.ensure_future(flight.run("k", work))
+        await asyncio.sleep(0)
+
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        assert await second == "done"
+        assert flight.stats()["abandoned"] == 0
+
+    asyncio.run(scenario())
+
+
+def test_run_is_cancelled_when_every_caller_leaves():
+    async def scenario():
+        flight, finished = SingleFlight(), []
+
+        async def work():
+            await asyncio.sleep(0.05)
+            finished.append(True)
+
+        only = asyncio.ensure_future(flight.run("k", work))
+        await asyncio.sleep(0)
+        only.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await only
+
+        await asyncio.sleep(0.1)
+        assert finished == []
+        assert flight.stats()["abandoned"] == 1
+        assert flight.stats()["in_flight"] == 0
+
+    asyncio.run(scenario())
@@ -0,0 +1,81 @@
+"""
+Accept / Accept-Encoding negotiation for API responses.
+
+Run with:
+    python -m pytest backend/tests
+"""
+
+import gzip
+import json
+
+import pytest
+
+from backend.api import encoding
+from backend.api.encoding import CBOR, JSON, MSGPACK, encode_payload, negotiate_encoding, negotiate_media_type
+
+
+@pytest.fixture
+def no_optional_codecs(monkeypatch):
+    for name in ("msgpack", "cbor2", "brotli", "orjson"):
+        monkeypatch.setattr(encoding, name, None)
+
+
+def test_media_type_follows_quality_and_order():
+    if encoding.msgpack is None:
+        pytest.skip("msgpack not installed")
+    assert negotiate_media_type(None) == JSON
+    assert negotiate_media_type("application/msgpack") == MSGPACK
+    assert negotiate_media_type("application/x-msgpack") == MSGPACK
+    assert negotiate_media_type("application/msgpack;q=0.5, application/json") == JSON
+    assert negotiate_media_type("application/msgpack, application/json") == MSGPACK
+    assert negotiate_media_type("application/msgpack;q=0, */*;q=0.1") == JSON
+
+
+def test_unsupported_types_fall_back_to_json(no_optional_codecs):
+    assert negotiate_media_type("application/msgpack") == JSON
+    assert negotiate_media_type("application/cbor, text/html") == JSON
+    assert negotiate_media_type("application/json;q=bogus") == JSON
+
+
+def test_encoding_prefers_server_order_within_client_quality():
+    if encoding.brotli is None:
+        pytest.skip("brotli not installed")
+    assert negotiate_encoding(None) is None
+    assert negotiate_encoding("gzip, br") == "br"
+    assert negotiate_encoding("gzip, br;q=0.5") == "gzip"
+    assert negotiate_encoding("*") == "br"
+    assert negotiate_encoding("*, br;q=0") == "gzip"
+    assert negotiate_encoding("identity") is None
+
+
+def test_gzip_without_brotli(no_optional_codecs):
+    assert negotiate_encoding("br, gzip;q=0.5") == "gzip"
+    assert negotiate_encoding("br") is None
+
+
+def test_small_bodies_are_not_compressed():
+    body, media_type, headers = encode_payload({"a": 1}, JSON, "gzip", threshold=1024)
+    assert media_type == JSON
+    assert "Content-Encoding" not in headers
+    assert headers["Vary"] == "Accept, Accept-Encoding"
+    assert json.loads(body) == {"a": 1}
+
+
+def test_large_bodies_round_trip(no_optional_codecs):
+    payload = {"insights": ["steady"] * 500}
+    body, media_type, headers = encode_payload(payload, "*/*", "gzip", threshold=64)
+    assert media_type == JSON
+    assert headers["Content-Encoding"] == "gzip"
+    assert json.loads(gzip.decompress(body)) == payload
+
+
+def test_binary_formats_round_trip():
+    payload = {"risk": "low", "scores": [0.25, 0.5]}
+    if encoding.msgpack is not None:
+        body, media_type, _ = encode_payload(payload, MSGPACK, None)
+        assert media_type == MSGPACK
+        assert encoding.msgpack.unpackb(body) == payload
+    if encoding.cbor2 is not None:
+        body, media_type, _ = encode_payload(payload, CBOR, None)
+        assert media_type == CBOR
+        assert encoding.cbor2.loads(body) == payload
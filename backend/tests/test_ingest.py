@@ -0,0 +1,79 @@
+"""
+Memory-mapped ingestion and the "analyze" job's path checks.
+
+Run with:
+    python -m pytest backend/tests
+"""
+
+import os
+
+import pytest
+
+from backend.agents.mapreduce import ChunkedPipeline
+from backend.agents.pipeline import AgentsPipeline
+from backend.bulk.ingest import MappedText, iter_chunks
+from backend.jobs.handlers import ingest_path, validate
+
+
+def _write(tmp_path, name: str, text: str) -> str:
+    path = tmp_path / name
+    path.write_bytes(text.encode("utf-8"))
+    return str(path)
+
+
+def test_trailing_nbsp_is_not_a_sentence(tmp_path):
+    path = _write(tmp_path, "nbsp.txt", "Things get better.\u00a0")
+    with MappedText(path) as mapped:
+        assert list(mapped.sentences()) == ["Things get better."]
+
+
+def test_whitespace_only_fragment_at_a_chunk_boundary(tmp_path):
+    text = "I feel calm.   . Tomorrow I will try again. "
+    path = _write(tmp_path, "boundary.txt", text)
+
+    chunks = list(iter_chunks(path, chunk_bytes=8))
+    assert all(chunks)
+
+    expected = AgentsPipeline().run(text)
+    result = ChunkedPipeline(AgentsPipeline(), workers=1).run_chunks(chunks)
+    assert result["logic"]["cleaned_text"] == expected["logic"]["cleaned_text"]
+
+
+def test_run_chunks_matches_single_pass(tmp_path):
+    text = "  I keep making progress.\n\nWork is steady , and I feel hopeful .\nTomorrow I will rest!  "
+    path = _write(tmp_path, "doc.txt", text * 50)
+
+    expected = AgentsPipeline().run(text * 50)
+    result = ChunkedPipeline(AgentsPipeline(), workers=1).run_chunks(iter_chunks(path, chunk_bytes=64))
+    assert result == expected
+
+
+def test_ingest_path_requires_a_file_under_the_root(tmp_path, monkeypatch):
+    root = tmp_path / "ingest"
+    root.mkdir()
+    inside = _write(root, "journal.txt", "Hello.")
+    outside = _write(tmp_path, "secret.txt", "Hello.")
+
+    monkeypatch.delenv("MIRROR_INGEST_ROOT", raising=False)
+    assert validate("analyze", {"path": inside}) is not None
+
+    monkeypatch.setenv("MIRROR_INGEST_ROOT", str(root))
+    assert ingest_path("journal.txt") == os.path.realpath(inside)
+    assert validate("analyze", {"path": inside}) is None
+    for bad in (outside, "../secret.txt", str(root), "missing.txt"):
+        assert validate("analyze", {"path": bad}) is not None
+        with pytest.raises(ValueError):
+            ingest_path(bad)
+
+    os.symlink(outside, root / "link.txt")
+    assert validate("analyze", {"path": "link.txt"}) is not None
+
+
+def test_parallel_map_matches_single_pass(tmp_path):
+    text = "I keep making progress. Work is steady, and I feel hopeful. Tomorrow I will rest! " * 40
+    path = _write(tmp_path, "doc.txt", text)
+    expected = AgentsPipeline().run(text)
+
+    with ChunkedPipeline(AgentsPipeline(), workers=2, chunk_chars=128) as chunked:
+        assert chunked.run(text) == expected
+        assert chunked.run_chunks(iter_chunks(path, chunk_bytes=128)) == expected
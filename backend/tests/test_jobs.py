@@ -0,0 +1,98 @@
+"""
+Durable job queue: leases, retries and the API's metrics endpoint.
+
+Run with:
+    python -m pytest backend/tests
+"""
+
+import os
+import tempfile
+
+os.environ.setdefault("MIRROR_JOBS_DB", os.path.join(tempfile.mkdtemp(), "jobs.db"))
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from backend.api import server  # noqa: E402
+from backend.jobs.queue import DONE, FAILED, QUEUED, RUNNING, JobQueue  # noqa: E402
+
+
+def _queue(**kwargs) -> JobQueue:
+    return JobQueue(os.path.join(tempfile.mkdtemp(), "jobs.db"), **kwargs)
+
+
+def test_expired_lease_is_leased_again():
+    queue = _queue()
+    job_id = queue.enqueue("analyze", {"text": "x"})
+
+    first = queue.lease("a", lease_seconds=0)
+    assert [job.id for job in first] == [job_id]
+    assert first[0].attempts == 1
+
+    # Worker "a" went quiet; its lease has run out
+    second = queue.lease("b")
+    assert [job.id for job in second] == [job_id]
+    assert second[0].attempts == 2
+
+    assert not queue.heartbeat(job_id, "a")
+    assert not queue.complete(job_id, "a", {"stale": True})
+    assert queue.complete(job_id, "b", {"ok": True})
+    assert queue.get(job_id)["result"] == {"ok": True}
+    assert queue.get(job_id)["status"] == DONE
+
+
+def test_live_lease_is_not_taken():
+    queue = _queue()
+    job_id = queue.enqueue("analyze", {})
+    assert queue.lease("a", lease_seconds=60)
+    assert queue.lease("b") == []
+    assert queue.heartbeat(job_id, "a")
+
+
+def test_release_does_not_use_an_attempt():
+    queue = _queue()
+    job_id = queue.enqueue("analyze", {})
+    queue.lease("a")
+    assert queue.release(job_id, "a")
+    assert queue.lease("b")[0].attempts == 1
+
+
+def test_fail_backs_off_then_gives_up():
+    queue = _queue(backoff_base=60.0)
+    job_id = queue.enqueue("analyze", {}, max_attempts=2)
+
+    queue.lease("a")
+    assert queue.fail(job_id, "a", "boom") == QUEUED
+    assert queue.get(job_id)["error"] == "boom"
+    assert queue.lease("a") == []  # not due until the backoff passes
+
+    queue._connect().execute("UPDATE jobs SET run_at = 0 WHERE id = ?", (job_id,))
+    assert queue.lease("a")[0].attempts == 2
+    assert queue.fail(job_id, "a", "boom again") == FAILED
+    assert queue.get(job_id)["status"] == FAILED
+    assert queue.lease("a") == []
+
+
+def test_expired_lease_on_last_attempt_fails_the_job():
+    queue = _queue()
+    job_id = queue.enqueue("analyze", {}, max_attempts=1)
+    queue.lease("a", lease_seconds=0)
+
+    assert queue.lease("b") == []
+    job = queue.get(job_id)
+    assert job["status"] == FAILED
+    assert job["error"] == "lease expired"
+
+
+def test_backoff_grows_and_is_capped():
+    queue = _queue(backoff_base=2.0, backoff_max=10.0)
+    for attempts, ceiling in ((1, 2.0), (2, 4.0), (3, 8.0), (6, 10.0)):
+        delay = queue._backoff(attempts)
+        assert ceiling / 2 <= delay <= ceiling
+    assert queue.stats() == {QUEUED: 0, RUNNING: 0, DONE: 0, FAILED: 0}
+
+
+def test_metrics_does_not_open_the_job_queue(monkeypatch):
+    monkeypatch.setattr(server, "_jobs", None)
+    body = TestClient(server.app).get("/metrics").json()
+    assert body["jobs"] is None
+    assert server._jobs is None
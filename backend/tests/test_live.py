@@ -0,0 +1,58 @@
+"""
+LiveSession error reporting.
+
+Run with:
+    python -m pytest backend/tests
+"""
+
+from fastapi import FastAPI, WebSocket
+from fastapi.testclient import TestClient
+
+from backend.api.live import LiveMetrics, LiveSession
+from backend.api.scheduler import SchedulerFull
+
+
+def _client(analyze, run=None) -> TestClient:
+    app = FastAPI()
+
+    @app.websocket("/live")
+    async def live(websocket: WebSocket):
+        await LiveSession(analyze, LiveMetrics(), debounce=0.01, max_delay=0.05, run=run).serve(websocket)
+
+    return TestClient(app)
+
+
+def test_scheduler_full_is_reported_and_session_stays_open():
+    calls = []
+
+    async def run(fn, *args):
+        calls.append(args)
+        if len(calls) == 1:
+            raise SchedulerFull("interactive queue is full")
+        return fn(*args)
+
+    with _client(lambda text: {"summary": text}, run).websocket_connect("/live") as ws:
+        ws.send_json({"text": "first"})
+        error = ws.receive_json()
+        assert error["type"] == "error"
+        assert error["retry_after"] > 0
+
+        ws.send_json({"text": "second"})
+        update = ws.receive_json()
+        assert update == {"type": "update", "version": 1, "patch": {"summary": "second"}}
+
+
+def test_analysis_exception_is_reported_and_session_stays_open():
+    def analyze(text):
+        if text == "boom":
+            raise RuntimeError("engine failed")
+        return {"summary": text}
+
+    with _client(analyze).websocket_connect("/live") as ws:
+        ws.send_json({"text": "boom"})
+        error = ws.receive_json()
+        assert error["type"] == "error"
+        assert "RuntimeError" in error["error"]
+
+        ws.send_json({"text": "fine"})
+        assert ws.receive_json()["type"] == "update"
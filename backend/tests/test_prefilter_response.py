@@ -0,0 +1,41 @@
+"""
+The safety prefilter's grounding response reaches the API's top level.
+
+Run with:
+    python -m pytest backend/tests
+"""
+
+import os
+import tempfile
+
+os.environ.setdefault("MIRROR_JOBS_DB", os.path.join(tempfile.mkdtemp(), "jobs.db"))
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from backend.api import server  # noqa: E402
+
+
+def test_vetoed_text_returns_grounding_at_top_level():
+    client = TestClient(server.app)
+    response = client.post("/analyze", json={"text": "I feel worthless and want to give up."})
+    assert response.status_code == 200
+
+    body = response.json()
+    assert body["risk"] == "high"
+    assert body["trajectory"] == "unknown"
+    assert body["stability"] == "unknown"
+    assert body["raw"]["tier"] == "prefilter"
+
+
+def test_spiral_only_text_is_medium_risk():
+    client = TestClient(server.app)
+    body = client.post("/analyze", json={"text": "Nothing works for me lately."}).json()
+    assert body["risk"] == "medium"
+    assert body["raw"]["tier"] == "prefilter"
+
+
+def test_ordinary_text_takes_the_full_path():
+    client = TestClient(server.app)
+    body = client.post("/analyze", json={"text": "I am making steady progress at work."}).json()
+    assert "tier" not in body["raw"]
+    assert body["trajectory"] != "unknown"
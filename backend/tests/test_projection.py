@@ -0,0 +1,54 @@
+"""
+TrajectorySimulator results and the ways to turn the projection off.
+
+Run with:
+    python -m pytest backend/tests
+"""
+
+import pytest
+
+from backend.agents.pipeline import AgentsPipeline
+from backend.agents.predictive_module import PredictiveModule
+from backend.agents.projection import QUANTILES, TrajectorySimulator
+
+
+PARAMS = {
+    "drift": 0.009242343145200196,
+    "volatility": 0.05,
+    "setback_p": 0.06,
+    "breakthrough_p": 0.03,
+    "persistence": 0.35,
+}
+
+
+def test_seeded_projection_is_pinned():
+    simulator = TrajectorySimulator(paths=2000, horizon=6)
+    assert simulator.parameters(1.0, "medium", 2, False, 1) == pytest.approx(PARAMS)
+
+    result = simulator.project(PARAMS, seed=42)
+    assert result["seed"] == 42
+    assert result["paths"] == 2000
+    assert result["bands"]["p50"] == pytest.approx([0.005, 0.0149, 0.0234, 0.0318, 0.0392, 0.0518], abs=1e-4)
+    assert result["prob_improve"] == pytest.approx(0.5965, abs=1e-4)
+    assert simulator.project(PARAMS, seed=42) == result
+
+
+def test_bands_are_ordered():
+    result = TrajectorySimulator(paths=5000, horizon=12).project(PARAMS)
+    names = [f"p{round(q * 100)}" for q in QUANTILES]
+    for step in range(12):
+        values = [result["bands"][name][step] for name in names]
+        assert values == sorted(values)
+        assert -1.0 <= values[0] and values[-1] <= 1.0
+
+
+def test_zero_paths_disables_the_projection():
+    assert TrajectorySimulator(paths=0).project(PARAMS) is None
+    assert TrajectorySimulator().project(PARAMS, paths=0) is None
+
+    text = "I am making progress and trying to improve every day."
+    assert AgentsPipeline().run(text, projection_paths=0)["predictive"]["projection"] is None
+
+    pipeline = AgentsPipeline()
+    pipeline.predictive = PredictiveModule(TrajectorySimulator(paths=0))
+    assert pipeline.run(text)["predictive"]["projection"] is None
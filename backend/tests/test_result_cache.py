@@ -0,0 +1,107 @@
+"""
+SharedResultCache: sharing through the mapped file, CLOCK eviction and
+expiry.
+
+Run with:
+    python -m pytest backend/tests
+"""
+
+import pytest
+
+from backend.api.result_cache import SharedResultCache, pack_result, result_version, unpack_result
+
+
+# One set of four ways: every key competes for the same slots
+ONE_SET = {"size_mb": 1, "slot_size": 1 << 18, "ways": 4, "stripes": 1}
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "results.cache")
+
+
+def test_put_and_get_across_two_handles(path):
+    a = SharedResultCache(path, size_mb=1, slot_size=4096)
+    b = SharedResultCache(path, size_mb=8, slot_size=1024)  # geometry comes from the file
+    try:
+        assert (b.n_sets, b.ways, b.slot_size) == (a.n_sets, a.ways, a.slot_size)
+        assert b.get("text") is None
+
+        a.put("text", pack_result({"summary": "first"}))
+        assert unpack_result(b.get("text")) == {"summary": "first"}
+
+        b.put("text", pack_result({"summary": "second"}))
+        assert unpack_result(a.get("text")) == {"summary": "second"}
+        assert (a.stores, b.stores, b.hits, b.misses) == (1, 1, 1, 1)
+    finally:
+        a.close()
+        b.close()
+
+
+def test_clock_eviction_spares_recently_hit_entries(path):
+    writer = SharedResultCache(path, **ONE_SET)
+    reader = SharedResultCache(path, **ONE_SET)
+    try:
+        for i in range(4):
+            writer.put(f"k{i}", b"v%d" % i)
+
+        # Every slot is referenced: the hand clears them all and takes k0
+        writer.put("k4", b"v4")
+        assert reader.get("k0") is None
+
+        # A hit through the other handle gives k1 a second chance
+        assert reader.get("k1") == b"v1"
+        writer.put("k5", b"v5")
+        assert reader.get("k1") == b"v1"
+        assert reader.get("k2") is None
+        assert [reader.get(k) for k in ("k3", "k4", "k5")] == [b"v3", b"v4", b"v5"]
+        assert writer.evictions == 2
+    finally:
+        writer.close()
+        reader.close()
+
+
+def test_expired_entries_miss_and_are_reused_first(path):
+    cache = SharedResultCache(path, ttl=-1.0, **ONE_SET)
+    try:
+        cache.put("old", b"stale")
+        assert cache.get("old") is None
+
+        fresh = SharedResultCache(path, ttl=60.0, **ONE_SET)
+        for i in range(4):
+            fresh.put(f"k{i}", b"v")
+        assert fresh.evictions == 0  # the expired slot was taken first
+        fresh.close()
+    finally:
+        cache.close()
+
+
+def test_oversize_values_are_not_cached(path):
+    cache = SharedResultCache(path, size_mb=1, slot_size=1024)
+    try:
+        cache.put("big", b"x" * 2048)
+        assert cache.get("big") is None
+        assert cache.oversize == 1
+    finally:
+        cache.close()
+
+
+def test_versions_do_not_share_entries(path):
+    old = SharedResultCache(path, version="v1")
+    new = SharedResultCache(path, version="v2")
+    try:
+        old.put("text", b"old result")
+        assert new.get("text") is None
+        assert old.get("text") == b"old result"
+    finally:
+        old.close()
+        new.close()
+
+
+def test_result_version_follows_settings(monkeypatch):
+    monkeypatch.delenv("MIRROR_RESULT_VERSION", raising=False)
+    base = result_version()
+    assert result_version() == base
+
+    monkeypatch.setenv("MIRROR_RESULT_VERSION", "deploy-2")
+    assert result_version() != base
@@ -0,0 +1,84 @@
+"""
+Regression tests for AdmissionScheduler slot accounting.
+
+Run with:
+    python -m pytest backend/tests
+"""
+
+import asyncio
+import threading
+
+from backend.api.scheduler import AdmissionScheduler
+
+
+def _scheduler() -> AdmissionScheduler:
+    return AdmissionScheduler(
+        total=1,
+        caps={"interactive": 1, "background": 1, "bulk": 1},
+        max_queue=10,
+        tenant_weights={},
+    )
+
+
+def test_cancelled_waiter_is_skipped_on_release():
+    async def scenario():
+        scheduler = _scheduler()
+        await scheduler._admit("interactive", "a", 1.0)  # holds the only slot
+
+        queued = asyncio.ensure_future(scheduler._admit("interactive", "b", 1.0))
+        await asyncio.sleep(0)
+        assert scheduler.stats()["classes"]["interactive"]["queued"] == 1
+
+        # Cancel the waiter and free the slot in the same tick, before
+        # the waiter's own CancelledError handler has run
+        queued.cancel()
+        scheduler._release("interactive")
+
+        try:
+            await queued
+        except asyncio.CancelledError:
+            pass
+
+        interactive = scheduler.stats()["classes"]["interactive"]
+        assert scheduler.stats()["running"] == 0
+        assert interactive["running"] == 0
+        assert interactive["queued"] == 0
+        assert interactive["cancelled"] == 1
+
+        # The slot is usable again
+        result = await asyncio.wait_for(scheduler.run("interactive", "c", lambda: 42), 5)
+        assert result == 42
+        assert scheduler.stats()["running"] == 0
+
+    asyncio.run(scenario())
+
+
+def test_cancelled_run_holds_slot_until_thread_returns():
+    async def scenario():
+        scheduler = _scheduler()
+        started, unblock = threading.Event(), threading.Event()
+
+        def work():
+            started.set()
+            unblock.wait(5)
+
+        running = asyncio.ensure_future(scheduler.run("interactive", "a", work))
+        await asyncio.to_thread(started.wait, 5)
+
+        running.cancel()
+        try:
+            await running
+        except asyncio.CancelledError:
+            pass
+
+        # The thread is still working, so the slot is still taken
+        assert scheduler.stats()["running"] == 1
+        follower = asyncio.ensure_future(scheduler.run("interactive", "b", lambda: "done"))
+        await asyncio.sleep(0.05)
+        assert not follower.done()
+
+        unblock.set()
+        assert await asyncio.wait_for(follower, 5) == "done"
+        assert scheduler.stats()["running"] == 0
+
+    asyncio.run(scenario())
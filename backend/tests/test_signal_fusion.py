@@ -0,0 +1,73 @@
+"""
+SignalFusionEngine: configuration, batch fusion and learned weights.
+
+Run with:
+    python -m pytest backend/tests
+"""
+
+import json
+
+import numpy as np
+import pytest
+
+from backend.iai.signal_fusion_engine import SignalFusionEngine
+from backend.iai.signals import FIELD_INDEX, signal_matrix
+
+
+SIGNALS = [
+    {
+        "emotional": {"alignment": "constructive", "stress": "low", "confidence": "rising"},
+        "predictive": {"trajectory": "up", "risk": "low", "stability": "stable"},
+        "pattern": {"volatility": "low", "cycle": "constructive"},
+        "ethical": {"allowed": True, "severity": "none"},
+    },
+    {
+        # Upward trajectory against a destructive alignment: a conflict
+        "emotional": {"alignment": "destructive", "stress": "high"},
+        "predictive": {"trajectory": "up", "risk": "high"},
+        "ethical": {"allowed": False, "severity": "high"},
+    },
+    {},
+]
+
+
+def test_unknown_field_in_weights_file_names_field_and_file(tmp_path, monkeypatch):
+    path = tmp_path / "weights.json"
+    path.write_text(json.dumps({"outlook": {"predictive.trajectroy": 2.0}}))
+    monkeypatch.setenv("MIRROR_FUSION_WEIGHTS", str(path))
+
+    with pytest.raises(ValueError) as excinfo:
+        SignalFusionEngine()
+    assert "predictive.trajectroy" in str(excinfo.value)
+    assert str(path) in str(excinfo.value)
+
+
+def test_fuse_batch_equals_fuse_row_by_row(monkeypatch):
+    monkeypatch.delenv("MIRROR_FUSION_WEIGHTS", raising=False)
+    engine = SignalFusionEngine()
+
+    batch = engine.fuse_batch(SIGNALS)
+    assert batch == [engine.fuse(signals) for signals in SIGNALS]
+    assert batch[1]["conflicts"]
+    assert batch[2]["scores"] == {channel: 0.0 for channel in engine.channels}
+
+
+def test_fit_recovers_a_linear_channel(monkeypatch):
+    monkeypatch.delenv("MIRROR_FUSION_WEIGHTS", raising=False)
+    engine = SignalFusionEngine()
+
+    rng = np.random.default_rng(7)
+    vectors = rng.choice([-1.0, 0.0, 1.0], size=(400, len(FIELD_INDEX)))
+    trajectory, risk = FIELD_INDEX["predictive.trajectory"], FIELD_INDEX["predictive.risk"]
+    targets = 0.75 * vectors[:, trajectory] + 0.25 * vectors[:, risk]
+
+    learned = engine.fit("learned", vectors, targets)
+
+    # A new channel is rescaled to unit total weight
+    assert sum(abs(w) for w in learned.values()) == pytest.approx(1.0)
+    assert learned["predictive.trajectory"] == pytest.approx(0.75, abs=0.02)
+    assert learned["predictive.risk"] == pytest.approx(0.25, abs=0.02)
+
+    # The channel takes part in fusion from then on
+    scores, _ = engine.scores(signal_matrix(SIGNALS[:1]))
+    assert scores[0, engine.channels.index("learned")] == pytest.approx(1.0, abs=0.05)
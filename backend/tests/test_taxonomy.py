@@ -0,0 +1,30 @@
+"""
+The shared taxonomy segment answers exactly like the compiled index.
+
+Run with:
+    python -m pytest backend/tests
+"""
+
+from backend.agents.taxonomy import DEFAULT_PATH, SharedTaxonomy, TaxonomyIndex, write_taxonomy_segment
+
+
+def test_shared_segment_matches_index(tmp_path):
+    index = TaxonomyIndex.load(DEFAULT_PATH)
+    segment = str(tmp_path / "taxonomy.seg")
+    write_taxonomy_segment(index, segment)
+    shared = SharedTaxonomy(segment)
+
+    assert shared.version == index.version
+    assert shared.categories == index.categories
+    assert shared.longest_phrase == index.longest_phrase
+    assert len(shared) == len(index)
+
+    phrases = [phrase for phrase, _ in index.phrase_entries()]
+    words = set(index._terms) | {term + "s" for term in index._terms} | {"exercising", "unrelated"}
+    for word in sorted(words):
+        assert shared.lemma(word) == index.lemma(word), word
+        assert shared.category(word) == index.category(word), word
+
+    text = "Lately I " + ", and then ".join(phrases) + " but not much else."
+    assert list(shared.phrases(text)) == list(index.phrases(text))
+    assert len(list(index.phrases(text))) == len(phrases)